@@ -0,0 +1,101 @@
+# batch_export.py
+# Exporteert bestellijst, bloeikalender, afbeeldingenlayout en plantekening voor een hele map met projecten, zonder GUI.
+# Per DXF-bestand hoort een toewijzingsbestand <naam>.csv met de kolommen: bed,species,plants_per_m2
+# (bed = volgnummer van het gesloten bed in de DXF, vanaf 0; bedden uit blokreferenties volgen na de losse bedden).
+#
+# Gebruik: python batch_export.py projecten/ uitvoer/ [--assignments map] [--workers 4] [--db planten.db] [--net-area] [--shape-aware] [--tolerance 0.01]
+#                                 [--layers BEPLANTING,HAGEN]
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.curves import DEFAULT_TOLERANCE
+from core.plan import PlantingPlan
+from database.manager import DatabaseManager, normalize_name
+from exporting.pdf_generator import generate_flowering_pdf, generate_order_list_pdf, generate_image_layout_pdf
+from exporting.plan_export import generate_plan_pdf
+
+# Alleen-lezen kopie van de catalogus, één keer per werkproces gezet via de initializer.
+_catalogue = {}
+
+def _init_worker(catalogue):
+    global _catalogue
+    _catalogue = catalogue
+
+def read_assignments(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(int(row['bed']), row['species'].strip().lower(), float(row['plants_per_m2'])) for row in csv.DictReader(f)]
+
+def export_project(dxf_path, assignments_path, output_dir, net_area=False, tolerance=DEFAULT_TOLERANCE, shape_aware=False, layers=None):
+    """Verwerkt één project; geeft een manifest-regel met uitvoerbestanden en tijden per stap terug."""
+    name = os.path.splitext(os.path.basename(dxf_path))[0]; timings = {}
+    result = {'project': name, 'dxf': dxf_path, 'assignments': assignments_path, 'files': [], 'timings': timings}
+    try:
+        t = time.perf_counter(); plan = PlantingPlan.from_dxf(dxf_path, tolerance, layers); plan.shape_aware = shape_aware; timings['load'] = time.perf_counter() - t
+        t = time.perf_counter()
+        assignments = [a for a in read_assignments(assignments_path) if 0 <= a[0] < len(plan)]
+        plan.assign_many(assignments); timings['aggregate'] = time.perf_counter() - t
+        t = time.perf_counter(); overlaps = plan.overlaps; species_totals = plan.species_totals(net=net_area); timings['overlap'] = time.perf_counter() - t
+        details = {normalize_name(species): _catalogue[normalize_name(species)] for species in species_totals if normalize_name(species) in _catalogue}
+        exports = [('bestellijst', lambda f: generate_order_list_pdf(f, species_totals, details)),
+                   ('bloeikalender', lambda f: generate_flowering_pdf(f, list(details.values()))),
+                   ('afbeeldingen', lambda f: generate_image_layout_pdf(f, list(details.values()))),
+                   ('plantekening', lambda f: generate_plan_pdf(f, plan))]
+        for suffix, export in exports:
+            filename = os.path.join(output_dir, f"{name}_{suffix}.pdf")
+            t = time.perf_counter(); export(filename); timings[suffix] = time.perf_counter() - t
+            if os.path.exists(filename): result['files'].append(filename)
+        result.update(beds=len(plan), assigned_beds=len(assignments), species=len(species_totals),
+                      overlapping_pairs=len(overlaps), duplicate_beds=int(overlaps.duplicates.sum()),
+                      unknown_species=sorted(s for s in species_totals if normalize_name(s) not in _catalogue), status='ok')
+    except Exception as e:
+        result.update(status='fout', error=str(e))
+    timings['total'] = sum(timings.values())
+    return result
+
+def find_projects(project_dir, assignments_dir):
+    projects = []
+    for filename in sorted(os.listdir(project_dir)):
+        if not filename.lower().endswith('.dxf'): continue
+        assignments_path = os.path.join(assignments_dir, os.path.splitext(filename)[0] + '.csv')
+        if os.path.exists(assignments_path): projects.append((os.path.join(project_dir, filename), assignments_path))
+        else: print(f"WAARSCHUWING: geen toewijzingsbestand voor {filename}, overgeslagen.")
+    return projects
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporteer PDF's voor meerdere projecten tegelijk.")
+    parser.add_argument('project_dir'); parser.add_argument('output_dir')
+    parser.add_argument('--assignments', help="map met toewijzingsbestanden (standaard: project_dir)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--db', default='planten.db')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="koordetolerantie in m voor het afvlakken van bogen")
+    parser.add_argument('--net-area', action='store_true', help="overlap tussen bedden van dezelfde soort één keer tellen")
+    parser.add_argument('--shape-aware', action='store_true', help="aantal planten per bed volgens het plantgrid (vorm en randafstand)")
+    parser.add_argument('--layers', help="alleen bedden van deze DXF-lagen, kommagescheiden (standaard: alle lagen)")
+    args = parser.parse_args()
+    layers = [layer.strip() for layer in args.layers.split(',') if layer.strip()] if args.layers else None
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    db_manager = DatabaseManager(args.db); db_manager.connect()
+    catalogue = db_manager.get_catalogue_snapshot(); db_manager.close()
+    projects = find_projects(args.project_dir, args.assignments or args.project_dir)
+
+    start = time.perf_counter(); results = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(catalogue,)) as pool:
+        futures = [pool.submit(export_project, dxf, assignments, args.output_dir, args.net_area, args.tolerance, args.shape_aware, layers) for dxf, assignments in projects]
+        for future in as_completed(futures):
+            result = future.result(); results.append(result)
+            detail = ', '.join(f"{step} {seconds:.2f}s" for step, seconds in result['timings'].items())
+            print(f"{result['project']}: {result['status']} ({detail})" + (f" - {result['error']}" if 'error' in result else ''))
+
+    manifest = {'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'database': args.db, 'catalogue_size': len(catalogue), 'layers': layers,
+                'wall_time': time.perf_counter() - start, 'projects': sorted(results, key=lambda r: r['project'])}
+    manifest_path = os.path.join(args.output_dir, 'manifest.json')
+    with open(manifest_path, 'w', encoding='utf-8') as f: json.dump(manifest, f, indent=2, ensure_ascii=False)
+    print(f"\n{len(results)} projecten verwerkt in {manifest['wall_time']:.2f}s. Manifest: {manifest_path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_catalogue_stress.py
+# Gelijktijdige lezers en schrijvers op één catalogus, zoals vier werkplekken plus een prijslijstimport.
+# Schrijfprocessen zetten in één transactie alle prijzen op dezelfde nieuwe waarde; leesthreads delen één
+# DatabaseManager en controleren dat elk snapshot consistent is (één prijs) en dat de versie nooit terugloopt.
+# Stopt met exitcode 1 bij een inconsistent snapshot of een databasefout.
+# Gebruik: python -m benchmarks.bench_catalogue_stress [seconden per scenario]
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from create_database import apply_migrations
+from database.importer import UPSERT
+from database.manager import DatabaseManager
+from database.pool import configure_connection
+from benchmarks.bench_import import SCHEMA
+
+CATALOGUE_SIZE = 5_000
+READERS = 6
+WRITERS = 2
+SCENARIOS = [('wal', False), ('delete', False), ('delete', True)]  # (journal-modus, lokale replica)
+
+def catalogue_rows(price):
+    return [(f'Cultivar {i:05d} "Stress"', 'P9', price, 7, 6, 8, 0, 0) for i in range(CATALOGUE_SIZE)]
+
+def writer(db_file, journal_mode, writer_id, stop_at, results):
+    conn = configure_connection(sqlite3.connect(db_file, timeout=5), journal_mode); rounds = 0; waits = []; errors = 0
+    while time.perf_counter() < stop_at:
+        price = writer_id * 100_000 + rounds + 1.0; t = time.perf_counter()
+        try:
+            with conn:
+                # Afwisselend een volledige import (upsert) en een prijsupdate, beide als één transactie.
+                if rounds % 2: conn.executemany(UPSERT, catalogue_rows(price))
+                else: conn.execute("UPDATE plants SET price_per_unit = ?", (price,))
+            rounds += 1
+        except sqlite3.Error:
+            errors += 1
+        waits.append(time.perf_counter() - t); time.sleep(0.05)
+    conn.close(); results.put((rounds, errors, max(waits, default=0.0)))
+
+def reader(db_manager, names, stop_at, stats):
+    rng = random.Random(threading.get_ident()); last_version = 0; latencies = []; bad = errors = 0
+    while time.perf_counter() < stop_at:
+        t = time.perf_counter()
+        try:
+            snapshot = db_manager.get_catalogue_snapshot()
+            details = db_manager.get_plant_details_many(rng.sample(names, 50))
+        except sqlite3.Error:
+            errors += 1; continue
+        latencies.append(time.perf_counter() - t)
+        prices = {row['price_per_unit'] for row in snapshot.values()}
+        if len(snapshot) != CATALOGUE_SIZE or len(prices) != 1 or len(details) != 50 or snapshot.version < last_version: bad += 1
+        last_version = snapshot.version
+    stats.append((latencies, bad, errors))
+
+def run(directory, journal_mode, replica, seconds):
+    label = f"{journal_mode}{' + replica' if replica else ''}"; db_file = os.path.join(directory, f"planten-{label.replace(' + ', '-')}.db")
+    conn = configure_connection(sqlite3.connect(db_file), journal_mode); conn.execute(SCHEMA); apply_migrations(conn)
+    with conn: conn.executemany(UPSERT, catalogue_rows(1.0))
+    conn.close()
+    names = [row[0] for row in catalogue_rows(0)]
+    db_manager = DatabaseManager(db_file, pool_size=4, journal_mode='wal' if replica else journal_mode,
+                                 replica=os.path.join(directory, 'replica.db') if replica else None)
+    db_manager.connect()
+    stop_at = time.perf_counter() + seconds; results = multiprocessing.Queue(); stats = []
+    writers = [multiprocessing.Process(target=writer, args=(db_file, journal_mode, w + 1, stop_at, results)) for w in range(WRITERS)]
+    readers = [threading.Thread(target=reader, args=(db_manager, names, stop_at, stats)) for _ in range(READERS)]
+    for worker in writers + readers: worker.start()
+    written = [results.get() for _ in writers]
+    for worker in writers + readers: worker.join()
+    db_manager.close()
+
+    latencies = sorted(t for s in stats for t in s[0]); bad = sum(s[1] for s in stats); errors = sum(s[2] for s in stats) + sum(w[1] for w in written)
+    p = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000 if latencies else float('nan')
+    print(f"{label:<16} {len(latencies) / seconds:7.0f} leesrondes/s  p50 {p(0.5):6.2f} ms  p99 {p(0.99):7.2f} ms  "
+          f"{sum(w[0] for w in written):4} schrijfrondes (max {max(w[2] for w in written) * 1000:6.1f} ms)  "
+          f"{bad} inconsistent, {errors} fouten")
+    return bad + errors
+
+if __name__ == '__main__':
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    with tempfile.TemporaryDirectory() as tmp:
+        failures = sum(run(tmp, journal_mode, replica, seconds) for journal_mode, replica in SCENARIOS)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,26 @@
+# benchmarks/bench_curves.py
+# Afvlakken van 10.000 gebogen bedden (polylijnen met bulges en cirkels) bij verschillende koordetoleranties:
+# tijd, aantal vertices en de fout die de oppervlakte van de afgevlakte polygoon zou hebben t.o.v. de exacte boogoppervlakte.
+# Gebruik: python -m benchmarks.bench_curves
+import time
+import numpy as np
+from core.curves import RingBuilder
+from core.geometry import PolygonStore
+
+def synthetic_curved_beds(builder, n, seed=0):
+    """Afgeronde rechthoeken (vier kwartcirkels via bulges) en cirkels, in RD-achtige coördinaten."""
+    rng = np.random.default_rng(seed); bulge = np.tan(np.pi / 8)
+    for i in range(n):
+        x, y = 150000 + (i % 100) * 20.0, 450000 + (i // 100) * 20.0; w, h, r = rng.uniform(4, 12), rng.uniform(4, 12), rng.uniform(0.5, 2)
+        if i % 4 == 3: builder.add_circle((x + w / 2, y + h / 2), min(w, h) / 2); continue
+        points = [(x + r, y), (x + w - r, y), (x + w, y + r), (x + w, y + h - r), (x + w - r, y + h), (x + r, y + h), (x, y + h - r), (x, y + r)]
+        builder.add_polyline(points, [0, bulge, 0, bulge, 0, bulge, 0, bulge])
+
+if __name__ == '__main__':
+    n = 10000
+    for tolerance in (0.1, 0.01, 0.001):
+        builder = RingBuilder(tolerance); synthetic_curved_beds(builder, n)
+        t = time.perf_counter(); polygons, exact = builder.build(); elapsed = time.perf_counter() - t
+        flattened = PolygonStore.from_polygons(polygons).areas; error = np.abs(flattened - exact) / exact
+        print(f"tolerantie {tolerance:6.3f} m | {elapsed*1000:7.1f} ms | {sum(len(p) for p in polygons) / n:6.1f} vertices/bed | "
+              f"oppervlaktefout zonder exacte bogen: gem. {error.mean():.3%}, max. {error.max():.3%}")
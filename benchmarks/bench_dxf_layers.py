@@ -0,0 +1,50 @@
+# benchmarks/bench_dxf_layers.py
+# Laden van één laag uit een grote tekening met meerdere disciplines (beplanting, verharding, gebouwen, bomen als
+# blokken, maatvoering als lijnen en tekst) tegenover het laden van alle lagen, plus de tijd voor de lagenlijst.
+# Gebruik: python -m benchmarks.bench_dxf_layers
+import os
+import tempfile
+import time
+import numpy as np
+from core.dxf import load_polygons, scan_layers
+
+def write_drawing(path, scale=1, seed=0):
+    """Synthetische multidisciplinaire tekening; scale=1 geeft ruim 40k objecten."""
+    import ezdxf
+    rng = np.random.default_rng(seed); doc = ezdxf.new('R2010'); msp = doc.modelspace()
+    for name in ('BEPLANTING', 'VERHARDING', 'GEBOUWEN', 'BOMEN', 'MAATVOERING'): doc.layers.add(name)
+    # Plantvak: drie bedden op laag 0 (nemen de laag van de INSERT over), waarvan één met bogen en één cirkel.
+    vak = doc.blocks.new('PLANTVAK', base_point=(2, 2))
+    vak.add_lwpolyline([(0, 0), (4, 0), (4, 3), (0, 3)], close=True)
+    vak.add_lwpolyline([(5, 0, 0), (8, 0, 0.4), (8, 3, 0), (5, 3, 0.4)], format='xyb', close=True)
+    vak.add_circle((10, 1.5), 1.2)
+    boom = doc.blocks.new('BOOM'); boom.add_circle((0, 0), 2.5); boom.add_line((-2.5, 0), (2.5, 0))
+    # Genest: een bomenrij op laag 0 met bomen, plus een boomspiegel op een eigen laag.
+    rij = doc.blocks.new('BOMENRIJ')
+    for i in range(4): rij.add_blockref('BOOM', (i * 8, 0))
+    rij.add_lwpolyline([(-3, -3), (27, -3), (27, 3), (-3, 3)], close=True, dxfattribs={'layer': 'VERHARDING'})
+
+    def boxes(n, layer, size):
+        xy = rng.uniform(0, 2000, (n, 2)); wh = rng.uniform(*size, (n, 2))
+        for (x, y), (w, h) in zip(xy, wh): msp.add_lwpolyline([(x, y), (x + w, y), (x + w, y + h), (x, y + h)], close=True, dxfattribs={'layer': layer})
+    boxes(3000 * scale, 'BEPLANTING', (2, 12)); boxes(9000 * scale, 'VERHARDING', (1, 30)); boxes(4000 * scale, 'GEBOUWEN', (6, 40))
+    for x, y in rng.uniform(0, 2000, (1000 * scale, 2)):
+        hatch = msp.add_hatch(dxfattribs={'layer': 'VERHARDING'}); hatch.paths.add_polyline_path([(x, y), (x + 5, y), (x + 5, y + 5), (x, y + 5)])
+    for (x, y), angle, s in zip(rng.uniform(0, 2000, (500 * scale, 2)), rng.uniform(0, 360, 500 * scale), rng.uniform(0.5, 2, 500 * scale)):
+        msp.add_blockref('PLANTVAK', (x, y), dxfattribs={'layer': 'BEPLANTING', 'rotation': angle, 'xscale': s, 'yscale': s})
+    msp.add_blockref('PLANTVAK', (0, -100), dxfattribs={'layer': 'BEPLANTING', 'column_count': 10, 'row_count': 10,
+                                                        'column_spacing': 14, 'row_spacing': 5, 'rotation': 15})
+    for x, y in rng.uniform(0, 2000, (3000 * scale, 2)): msp.add_blockref('BOOM', (x, y), dxfattribs={'layer': 'BOMEN'})
+    for x, y in rng.uniform(0, 2000, (200 * scale, 2)): msp.add_blockref('BOMENRIJ', (x, y), dxfattribs={'layer': 'BOMEN', 'rotation': 90})
+    for x, y in rng.uniform(0, 2000, (10000 * scale, 2)):
+        msp.add_line((x, y), (x + 10, y), dxfattribs={'layer': 'MAATVOERING'}); msp.add_text('10.00', dxfattribs={'layer': 'MAATVOERING', 'insert': (x, y + 1)})
+    doc.saveas(path)
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tekening.dxf'); write_drawing(path)
+        print(f"tekening: {os.path.getsize(path) / 1e6:.1f} MB")
+        t = time.perf_counter(); layers = scan_layers(path); print(f"lagenlijst               {time.perf_counter() - t:6.2f} s  {layers}")
+        for label, selection in (('alle lagen', None), ('alleen BEPLANTING', ['BEPLANTING']), ('alleen BOMEN', ['BOMEN'])):
+            t = time.perf_counter(); polygons, _ = load_polygons(path, layers=selection)
+            print(f"{label:<24} {time.perf_counter() - t:6.2f} s  {len(polygons):6} bedden")
@@ -0,0 +1,22 @@
+# benchmarks/bench_flowering.py
+# Generatietijd en aantal stijlcommando's van generate_flowering_pdf voor 50/500/5000 soorten,
+# met willekeurige (ook over de jaarwisseling lopende) structuur- en bloeiperiodes.
+# Gebruik: python -m benchmarks.bench_flowering
+import os
+import tempfile
+import time
+import numpy as np
+from exporting.pdf_generator import generate_flowering_pdf, flowering_matrix, merged_spans
+
+def synthetic_species(n):
+    rng = np.random.default_rng(0); months = rng.integers(0, 13, size=(n, 4)).tolist()
+    return [{'name': f"plant {i:05d}", 'structure_start_month': m[0], 'structure_end_month': m[1],
+             'flower_start_month': m[2], 'flower_end_month': m[3]} for i, m in enumerate(months)]
+
+if __name__ == '__main__':
+    print(f"{'soorten':>8} {'tijd':>9} {'cellen':>8} {'commando’s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (50, 500, 5000):
+            plants = synthetic_species(n); state = flowering_matrix(sorted(plants, key=lambda p: p['name']))
+            t = time.perf_counter(); generate_flowering_pdf(os.path.join(tmp, f"bloei_{n}.pdf"), plants)
+            print(f"{n:>8} {time.perf_counter() - t:7.2f} s {int((state > 0).sum()):>8} {len(merged_spans(state)):>11}")
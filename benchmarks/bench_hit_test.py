@@ -0,0 +1,34 @@
+# benchmarks/bench_hit_test.py
+# Vergelijkt lineaire hit-testing (is_point_in_polygon over alle bedden) met de grid-index.
+# Gebruik: python -m benchmarks.bench_hit_test
+import time
+import numpy as np
+from core.geometry import PolygonStore, is_point_in_polygon
+
+def synthetic_beds(n, vertices_per_bed=12, seed=0):
+    """n onregelmatige, niet-overlappende bedden op een vierkant raster."""
+    rng = np.random.default_rng(seed); side = int(np.ceil(np.sqrt(n)))
+    angles = np.linspace(0, 2 * np.pi, vertices_per_bed, endpoint=False)
+    radii = rng.uniform(0.3, 0.5, size=(n, vertices_per_bed))
+    cx, cy = np.arange(n) % side + 0.5, np.arange(n) // side + 0.5
+    return [np.column_stack([cx[i] + radii[i] * np.cos(angles), cy[i] + radii[i] * np.sin(angles)]) for i in range(n)]
+
+def bench(n, clicks=20, linear_clicks=5):
+    beds = synthetic_beds(n); rng = np.random.default_rng(1); side = int(np.ceil(np.sqrt(n)))
+    points = rng.uniform(0, side, size=(clicks, 2))
+    t = time.perf_counter(); store = PolygonStore.from_polygons(beds); build = time.perf_counter() - t
+    polygons = [store.polygon(i).tolist() for i in range(len(store))]
+
+    t = time.perf_counter()
+    for x, y in points[:linear_clicks]:
+        next((i for i, p in enumerate(polygons) if is_point_in_polygon((x, y), p)), -1)
+    linear = (time.perf_counter() - t) / linear_clicks
+
+    t = time.perf_counter()
+    for x, y in points: store.hit_test(x, y)
+    indexed = (time.perf_counter() - t) / clicks
+    print(f"{n:>7} bedden | opbouw store+index {build*1000:8.1f} ms | lineair {linear*1000:9.2f} ms/klik | "
+          f"index {indexed*1000:6.3f} ms/klik | x{linear / indexed:,.0f}")
+
+if __name__ == '__main__':
+    for n in (1_000, 10_000, 100_000): bench(n)
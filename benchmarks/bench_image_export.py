@@ -0,0 +1,34 @@
+# benchmarks/bench_image_export.py
+# Exporttijd en PDF-grootte van generate_image_layout_pdf voor een catalogus van 200 planten,
+# met de originele afbeeldingen, een koude en een warme thumbnail-cache.
+# Gebruik: python -m benchmarks.bench_image_export
+import os
+import tempfile
+import time
+import numpy as np
+from PIL import Image as PILImage
+from exporting.pdf_generator import generate_image_layout_pdf
+from exporting.thumbnails import ThumbnailCache
+
+def synthetic_catalogue(directory, n=200, size=(3000, 2000)):
+    """n verschillende foto-achtige JPEG's op volle resolutie."""
+    rng = np.random.default_rng(0); base = rng.integers(0, 255, size=(size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+    catalogue = []
+    for i in range(n):
+        pixels = np.roll(base, i * 7, axis=1)
+        path = os.path.join(directory, f"plant_{i:03d}.jpg")
+        PILImage.fromarray(pixels).resize(size, PILImage.BILINEAR).save(path, quality=92)
+        catalogue.append({'name': f"plant {i:03d}", 'image_path': path})
+    return catalogue
+
+def run(label, catalogue, output, thumbnail_cache):
+    t = time.perf_counter(); generate_image_layout_pdf(output, catalogue, thumbnail_cache=thumbnail_cache)
+    print(f"{label:<28} {time.perf_counter() - t:7.2f} s  {os.path.getsize(output) / 1e6:8.1f} MB")
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        catalogue = synthetic_catalogue(tmp)
+        cache = ThumbnailCache(cache_dir=os.path.join(tmp, 'cache'))
+        run("originele afbeeldingen", catalogue, os.path.join(tmp, 'raw.pdf'), False)
+        run("thumbnail-cache (koud)", catalogue, os.path.join(tmp, 'cold.pdf'), cache)
+        run("thumbnail-cache (warm)", catalogue, os.path.join(tmp, 'warm.pdf'), ThumbnailCache(cache_dir=os.path.join(tmp, 'cache')))
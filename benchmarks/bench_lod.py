@@ -0,0 +1,52 @@
+# benchmarks/bench_lod.py
+# Frametijd per zoomniveau voor een synthetisch plan van 1M vertices (20k bedden x 50 punten):
+# alle geometrie in één PolyCollection versus BedLayer met viewport culling en LOD-piramide.
+# Gebruik: python -m benchmarks.bench_lod
+import time
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+
+from benchmarks.bench_hit_test import synthetic_beds
+from core.geometry import PolygonStore
+from ui.rendering import BedLayer
+
+ZOOM_LEVELS = (1, 4, 16, 64, 256)
+FRAMES = 3
+
+def make_canvas():
+    fig = Figure(figsize=(10, 8), dpi=100); canvas = FigureCanvasAgg(fig); ax = fig.add_subplot(111); ax.set_aspect('equal', 'box')
+    return canvas, ax
+
+def frame_times(canvas, ax, store, before_draw):
+    b = store.bboxes; cx, cy = (b[:, 0].min() + b[:, 2].max()) / 2, (b[:, 1].min() + b[:, 3].max()) / 2
+    half = max(b[:, 2].max() - b[:, 0].min(), b[:, 3].max() - b[:, 1].min()) / 2; results = []
+    for zoom in ZOOM_LEVELS:
+        times = []
+        for frame in range(FRAMES):
+            # Kleine pan per frame zodat elke frame echt nieuwe limieten heeft.
+            shift = frame * half / zoom / 10
+            ax.set_xlim(cx - half / zoom + shift, cx + half / zoom + shift); ax.set_ylim(cy - half / zoom, cy + half / zoom)
+            t = time.perf_counter(); before_draw(); canvas.draw(); times.append(time.perf_counter() - t)
+        results.append(min(times))
+    return results
+
+if __name__ == '__main__':
+    store = PolygonStore.from_polygons(synthetic_beds(20_000, vertices_per_bed=50))
+    print(f"{len(store)} bedden, {len(store.vertices):,} vertices")
+
+    canvas, ax = make_canvas()
+    ax.add_collection(PolyCollection([store.polygon(i) for i in range(len(store))], facecolors='none', edgecolors='black', linewidths=1))
+    naive = frame_times(canvas, ax, store, lambda: None)
+
+    canvas, ax = make_canvas(); layer = BedLayer(ax)
+    t = time.perf_counter(); layer.set_store(store); build = time.perf_counter() - t
+    pixel_width = canvas.get_width_height()[0]
+    culled = frame_times(canvas, ax, store, lambda: layer.update_view(pixel_width))
+
+    print(f"LOD-piramide opgebouwd in {build:.2f} s")
+    print(f"{'zoom':>6} | {'alles':>10} | {'culling+LOD':>12}")
+    for zoom, a, b in zip(ZOOM_LEVELS, naive, culled):
+        print(f"{zoom:>5}x | {a * 1000:7.0f} ms | {b * 1000:9.0f} ms")
@@ -0,0 +1,27 @@
+# benchmarks/bench_order_list.py
+# Tijd, piekgeheugen, paginatelling en bestandsgrootte van generate_order_list_pdf voor 10, 1.000 en 10.000 regels.
+# Gebruik: python -m benchmarks.bench_order_list
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from exporting.pdf_generator import generate_order_list_pdf
+
+def synthetic_order(n):
+    """n soorten met aantallen en een catalogus waarin ~5% van de soorten ontbreekt."""
+    rng = np.random.default_rng(0); amounts = rng.integers(1, 2000, size=n).tolist(); prices = rng.uniform(0.5, 25, size=n).round(2).tolist()
+    species_totals = {f"plant {i:05d}": amounts[i] for i in range(n)}
+    details = {f"plant {i:05d}": {'quality': 'P9', 'price_per_unit': prices[i]} for i in range(n) if i % 20}
+    return species_totals, details
+
+if __name__ == '__main__':
+    print(f"{'regels':>8} {'tijd':>9} {'piek':>9} {'pagina’s':>9} {'grootte':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (10, 1000, 10000):
+            species_totals, details = synthetic_order(n); output = os.path.join(tmp, f"bestellijst_{n}.pdf")
+            t = time.perf_counter(); generate_order_list_pdf(output, species_totals, details); elapsed = time.perf_counter() - t
+            # Piekgeheugen in een aparte run: tracemalloc vertraagt de export zelf aanzienlijk.
+            tracemalloc.start(); generate_order_list_pdf(output, species_totals, details); peak = tracemalloc.get_traced_memory()[1]; tracemalloc.stop()
+            pages = open(output, 'rb').read().count(b'/Type /Page\n')
+            print(f"{n:>8} {elapsed:7.2f} s {peak / 1e6:6.1f} MB {pages:>9} {os.path.getsize(output) / 1e3:6.0f} kB")
@@ -0,0 +1,28 @@
+# benchmarks/bench_placement.py
+# Plantposities op het hexgrid voor 1.000 tot 20.000 bedden (bedden ×4 vergroot, RD-achtige coördinaten, 7 planten
+# per m²), met en zonder randafstand, naast het aantal volgens oppervlakte × dichtheid. Een steekproef van de punten
+# wordt gecontroleerd met matplotlib's point-in-polygon.
+# Gebruik: python -m benchmarks.bench_placement [workers]
+import sys
+import time
+import numpy as np
+from matplotlib.path import Path
+from benchmarks.bench_hit_test import synthetic_beds
+from core.aggregation import plant_count
+from core.geometry import PolygonStore
+from core.placement import place_plants
+
+DENSITY = 7
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    for n in (1000, 5000, 20000):
+        store = PolygonStore.from_polygons([bed * 4 + (150000, 450000) for bed in synthetic_beds(n)]); beds = np.arange(len(store))
+        by_area = sum(plant_count(area, DENSITY) for area in store.areas)
+        for margin in (0.0, 0.5):
+            t = time.perf_counter(); points, owner = place_plants(store, beds, DENSITY, margin, workers); elapsed = time.perf_counter() - t
+            print(f"{n:>6} bedden | randafstand {margin:.1f} | {len(points):>8} planten in {elapsed:5.2f} s "
+                  f"({len(points) / by_area:.1%} van oppervlakte × dichtheid = {by_area})")
+    rng = np.random.default_rng(0); sample = rng.choice(len(store), size=50, replace=False)
+    outside = sum(int((~Path(store.polygon(i)).contains_points(points[owner == i])).sum()) for i in sample)
+    print(f"Controle (50 bedden): {outside} punten buiten het bed")
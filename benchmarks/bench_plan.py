@@ -0,0 +1,31 @@
+# benchmarks/bench_plan.py
+# Hete paden van het headless PlantingPlan-model (opbouw, hit-test, toewijzen, totalen, kleuren) zonder Qt of Tk.
+# Gebruik: python -m benchmarks.bench_plan
+import sys
+import time
+import numpy as np
+from benchmarks.bench_hit_test import synthetic_beds
+from core.geometry import PolygonStore
+from core.plan import PlantingPlan
+
+def bench(n, species=200, clicks=200):
+    beds = synthetic_beds(n); rng = np.random.default_rng(2); side = int(np.ceil(np.sqrt(n)))
+    names = [f"soort {i:03d}" for i in range(species)]; chosen = rng.integers(0, species, size=n).tolist()
+    densities = rng.choice([5, 7, 9, 11], size=n).tolist(); points = rng.uniform(0, side, size=(clicks, 2))
+
+    t = time.perf_counter(); plan = PlantingPlan(PolygonStore.from_polygons(beds)); build = time.perf_counter() - t
+    t = time.perf_counter()
+    for x, y in points: plan.hit_test(x, y)
+    hit = (time.perf_counter() - t) / clicks
+    t = time.perf_counter()
+    for index in range(n): plan.assign(index, names[chosen[index]], densities[index])
+    assign = (time.perf_counter() - t) / n
+    t = time.perf_counter(); totals = plan.species_totals(); colors = plan.facecolors(); rest = time.perf_counter() - t
+    assert sum(totals.values()) == sum(plan.plant_count(i) for i in range(n)) and colors.shape == (n, 4)
+    print(f"{n:>7} bedden | opbouw {build*1000:8.1f} ms | hit-test {hit*1e6:7.1f} µs | toewijzen {assign*1e6:6.1f} µs/bed | "
+          f"totalen+kleuren {rest*1000:7.1f} ms")
+
+if __name__ == '__main__':
+    for n in (1000, 10000, 100000): bench(n)
+    gui = [name for name in ('PyQt6', 'tkinter') if name in sys.modules]
+    if gui: sys.exit(f"FOUT: het core-model importeerde GUI-modules: {', '.join(gui)}")
@@ -0,0 +1,31 @@
+# benchmarks/bench_plan_export.py
+# Plantekening (vector-PDF en SVG) voor 1.000 tot 20.000 bedden met 200 soorten: één passend blad, automatische
+# schaal over meerdere bladen, en SVG. Meldt ook hoeveel labels zonder overlap geplaatst konden worden.
+# Gebruik: python -m benchmarks.bench_plan_export
+import os
+import tempfile
+import time
+import numpy as np
+from benchmarks.bench_hit_test import synthetic_beds
+from core.geometry import PolygonStore
+from core.plan import PlantingPlan
+from exporting.plan_export import auto_scale, generate_plan_pdf, generate_plan_svg, plan_frame
+
+def synthetic_plan(n, species=200):
+    rng = np.random.default_rng(5); names = [f"soort {i:03d}" for i in range(species)]
+    plan = PlantingPlan(PolygonStore.from_polygons([bed * 3 + (150000, 450000) for bed in synthetic_beds(n)]))
+    assigned = rng.random(n) < 0.9
+    plan.assign_many((index, names[k], 7) for index, k in zip(np.flatnonzero(assigned).tolist(), rng.integers(0, species, size=n).tolist()))
+    return plan
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        for n in (1000, 5000, 20000):
+            plan = synthetic_plan(n); results = []
+            for name, export in (('pdf, één blad', lambda f: generate_plan_pdf(f, plan, scale=None)),
+                                 ('pdf, automatisch', lambda f: generate_plan_pdf(f, plan)),
+                                 ('svg', lambda f: generate_plan_svg(f, plan))):
+                path = os.path.join(directory, 'plan.svg' if name == 'svg' else 'plan.pdf')
+                t = time.perf_counter(); export(path); elapsed = time.perf_counter() - t
+                results.append(f"{name} {elapsed:5.2f} s ({os.path.getsize(path) // 1024} kB)")
+            print(f"{n:>6} bedden, schaal auto 1:{auto_scale(plan.store, plan_frame())} | " + ' | '.join(results))
@@ -0,0 +1,55 @@
+# benchmarks/bench_scenarios.py
+# Offertescenario's (soort vervangen, dichtheid per soort, andere kwaliteit) voor 20.000 bedden en 200 soorten,
+# in één keer doorgerekend, naast de oude route: per scenario elk bed opnieuw toewijzen en de bestellijst prijzen.
+# De bedragen van beide routes moeten op de cent gelijk zijn.
+# Gebruik: python -m benchmarks.bench_scenarios
+import os
+import tempfile
+import time
+from decimal import Decimal
+import numpy as np
+from benchmarks.bench_hit_test import synthetic_beds
+from core.geometry import PolygonStore
+from core.plan import PlantingPlan
+from core.pricing import Scenario, ScenarioEngine
+from exporting.pdf_generator import generate_scenario_pdf, order_lines
+
+def synthetic_plan(n, species):
+    rng = np.random.default_rng(3); names = [f"soort {i:03d}" for i in range(species)]
+    plan = PlantingPlan(PolygonStore.from_polygons([bed * 3 for bed in synthetic_beds(n)]))
+    plan.assign_many(zip(range(n), rng.choice(names, size=n).tolist(), rng.choice([5, 7, 9, 11], size=n).tolist()))
+    catalogue = {name: {'name': name, 'quality': 'P9', 'price_per_unit': round(float(p), 2)} for name, p in zip(names, rng.uniform(0.8, 4.5, size=species))}
+    return plan, names, catalogue
+
+def synthetic_scenarios(names, count):
+    rng = np.random.default_rng(4); scenarios = []
+    for k in range(count):
+        picks = rng.choice(names, size=6, replace=False).tolist()
+        scenarios.append(Scenario(f"Variant {k + 1}", replace={picks[0]: picks[1]}, density={picks[2]: 9, picks[3]: 5},
+                                  quality={picks[4]: ('C2', 3.95), picks[5]: ('P11', 1.85)}))
+    return scenarios
+
+def bed_by_bed(plan, catalogue, scenario):
+    """De oude route: elk bed met zijn scenariowaarden opnieuw toewijzen en de bestellijst prijzen."""
+    trial = PlantingPlan(plan.store); details = dict(catalogue); assignments = []
+    for index, species, density in plan.assignments():
+        species = scenario.replace.get(species, species); assignments.append((index, species, scenario.density.get(species, density)))
+    for index, species, density in assignments: trial.assign(index, species, density)
+    for name, (quality, price) in scenario.quality.items(): details[name] = dict(details.get(name, {}), quality=quality, price_per_unit=price)
+    return sum((line_total for _, line_total in order_lines(trial.species_totals(), details)), Decimal('0.00'))
+
+if __name__ == '__main__':
+    plan, names, catalogue = synthetic_plan(20000, 200)
+    engine = ScenarioEngine.from_plan(plan, catalogue)
+    for count in (10, 30, 100):
+        scenarios = synthetic_scenarios(names, count)
+        t = time.perf_counter(); comparison = engine.compare(scenarios); elapsed = time.perf_counter() - t
+        print(f"{count:>4} scenario's x {len(plan)} bedden: {elapsed*1000:7.1f} ms")
+    t = time.perf_counter(); reference = [bed_by_bed(plan, catalogue, scenario) for scenario in scenarios[:5]]; old = (time.perf_counter() - t) / 5
+    print(f"Oude route (bed voor bed + bestellijst): {old*1000:.0f} ms per scenario")
+    mismatches = [k for k, total in enumerate(reference) if comparison.totals()[k + 1][0] != total]
+    print(f"Controle 5 scenario's tegen de bestellijst: {'gelijk' if not mismatches else f'VERSCHIL bij {mismatches}'}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scenarios.pdf'); t = time.perf_counter(); generate_scenario_pdf(path, engine.compare(scenarios[:30]))
+        print(f"PDF-vergelijking 30 scenario's: {time.perf_counter() - t:.2f} s, {os.path.getsize(path) // 1024} kB")
+    if mismatches: raise SystemExit(1)
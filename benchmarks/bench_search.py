@@ -0,0 +1,28 @@
+# benchmarks/bench_search.py
+# Opbouw- en zoektijd van SpeciesSearchIndex voor een catalogus van 30k cultivars.
+# Gebruik: python -m benchmarks.bench_search
+import random
+import time
+from core.search import SpeciesSearchIndex
+
+GENERA = ['Geranium', 'Salvia', 'Aster', 'Echinops', 'Calamintha', 'Echinacea', 'Anemone', 'Astrantia',
+          'Persicaria', 'Sedum', 'Hosta', 'Helleborus', 'Phlox', 'Nepeta', 'Veronica', 'Rudbeckia']
+SYLLABLES = ['ro', 'sa', 'li', 'mar', 'ta', 'ne', 'blu', 'kon', 'ver', 'gold', 'star', 'lu', 'ni', 'pe', 'é', 'cla']
+QUERIES = ['ge', 'geranium', 'geranum oxonianum', 'rose clair', 'Geranium x oxonianum "Rose Cl', 'calamintha ssp', 'helebor']
+
+def synthetic_names(n=30_000, seed=0):
+    rng = random.Random(seed); names = {'Geranium x oxonianum "Rose Clair"', 'Calamintha nepeta ssp. nepeta'}
+    while len(names) < n:
+        epithet = ''.join(rng.choices(SYLLABLES, k=3))
+        cultivar = ' '.join(''.join(rng.choices(SYLLABLES, k=rng.randint(2, 3))).capitalize() for _ in range(rng.randint(1, 2)))
+        names.add(f'{rng.choice(GENERA)} {rng.choice(["", "x ", "ssp. "])}{epithet} "{cultivar}"')
+    return sorted(names)
+
+if __name__ == '__main__':
+    names = synthetic_names()
+    t = time.perf_counter(); index = SpeciesSearchIndex(names); print(f"index voor {len(names)} namen: {time.perf_counter() - t:.2f} s")
+    for query in QUERIES:
+        times = []
+        for _ in range(20):
+            t = time.perf_counter(); results = index.search(query); times.append(time.perf_counter() - t)
+        print(f"{query!r:<34} {sorted(times)[len(times) // 2] * 1000:6.2f} ms  -> {results[0] if results else '-'}")
@@ -0,0 +1,58 @@
+# benchmarks/bench_startup.py
+# Opstarttijd van app.py: importtijd per pakket (python -X importtime), tijd tot de eerste paint van het hoofdvenster
+# en tijd tot de catalogus en zoekindex op de achtergrond klaar zijn. Elke meting draait in een vers proces.
+# Gebruik: python -m benchmarks.bench_startup [runs]
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+
+# Start de app zoals app.py en meldt de eerste paint en het klaar zijn van de zoekindex (tijden vanaf procesbegin).
+FIRST_PAINT = r'''
+import time, sys; t0 = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QObject, QEvent, QTimer
+app = QApplication(sys.argv)
+from ui.main_window import MainWindow
+imported = time.perf_counter()
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and not hasattr(self, 'painted'):
+            self.painted = time.perf_counter(); print(f"paint {imported - t0:.4f} {self.painted - t0:.4f}", flush=True)
+        return False
+window = MainWindow(); first_paint = FirstPaint(); window.installEventFilter(first_paint)
+def ready(count):
+    print(f"catalogue {time.perf_counter() - t0:.4f} {count}", flush=True); QTimer.singleShot(0, window.close)
+window._search_worker.index_ready.connect(ready)
+window.show(); QTimer.singleShot(10000, window.close); app.exec()
+'''
+
+def import_breakdown(module='ui.main_window', top=12):
+    """Importtijd per top-level pakket (som van de eigen tijden, dus zonder dubbeltellingen), uit -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"], cwd=ROOT, env=ENV, capture_output=True, text=True)
+    per_package = defaultdict(int); total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line: continue
+        self_us, cumulative, name = line[len('import time:'):].split('|'); name = name.strip()
+        per_package[name.split('.')[0]] += int(self_us)
+        if name == module: total = int(cumulative)
+    print(f"Importtijd van {module}: {total / 1000:.0f} ms; grootste pakketten:")
+    for package, us in sorted(per_package.items(), key=lambda item: -item[1])[:top]: print(f"  {package:<24} {us / 1000:8.1f} ms")
+    for package in ('reportlab', 'ezdxf'):
+        if package in result.stderr: print(f"  WAARSCHUWING: {package} wordt bij het opstarten al geïmporteerd")
+
+def first_paint(runs):
+    print(f"\n{'run':>4} {'imports':>9} {'1e paint':>9} {'catalogus':>10} {'wandklok':>9}")
+    for run in range(runs):
+        t = time.perf_counter(); result = subprocess.run([sys.executable, '-c', FIRST_PAINT], cwd=ROOT, env=ENV, capture_output=True, text=True)
+        wall = time.perf_counter() - t; values = {line.split()[0]: line.split()[1:] for line in result.stdout.splitlines() if line[:5] in ('paint', 'catal')}
+        if 'paint' not in values: print(f"{run + 1:>4} geen paint gemeten\n{result.stderr[-500:]}"); continue
+        imported, painted = (float(v) for v in values['paint']); catalogue = float(values['catalogue'][0]) if 'catalogue' in values else float('nan')
+        print(f"{run + 1:>4} {imported:7.2f} s {painted:7.2f} s {catalogue:8.2f} s {wall:7.2f} s")
+
+if __name__ == '__main__':
+    import_breakdown(); first_paint(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
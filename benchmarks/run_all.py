@@ -0,0 +1,27 @@
+# benchmarks/run_all.py
+# Draait alle benchmarks na elkaar, elk in een eigen proces, zonder scherm (Agg-backend, offscreen Qt).
+# Geschikt voor een headless CI-machine: de exitcode is 1 zodra één benchmark faalt.
+# Gebruik: python -m benchmarks.run_all [naamfilter ...]
+import os
+import subprocess
+import sys
+import time
+
+def benchmark_modules():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    return sorted(f"benchmarks.{name[:-3]}" for name in os.listdir(directory) if name.startswith('bench_') and name.endswith('.py'))
+
+def main(filters):
+    env = dict(os.environ, MPLBACKEND='Agg', QT_QPA_PLATFORM='offscreen')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__))); failed = []
+    for module in benchmark_modules():
+        if filters and not any(f in module for f in filters): continue
+        print(f"=== {module} ===", flush=True); t = time.perf_counter()
+        returncode = subprocess.call([sys.executable, '-m', module], cwd=root, env=env)
+        print(f"--- {module}: {'ok' if returncode == 0 else 'FOUT'} ({time.perf_counter() - t:.1f} s)\n", flush=True)
+        if returncode: failed.append(module)
+    if failed: print(f"Mislukt: {', '.join(failed)}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
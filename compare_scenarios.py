@@ -0,0 +1,48 @@
+# compare_scenarios.py
+# Vergelijkt offertescenario's voor één project naast elkaar: soorten vervangen, dichtheid per soort aanpassen of
+# een andere potmaat/kwaliteit met een andere prijs. Scenario's staan in een JSON-bestand, bijvoorbeeld:
+#   [{"name": "Salvia dichter", "density": {"salvia nemerosa \"schneehugel\"": 9}},
+#    {"name": "Aster in C2", "quality": {"aster \"little carlow\"": ["C2", 3.10]}},
+#    {"name": "Geranium i.p.v. aster", "replace": {"aster \"little carlow\"": "geranium x oxonianum \"rose clair\""}}]
+#
+# Gebruik: python compare_scenarios.py project.deas scenarios.json [--db planten.db] [--pdf vergelijking.pdf] [--net-area]
+#          python compare_scenarios.py plan.dxf scenarios.json --assignments plan.csv [...]
+import argparse
+import json
+import time
+
+from batch_export import read_assignments
+from core.plan import PlantingPlan
+from core.pricing import Scenario, ScenarioEngine
+from core.project import load_project
+from database.manager import DatabaseManager
+
+def load_plan(path, assignments_path=None):
+    if path.lower().endswith('.dxf'):
+        plan = PlantingPlan.from_dxf(path); assignments = read_assignments(assignments_path) if assignments_path else []
+    else:
+        store, assignments, _ = load_project(path); plan = PlantingPlan(store)
+    plan.assign_many([a for a in assignments if 0 <= a[0] < len(plan)])
+    return plan
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Vergelijk offertescenario's voor een beplantingsplan.")
+    parser.add_argument('project', help="projectbestand (.deas) of DXF"); parser.add_argument('scenarios', help="JSON-bestand met scenario's")
+    parser.add_argument('--assignments', help="toewijzingsbestand (CSV) bij een DXF")
+    parser.add_argument('--db', default='planten.db'); parser.add_argument('--pdf', help="schrijf de vergelijking naar deze PDF")
+    parser.add_argument('--net-area', action='store_true', help="overlap tussen bedden van dezelfde soort één keer tellen")
+    args = parser.parse_args()
+    try:
+        plan = load_plan(args.project, args.assignments)
+        with open(args.scenarios, encoding='utf-8') as f: scenarios = [Scenario.from_dict(data) for data in json.load(f)]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Fout bij inlezen: {e}"); raise SystemExit(1)
+    db_manager = DatabaseManager(args.db); db_manager.connect()
+    catalogue = db_manager.get_catalogue_snapshot(); db_manager.close()
+
+    start = time.perf_counter(); comparison = ScenarioEngine.from_plan(plan, catalogue, net=args.net_area).compare(scenarios)
+    print(f"{len(comparison)} scenario's doorgerekend in {(time.perf_counter() - start) * 1000:.1f} ms:")
+    for line in comparison.summary(): print(f"  {line}")
+    if args.pdf:
+        from exporting.pdf_generator import generate_scenario_pdf
+        generate_scenario_pdf(args.pdf, comparison); print(f"Vergelijking opgeslagen: {args.pdf}")
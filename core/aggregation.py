@@ -0,0 +1,44 @@
+# core/aggregation.py
+from collections import defaultdict
+from core.profiling import timed
+
+def species_label(species_name):
+    return species_name.capitalize() or '(Onbekende soort)'
+
+def plant_count(area, plants_per_m2):
+    return int(area * float(plants_per_m2))
+
+@timed('order_list.full')
+def calculate_species_totals(areas, assignments):
+    """Volledige herberekening; assignments is een iterable van (index, soortnaam, planten per m²)."""
+    species_totals = defaultdict(int)
+    for index, species_name, plants_per_m2 in assignments:
+        species_totals[species_label(species_name)] += plant_count(areas[index], plants_per_m2)
+    return species_totals
+
+class SpeciesTotals:
+    """Lopende plantentotalen per soort. Het wijzigen van één bed kost O(1) in plaats van een
+    herberekening over alle bedden; set_bed/remove_bed geven de soorten terug waarvan het totaal veranderde."""
+
+    def __init__(self):
+        self.totals = {}; self._bed_counts = defaultdict(int); self._beds = {}
+
+    def clear(self):
+        self.totals.clear(); self._bed_counts.clear(); self._beds.clear()
+
+    def set_bed(self, index, species_name, count):
+        changed = self.remove_bed(index); label = species_label(species_name)
+        self._beds[index] = (label, count); self._bed_counts[label] += 1
+        self.totals[label] = self.totals.get(label, 0) + count
+        changed.add(label); return changed
+
+    def bed_counts(self):
+        """{bedindex: aantal planten} van alle toegewezen bedden."""
+        return {index: count for index, (_, count) in self._beds.items()}
+
+    def remove_bed(self, index):
+        if index not in self._beds: return set()
+        label, count = self._beds.pop(index); self._bed_counts[label] -= 1
+        if self._bed_counts[label]: self.totals[label] -= count
+        else: del self.totals[label]; del self._bed_counts[label]
+        return {label}
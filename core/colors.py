@@ -0,0 +1,37 @@
+# core/colors.py
+import numpy as np
+from matplotlib.colors import to_rgba
+
+# LIJST MET KLEUREN
+COLOR_CYCLE = [
+    '#8dd3c7', '#ffffb3', '#bebada', '#fb8072', '#80b1d3', '#fdb462',
+    '#b3de69', '#fccde5', '#d9d9d9', '#bc80bd', '#ccebc5', '#ffed6f'
+]
+UNKNOWN_COLOR = 'lightgrey'
+BED_ALPHA = 0.6
+
+class SpeciesColors:
+    """Vaste kleur per soort, in volgorde van eerste gebruik uit COLOR_CYCLE; RGBA's worden per soort één keer berekend."""
+
+    def __init__(self, cycle=COLOR_CYCLE, alpha=BED_ALPHA):
+        self.cycle = cycle; self.alpha = alpha; self.color_map = {}; self._rgba = {}; self.next_color_index = 0
+
+    def clear(self):
+        self.color_map.clear(); self._rgba.clear(); self.next_color_index = 0
+
+    def assign(self, species_name):
+        if species_name and species_name not in self.color_map:
+            self.color_map[species_name] = self.cycle[self.next_color_index]
+            self.next_color_index = (self.next_color_index + 1) % len(self.cycle)
+
+    def rgba(self, species_name):
+        if species_name not in self._rgba: self._rgba[species_name] = to_rgba(self.color_map.get(species_name, UNKNOWN_COLOR), self.alpha)
+        return self._rgba[species_name]
+
+    def facecolors(self, species_names, finished):
+        """(n, 4) RGBA-array voor alle bedden; bedden zonder toewijzing zijn transparant."""
+        colors = np.zeros((len(species_names), 4)); indices = np.flatnonzero(finished)
+        if not len(indices): return colors
+        names = [species_names[index] for index in indices]; lookup = {name: k for k, name in enumerate(dict.fromkeys(names))}
+        colors[indices] = np.array([self.rgba(name) for name in lookup])[[lookup[name] for name in names]]
+        return colors
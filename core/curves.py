@@ -0,0 +1,99 @@
+# core/curves.py
+# Afvlakken van gebogen bedranden (bulges, cirkels, bogen) met een koordetolerantie: de maximale afstand
+# tussen boog en koorde. Per boog worden zo weinig segmenten gebruikt als de tolerantie toestaat, en de
+# oppervlakte wordt exact uit de bogen berekend (cirkelsegmenten) in plaats van uit de afgevlakte polygoon.
+import numpy as np
+
+DEFAULT_TOLERANCE = 0.01  # m; 1 cm afwijking is ruim binnen de teken- en plantnauwkeurigheid
+MAX_STEP = 2 * np.pi / 3  # ook bij een grove tolerantie minstens drie segmenten per volle cirkel
+BULGE_EPS = 1e-12
+
+def arc_segments(radius, sweep, tolerance):
+    """Aantal koorden per boog zodat de pijlhoogte r·(1 - cos(φ/2)) binnen de tolerantie blijft."""
+    radius = np.asarray(radius, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        step = 2 * np.arccos(np.clip(1 - tolerance / radius, -1.0, 1.0))
+    step = np.minimum(np.where(radius > 0, step, MAX_STEP), MAX_STEP)
+    return np.maximum(np.ceil(np.abs(sweep) / step - 1e-9), 1).astype(np.int64)
+
+class RingBuilder:
+    """Verzamelt gesloten ringen als reeks hoekpunten (met bulge) en expliciete bogen, en tesselleert een hele
+    batch in één gevectoriseerde stap. Elk element begint op zijn eigen startpunt en loopt tot het volgende element."""
+
+    def __init__(self, tolerance=DEFAULT_TOLERANCE):
+        self.tolerance = tolerance; self.clear()
+
+    def clear(self):
+        self._points = []; self._bulges = []; self._arcs = []; self._sizes = []; self._exact = []
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def add_polyline(self, points, bulges=None, exact_area=None):
+        """Gesloten polylijn; bulge = tan(boog/4) van het segment naar het volgende punt (DXF-conventie)."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)[:, :2]; n = len(points)
+        if n > 1 and np.array_equal(points[0], points[-1]): points = points[:-1]; bulges = None if bulges is None else bulges[:-1]; n -= 1
+        if n < 3 and (bulges is None or not np.any(np.abs(bulges) > BULGE_EPS)): return False
+        self._points.append(points); self._bulges.append(np.zeros(n) if bulges is None else np.asarray(bulges, dtype=np.float64))
+        self._arcs.append(np.full((n, 4), np.nan)); self._sizes.append(n); self._exact.append(np.nan if exact_area is None else exact_area)
+        return True
+
+    def add_circle(self, center, radius):
+        return self.add_path([('arc', center, radius, 0.0, 2 * np.pi)], exact_area=np.pi * radius ** 2)
+
+    def add_path(self, elements, exact_area=None):
+        """Ring uit losse elementen: ('point', (x, y)) of ('arc', middelpunt, straal, beginhoek, zwaai) in radialen,
+        zwaai > 0 tegen de klok in."""
+        points, arcs = [], []
+        for element in elements:
+            if element[0] == 'arc':
+                _, (cx, cy), radius, start, sweep = element
+                points.append((cx + radius * np.cos(start), cy + radius * np.sin(start))); arcs.append((cx, cy, radius, sweep))
+            else: points.append(tuple(element[1])[:2]); arcs.append((np.nan,) * 4)
+        if not points: return False
+        self._points.append(np.array(points, dtype=np.float64)); self._bulges.append(np.zeros(len(points)))
+        self._arcs.append(np.array(arcs, dtype=np.float64)); self._sizes.append(len(points))
+        self._exact.append(np.nan if exact_area is None else exact_area)
+        return True
+
+    def build(self):
+        """Geeft (lijst met vertexarrays, exacte oppervlaktes) voor alle verzamelde ringen en leegt de builder."""
+        if not self._sizes: return [], np.empty(0)
+        points = np.concatenate(self._points); bulges = np.concatenate(self._bulges); arcs = np.concatenate(self._arcs)
+        sizes = np.array(self._sizes, dtype=np.int64); exact = np.array(self._exact, dtype=np.float64); self.clear()
+        starts = np.cumsum(sizes) - sizes; ring = np.repeat(np.arange(len(sizes)), sizes)
+        nxt = np.arange(1, len(points) + 1); nxt[starts + sizes - 1] = starts
+        p, q = points, points[nxt]
+
+        # Bulges omzetten naar middelpunt/straal/zwaai; expliciete bogen hebben die al.
+        explicit = np.isfinite(arcs[:, 2]); sweep = np.where(explicit, arcs[:, 3], 4 * np.arctan(bulges))
+        center = arcs[:, :2].copy(); radius = arcs[:, 2].copy()
+        chord = q - p; length = np.hypot(chord[:, 0], chord[:, 1])
+        bulged = ~explicit & (np.abs(bulges) > BULGE_EPS) & (length > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            radius[bulged] = length[bulged] / (2 * np.abs(np.sin(sweep[bulged] / 2)))
+            # Middelpunt links van de koorde bij een boog tegen de klok in, rechts bij een boog met de klok mee.
+            offset = 0.5 / np.tan(sweep[bulged] / 2)
+        center[bulged] = (p[bulged] + q[bulged]) / 2 + offset[:, None] * np.column_stack([-chord[bulged, 1], chord[bulged, 0]])
+        is_arc = explicit | bulged
+        sweep = np.where(is_arc, sweep, 0.0); radius = np.where(is_arc, radius, 0.0)
+
+        segments = np.where(is_arc, arc_segments(radius, sweep, self.tolerance), 1)
+        # Elk element levert zijn startpunt plus (segments - 1) tussenpunten op de boog.
+        element = np.repeat(np.arange(len(points)), segments)
+        step = np.arange(segments.sum()) - np.repeat(np.cumsum(segments) - segments, segments)
+        start_angle = np.arctan2(p[:, 1] - center[:, 1], p[:, 0] - center[:, 0])
+        angle = start_angle[element] + sweep[element] * step / segments[element]
+        on_arc = is_arc[element] & (step > 0)
+        vertices = np.where(on_arc[:, None], center[element] + radius[element, None] * np.column_stack([np.cos(angle), np.sin(angle)]), p[element])
+
+        # Exacte oppervlakte: shoelace van de afgevlakte ring plus de cirkelsegmenten tussen elke koorde en de boog.
+        out_sizes = np.bincount(ring, weights=segments, minlength=len(sizes)).astype(np.int64)
+        out_starts = np.cumsum(out_sizes) - out_sizes
+        vnext = np.arange(1, len(vertices) + 1); vnext[out_starts + out_sizes - 1] = out_starts
+        cross = vertices[:, 0] * vertices[vnext, 1] - vertices[vnext, 0] * vertices[:, 1]
+        phi = np.abs(sweep) / segments
+        correction = np.sign(sweep) * segments * radius ** 2 / 2 * (phi - np.sin(phi))
+        signed = 0.5 * np.add.reduceat(cross, out_starts) + np.bincount(ring, weights=correction, minlength=len(sizes))
+        areas = np.where(np.isfinite(exact), exact, np.abs(signed))
+        return np.split(vertices, out_starts[1:]), areas
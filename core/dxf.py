@@ -0,0 +1,388 @@
+# core/dxf.py
+import math
+import mmap
+import re
+import numpy as np
+from core.curves import DEFAULT_TOLERANCE, RingBuilder
+from core.profiling import timed
+
+POLYGON_TYPES = ('LWPOLYLINE', 'POLYLINE', 'CIRCLE', 'ELLIPSE', 'SPLINE', 'HATCH')
+HATCH_OUTER_PATHS = 1 | 16  # EXTERNAL | OUTERMOST; eilanden (gaten) in een arcering worden niet afgetrokken
+LOADED_TYPES = POLYGON_TYPES + ('INSERT',)
+RAW_TAG_CODES = (b'2', b'8', b'10', b'20', b'67')
+RAW_TAG_LIMIT = 64
+ENTITY_START = re.compile(rb'\n[ \t]*0\r?\n([A-Za-z_][^\r\n]*?)[ \t]*(?=\r?\n)')
+BINARY_DXF_SENTINEL = b'AutoCAD Binary DXF'
+# De tekstindex laadt losse entiteiten met interne ezdxf-functies (geen publieke API); alleen voor deze versies
+# (major, minor) is dat getest (tests/test_dxf.py). Andere versies lezen het document via ezdxf.readfile.
+INDEXED_EZDXF_VERSIONS = {(1, 4)}
+
+def _edge_elements(edges, tolerance):
+    """Elementen voor RingBuilder.add_path uit de randen van een HATCH-randpad."""
+    elements = []
+    for edge in edges:
+        kind = edge.EDGE_TYPE
+        if kind == 'LineEdge': elements.append(('point', edge.start))
+        elif kind == 'ArcEdge':
+            # ezdxf bewaart de hoeken altijd tegen de klok in; ccw=False betekent doorlopen van eind naar begin.
+            span = (edge.end_angle - edge.start_angle) % 360.0 or 360.0
+            start = edge.start_angle if edge.ccw else edge.end_angle
+            elements.append(('arc', edge.center, edge.radius, math.radians(start), math.radians(span if edge.ccw else -span)))
+        else:  # EllipseEdge / SplineEdge: afvlakken via ezdxf, oppervlakte uit de afgevlakte punten
+            points = [(v.x, v.y) for v in edge.construction_tool().flattening(tolerance)]
+            if kind == 'EllipseEdge' and not edge.ccw: points.reverse()
+            elements.extend(('point', point) for point in points[:-1])
+    return elements
+
+def add_entity(builder, entity):
+    """Voegt een gesloten bed uit de entiteit toe aan de builder; False voor entiteiten die geen bed zijn."""
+    entity_type = entity.dxftype(); tolerance = builder.tolerance
+    if entity_type == 'LWPOLYLINE':
+        if not entity.closed: return False
+        rows = np.array(list(entity.get_points('xyb')), dtype=np.float64).reshape(-1, 3)
+        return builder.add_polyline(rows[:, :2], rows[:, 2])
+    if entity_type == 'POLYLINE':
+        if not entity.is_closed or entity.is_poly_face_mesh or entity.is_polygon_mesh: return False
+        vertices = list(entity.vertices)
+        return builder.add_polyline([(v.dxf.location.x, v.dxf.location.y) for v in vertices], [v.dxf.bulge for v in vertices])
+    if entity_type == 'CIRCLE':
+        return builder.add_circle((entity.dxf.center.x, entity.dxf.center.y), entity.dxf.radius)
+    if entity_type == 'ELLIPSE':
+        span = (entity.dxf.end_param - entity.dxf.start_param) % (2 * math.pi)
+        if span > 1e-9: return False  # elliptische boog, geen gesloten bed
+        major = entity.dxf.major_axis; a = math.hypot(major.x, major.y)
+        return builder.add_polyline([(v.x, v.y) for v in entity.flattening(tolerance)], exact_area=math.pi * a * a * entity.dxf.ratio)
+    if entity_type == 'SPLINE':
+        points = [(v.x, v.y) for v in entity.flattening(tolerance)]
+        if len(points) < 3 or not (entity.closed or math.dist(points[0], points[-1]) <= tolerance): return False
+        return builder.add_polyline(points)
+    if entity_type == 'HATCH':
+        paths = list(entity.paths); outer = [p for p in paths if p.path_type_flags & HATCH_OUTER_PATHS] or paths; added = False
+        for path in outer:
+            if type(path).__name__ == 'PolylinePath':
+                rows = np.array(path.vertices, dtype=np.float64).reshape(-1, 3); added |= builder.add_polyline(rows[:, :2], rows[:, 2])
+            else: added |= builder.add_path(_edge_elements(path.edges, tolerance))
+        return added
+    return False
+
+class _IndexedSource:
+    """Entiteiten via een eigen index van het bestand: één regex over de ruwe bytes vindt het begin van elke entiteit
+    (groepcode 0 gevolgd door een typenaam; groepcoderegels zijn altijd numeriek, dus een waarde kan daar niet op
+    lijken). Van elke entiteit worden daarna eerst alleen laag, bloknaam en papierruimte uit de ruwe tekst gelezen;
+    alleen entiteiten die accept(type, laag, bloknaam) doorlaat, worden echt geladen. Het bestand wordt via mmap
+    gelezen, dus niet in zijn geheel in het geheugen gezet; loader is (load, linker) uit _ezdxf_internals."""
+
+    def __init__(self, data, encoding, loader):
+        self.data = data; self.encoding = encoding; self.progress = 0.0; self._blocks = None
+        self._factory_load, self._linker = loader
+        # De eerste entiteit heeft geen regelovergang ervoor; de andere beginnen direct na de \n uit het patroon.
+        # (Een alternatief \A| in het patroon zelf maakt het zoeken over het hele bestand vijf keer zo traag.)
+        first = ENTITY_START.match(b'\n' + data[:256]); matches = list(ENTITY_START.finditer(data))
+        self.types = [m.group(1).decode('ascii', errors='replace') for m in ([first] if first else []) + matches]
+        self.starts = ([0] if first else []) + [m.start() + 1 for m in matches] + [len(data)]
+        self.sections = {self._tags(self._chunk(i), b'2').get(b'2'): i for i, kind in enumerate(self.types) if kind == 'SECTION'}
+
+    def close(self):
+        if self.data is not None: self.data.close(); self.data = None
+
+    def _chunk(self, position):
+        return self.data[self.starts[position]:self.starts[position + 1]]
+
+    def _chunks(self, position, end=('ENDSEC', 'ENDBLK')):
+        """(indexpositie, type, ruwe bytes) per entiteit vanaf position tot het einde van de sectie of het blok."""
+        while position < len(self.types) and self.types[position] not in end:
+            yield position, self.types[position], self._chunk(position); position += 1
+
+    def _tags(self, data, last=b'8'):
+        """Eerste waarde van naam (2), laag (8), basispunt (10, 20) en papierruimte (67) tot en met groepcode last,
+        zonder de entiteit te laden; die staan vooraan, dus hooguit de eerste RAW_TAG_LIMIT tags worden bekeken."""
+        lines = data.split(b'\n', 2 * RAW_TAG_LIMIT); found = {}
+        for i in range(0, len(lines) - 1, 2):
+            code = lines[i].strip()
+            if code in RAW_TAG_CODES and code not in found:
+                found[code] = lines[i + 1].rstrip(b'\r').decode(self.encoding, errors='surrogateescape')
+                if code == last: break
+        return found
+
+    def _load(self, data):
+        return self._factory_load(data.decode(self.encoding, errors='surrogateescape').replace('\r\n', '\n'))
+
+    def _entities(self, position, accept, track_progress=False):
+        link = None; queued = None
+        for position, entity_type, data in self._chunks(position):
+            if entity_type in ('VERTEX', 'SEQEND'):
+                if link: link(self._load(data))
+                continue
+            link = None
+            if entity_type not in LOADED_TYPES: continue
+            tags = self._tags(data, b'2' if entity_type == 'INSERT' else b'8')
+            if tags.get(b'67', '').strip() == '1' or not accept(entity_type, tags.get(b'8', '0'), tags.get(b'2')): continue
+            entity = self._load(data)
+            if entity_type == 'POLYLINE': link = self._linker(); link(entity)  # VERTEX/SEQEND hierna koppelen
+            if queued is not None: yield queued
+            queued = entity
+            if track_progress: self.progress = self.starts[position] / len(self.data)
+        if queued is not None: yield queued
+
+    def modelspace(self, accept):
+        yield from self._entities(self.sections['ENTITIES'] + 1, accept, track_progress=True)
+
+    def block(self, name):
+        """(basispunt, functie accept -> entiteiten) voor een blokdefinitie, of None als het blok niet bestaat."""
+        if self._blocks is None:
+            self._blocks = {}
+            if 'BLOCKS' in self.sections:
+                for position, entity_type, data in self._chunks(self.sections['BLOCKS'] + 1, end=('ENDSEC',)):
+                    if entity_type != 'BLOCK': continue
+                    tags = self._tags(data, b'20')
+                    self._blocks[tags.get(b'2', '').lower()] = (position + 1, (float(tags.get(b'10', 0)), float(tags.get(b'20', 0))))
+        if name.lower() not in self._blocks: return None
+        position, base = self._blocks[name.lower()]
+        return base, lambda accept: self._entities(position, accept)
+
+class _DocumentSource:
+    """Volledig ingelezen document, voor bestanden zonder tekstindex (binaire DXF)."""
+
+    def __init__(self, doc):
+        self.doc = doc; self.progress = 0.0
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _filter(entities, accept):
+        for entity in entities:
+            entity_type = entity.dxftype()
+            if entity_type in LOADED_TYPES and accept(entity_type, entity.dxf.layer, entity.dxf.name if entity_type == 'INSERT' else None): yield entity
+
+    def modelspace(self, accept):
+        msp = list(self.doc.modelspace())
+        for i, entity in enumerate(msp):
+            self.progress = (i + 1) / len(msp); yield from self._filter([entity], accept)
+
+    def block(self, name):
+        layout = self.doc.blocks.get(name)
+        if layout is None: return None
+        base = layout.block.dxf.base_point
+        return (base.x, base.y), lambda accept: self._filter(layout, accept)
+
+def _ezdxf_internals():
+    """(load, linker) voor de tekstindex, of None als de geïnstalleerde ezdxf niet getest is of de functies mist."""
+    import ezdxf
+    if tuple(ezdxf.version[:2]) not in INDEXED_EZDXF_VERSIONS:
+        print(f"ezdxf {ezdxf.__version__} is niet getest met de snelle DXF-index; het document wordt volledig ingelezen."); return None
+    try:
+        from ezdxf.entities import factory
+        from ezdxf.entities.subentity import entity_linker
+        from ezdxf.lldxf.extendedtags import ExtendedTags
+    except ImportError as e:
+        print(f"Snelle DXF-index niet beschikbaar ({e}); het document wordt volledig ingelezen."); return None
+    return (lambda text: factory.load(ExtendedTags.from_text(text))), entity_linker
+
+def _open(filepath):
+    # ezdxf pas bij het eerste laden importeren; bij het opstarten kost dat anders ruim 0,1 s.
+    import ezdxf
+    from ezdxf.filemanagement import dxf_file_info
+    loader = _ezdxf_internals()
+    if loader is not None:
+        with open(filepath, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if f.seek(0, 2) else None  # lege bestanden kunnen niet gemapt worden
+        if data is not None:
+            if data[:len(BINARY_DXF_SENTINEL)] != BINARY_DXF_SENTINEL:
+                source = _IndexedSource(data, dxf_file_info(filepath).encoding, loader)
+                if 'ENTITIES' in source.sections: return source
+            data.close()
+    return _DocumentSource(ezdxf.readfile(filepath))
+
+def _layer_set(layers):
+    return None if layers is None else {layer.lower() for layer in layers}
+
+def _insert_layer(ring_layer, insert_layer):
+    """Laag van een ring na invoegen: entiteiten op laag 0 in een blok nemen de laag van de INSERT over."""
+    if ring_layer is not None: return ring_layer
+    return None if insert_layer == '0' else insert_layer
+
+def insert_transforms(base, points, xscale, yscale, rotation, columns=None, rows=None, column_spacing=None, row_spacing=None):
+    """Affiene transformaties (A (K, 2, 2), t (K, 2), insert per kopie) van blokcoördinaten naar wereldcoördinaten voor
+    een reeks INSERTs van hetzelfde blok, in één stap: p -> insert + R·(S·(p - basispunt) + rasterverschuiving).
+    Een MINSERT-raster (kolommen × rijen) wordt uitgevouwen tot één transformatie per kopie."""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2); n = len(points)
+    ones = np.ones(n, dtype=np.int64); zeros = np.zeros(n)
+    columns = ones if columns is None else np.maximum(np.asarray(columns, dtype=np.int64), 1)
+    rows = ones if rows is None else np.maximum(np.asarray(rows, dtype=np.int64), 1)
+    column_spacing = zeros if column_spacing is None else np.asarray(column_spacing, dtype=np.float64)
+    row_spacing = zeros if row_spacing is None else np.asarray(row_spacing, dtype=np.float64)
+    copies = columns * rows; owner = np.repeat(np.arange(n), copies); local = np.arange(copies.sum()) - np.repeat(np.cumsum(copies) - copies, copies)
+    angle = np.radians(np.asarray(rotation, dtype=np.float64))[owner]; c, s = np.cos(angle), np.sin(angle)
+    sx = np.asarray(xscale, dtype=np.float64)[owner]; sy = np.asarray(yscale, dtype=np.float64)[owner]
+    A = np.empty((len(owner), 2, 2)); A[:, 0, 0] = c * sx; A[:, 0, 1] = -s * sy; A[:, 1, 0] = s * sx; A[:, 1, 1] = c * sy
+    dx = local % columns[owner] * column_spacing[owner]; dy = local // columns[owner] * row_spacing[owner]
+    t = points[owner] + np.column_stack([c * dx - s * dy, s * dx + c * dy]) - A @ np.asarray(base, dtype=np.float64)
+    return A, t, owner
+
+class BlockGeometry:
+    """Afgevlakte bedden van één blokdefinitie in blokcoördinaten, één keer opgebouwd en voor elke INSERT hergebruikt.
+    layers per ring: de eigen laag (kleine letters), of None voor laag 0 (neemt de laag van de INSERT over)."""
+
+    def __init__(self, vertices, sizes, exact, layers):
+        self.vertices = vertices; self.sizes = sizes; self.exact = exact; self.layers = layers
+
+    @classmethod
+    def combine(cls, parts):
+        parts = [part for part in parts if len(part.sizes)]
+        if not parts: return cls(np.empty((0, 2)), np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=object))
+        return cls(*(np.concatenate([getattr(part, key) for part in parts]) for key in ('vertices', 'sizes', 'exact', 'layers')))
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def select(self, mask):
+        return BlockGeometry(self.vertices[np.repeat(mask, self.sizes)], self.sizes[mask], self.exact[mask], self.layers[mask])
+
+    def transform(self, A, t):
+        """Alle ringen onder alle K transformaties tegelijk: één einsum over (kopie, vertex)."""
+        vertices = (np.einsum('kij,vj->kvi', A, self.vertices) + t[:, None, :]).reshape(-1, 2)
+        det = np.abs(A[:, 0, 0] * A[:, 1, 1] - A[:, 0, 1] * A[:, 1, 0])  # affiene afbeelding: oppervlakte × |det|
+        return BlockGeometry(vertices, np.tile(self.sizes, len(A)), (det[:, None] * self.exact[None, :]).ravel(), np.tile(self.layers, len(A)))
+
+    def polygons(self):
+        return np.split(self.vertices, np.cumsum(self.sizes)[:-1]) if len(self.sizes) else []
+
+class BlockCache:
+    """Blokgeometrie per (blok, koordetolerantie) en de lagen per blok, elk één keer opgebouwd voor alle INSERTs.
+    Geneste INSERTs worden bij het opbouwen van het omliggende blok uitgevouwen."""
+
+    def __init__(self, source, tolerance=DEFAULT_TOLERANCE):
+        self.source = source; self.tolerance = tolerance
+        self._geometry = {}; self._layers = {}; self._bases = {}; self._building = set()
+
+    def _definition(self, name):
+        key = name.lower()
+        if key not in self._bases: self._bases[key] = self.source.block(name)
+        return self._bases[key]
+
+    def base(self, name):
+        definition = self._definition(name)
+        return definition[0] if definition else (0.0, 0.0)
+
+    def layers(self, name):
+        """Lagen waarop dit blok bedden kan opleveren (None: laag 0, dus de laag van de INSERT); zonder te laden."""
+        key = name.lower()
+        if key in self._layers: return self._layers[key]
+        definition = self._definition(name); found = set(); self._layers[key] = found  # ook bij zelfverwijzing eindig
+        if definition:
+            def record(entity_type, layer, insert_name):
+                layer = layer.lower()
+                if entity_type != 'INSERT': found.add(None if layer == '0' else layer)
+                elif insert_name: found.update(_insert_layer(child, layer) for child in self.layers(insert_name))
+                return False
+            for _ in definition[1](record): pass
+        return found
+
+    def relevant(self, name, insert_layer, wanted):
+        """True als een INSERT van dit blok op deze laag bedden oplevert op een van de gevraagde lagen."""
+        layers = self.layers(name)
+        if wanted is None: return bool(layers)
+        return any(layer in wanted for layer in layers if layer is not None) or (None in layers and insert_layer.lower() in wanted)
+
+    def geometry(self, name, tolerance=None):
+        tolerance = self.tolerance if tolerance is None else tolerance; key = (name.lower(), tolerance)
+        if key in self._geometry: return self._geometry[key]
+        definition = self._definition(name)
+        if not definition or name.lower() in self._building: return BlockGeometry.combine([])
+        self._building.add(name.lower())
+        try:
+            builder = RingBuilder(tolerance); layers = []; inserts = {}
+            for entity in definition[1](lambda entity_type, layer, insert_name: True):
+                if entity.dxftype() == 'INSERT': inserts.setdefault(entity.dxf.name, []).append(insert_row(entity)); continue
+                before = len(builder); add_entity(builder, entity); layer = entity.dxf.layer.lower()
+                layers.extend([None if layer == '0' else layer] * (len(builder) - before))
+            polygons, exact = builder.build()
+            own = BlockGeometry(np.concatenate(polygons) if polygons else np.empty((0, 2)), np.array([len(p) for p in polygons], dtype=np.int64),
+                                exact, np.array(layers, dtype=object))
+            nested = [self.expand(child, rows, tolerance) for child, rows in inserts.items()]
+            geometry = BlockGeometry.combine([own] + [part for group in nested for part in group])
+        finally:
+            self._building.discard(name.lower())
+        self._geometry[key] = geometry
+        return geometry
+
+    def expand(self, name, rows, tolerance, wanted=None, max_vertices=1 << 20):
+        """Bedden van alle INSERTs (rijen uit insert_row) van één blok, per deel van hooguit max_vertices vertices.
+        Met wanted alleen de ringen op die lagen; ringen op laag 0 nemen de laag van hun INSERT over."""
+        rows = [row for row in rows if row[2] and row[3]]  # schaal 0: geen oppervlakte
+        if not rows: return []
+        scale = max(max(abs(row[2]), abs(row[3])) for row in rows)
+        geometry = self.geometry(name, tolerance / scale if scale > 0 else tolerance)  # vergroting vraagt een fijnere afvlakking
+        if not len(geometry): return []
+        parts = []
+        for insert_layer in dict.fromkeys(row[9] for row in rows):
+            group = [row for row in rows if row[9] == insert_layer]
+            layers = np.array([_insert_layer(layer, insert_layer) for layer in geometry.layers], dtype=object)
+            mask = np.ones(len(layers), dtype=bool) if wanted is None else np.array([(layer or '0') in wanted for layer in layers], dtype=bool)
+            if not mask.any(): continue
+            selected = BlockGeometry(geometry.vertices, geometry.sizes, geometry.exact, layers).select(mask)
+            A, t, _ = insert_transforms(self.base(name), [row[:2] for row in group], *zip(*[row[2:9] for row in group]))
+            step = max(1, max_vertices // max(len(selected.vertices), 1))
+            parts.extend(selected.transform(A[i:i + step], t[i:i + step]) for i in range(0, len(A), step))
+        return parts
+
+def insert_row(entity):
+    """(x, y, xschaal, yschaal, rotatie, kolommen, rijen, kolomafstand, rijafstand, laag) van een INSERT of MINSERT."""
+    dxf = entity.dxf; point = dxf.insert
+    return (point.x, point.y, dxf.get('xscale', 1.0), dxf.get('yscale', 1.0), dxf.get('rotation', 0.0), dxf.get('column_count', 1),
+            dxf.get('row_count', 1), dxf.get('column_spacing', 0.0), dxf.get('row_spacing', 0.0), dxf.layer.lower())
+
+@timed('dxf.scan_layers')
+def scan_layers(filepath):
+    """Lagen met bedden of blokreferenties in de modelspace als {laag: aantal objecten}, zonder de entiteiten te laden.
+    Lagen die alleen via een blok bedden opleveren, staan erin met 0."""
+    source = _open(filepath); blocks = BlockCache(source); counts = {}; names = {}
+    def record(entity_type, layer, insert_name):
+        key = layer.lower(); names.setdefault(key, layer); counts[key] = counts.get(key, 0) + 1
+        if entity_type == 'INSERT' and insert_name:
+            for child in blocks.layers(insert_name):
+                if child is not None: names.setdefault(child, child); counts.setdefault(child, 0)
+        return False
+    try:
+        for _ in source.modelspace(record): pass
+    finally:
+        source.close()
+    return {names[key]: counts[key] for key in sorted(counts)}
+
+def iter_polygon_batches(filepath, batch_size=500, tolerance=DEFAULT_TOLERANCE, layers=None):
+    """Streamt de bedden uit de modelspace in batches; levert (batch, exacte oppervlaktes, voortgang 0-1) op.
+
+    Bogen (bulges, cirkels, arceringsranden) worden per batch in één keer afgevlakt met de opgegeven
+    koordetolerantie; de oppervlaktes komen rechtstreeks uit de bogen.
+    Met layers worden alleen entiteiten op die lagen geladen (hoofdletterongevoelig); van de rest wordt alleen
+    type en laag uit de ruwe tekst gelezen. Bedden uit blokreferenties (INSERT, MINSERT, ook genest) volgen na de
+    losse bedden, zodat hun volgnummers niet verschuiven; per blok wordt de geometrie één keer opgebouwd en daarna
+    voor alle INSERTs van dat blok in één matrixstap getransformeerd.
+    Er wordt alleen een index van het bestand opgebouwd in plaats van het volledige document; binaire DXF-bestanden
+    worden in hun geheel ingelezen."""
+    source = _open(filepath); wanted = _layer_set(layers)
+    builder = RingBuilder(tolerance); blocks = BlockCache(source, tolerance); inserts = {}
+    def accept(entity_type, layer, insert_name):
+        if entity_type == 'INSERT': return bool(insert_name) and blocks.relevant(insert_name, layer, wanted)
+        return wanted is None or layer.lower() in wanted
+    try:
+        for entity in source.modelspace(accept):
+            if entity.dxftype() == 'INSERT': inserts.setdefault(entity.dxf.name, []).append(insert_row(entity)); continue
+            add_entity(builder, entity)
+            if len(builder) >= batch_size: yield *builder.build(), source.progress
+        yield *builder.build(), source.progress
+        for name, rows in inserts.items():
+            for part in blocks.expand(name, rows, tolerance, wanted): yield part.polygons(), part.exact, source.progress
+        yield [], np.empty(0), 1.0
+    finally:
+        source.close()
+
+@timed('dxf.load')
+def load_polygons(filepath, tolerance=DEFAULT_TOLERANCE, layers=None):
+    """Leest alle bedden (eventueel alleen van de opgegeven lagen) in één keer in, voor gebruik zonder GUI-thread;
+    geeft (polygonen, exacte oppervlaktes)."""
+    polygons, areas = [], []
+    for batch, batch_areas, _ in iter_polygon_batches(filepath, tolerance=tolerance, layers=layers):
+        polygons.extend(batch); areas.extend(batch_areas)
+    return polygons, areas
@@ -0,0 +1,100 @@
+# core/geometry.py
+import numpy as np
+from core.spatial import GridIndex
+from core.profiling import timed
+
+def calculate_polygon_area(vertices):
+    """Oppervlakte van één losse polygoon (shoelace-formule)."""
+    v = np.asarray(vertices, dtype=np.float64).reshape(-1, 2); x, y = v[:, 0], v[:, 1]
+    return 0.5 * np.abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+
+def is_point_in_polygon(point, polygon_vertices):
+    x, y = point; n = len(polygon_vertices); is_inside = False
+    p1x, p1y = polygon_vertices[0]
+    for i in range(n + 1):
+        p2x, p2y = polygon_vertices[i % n]
+        if y > min(p1y, p2y):
+            if y <= max(p1y, p2y):
+                if x <= max(p1x, p2x):
+                    if p1y != p2y: x_intersection = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
+                    if p1x == p2x or x <= x_intersection: is_inside = not is_inside
+        p1x, p1y = p2x, p2y
+    return is_inside
+
+class PolygonStore:
+    """Compacte opslag van alle bedden: één vertexbuffer plus offsets, met oppervlakte/bbox/zwaartepunt
+    per polygoon die bij het laden in één gevectoriseerde stap worden berekend. Voor afgevlakte bogen kunnen
+    exacte oppervlaktes worden meegegeven; NaN betekent: uit de vertices berekenen."""
+
+    @timed('geometry.build')
+    def __init__(self, vertices, offsets, areas=None):
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float64).reshape(-1, 2)
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        self._compute_properties()
+        if areas is not None:
+            areas = np.asarray(areas, dtype=np.float64); self.areas = np.where(np.isfinite(areas), areas, self.areas)
+        self.index = GridIndex(self.bboxes)
+
+    @classmethod
+    def from_polygons(cls, polygons, areas=None):
+        """Bouwt de store uit een lijst met vertexlijsten (en eventueel exacte oppervlaktes); lege polygonen worden overgeslagen."""
+        arrays = [np.asarray(p, dtype=np.float64).reshape(-1, 2) for p in polygons]
+        if areas is not None: areas = [area for a, area in zip(arrays, areas) if len(a)]
+        arrays = [a for a in arrays if len(a)]
+        counts = np.fromiter((len(a) for a in arrays), dtype=np.int64, count=len(arrays))
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64); np.cumsum(counts, out=offsets[1:])
+        vertices = np.concatenate(arrays) if arrays else np.empty((0, 2))
+        return cls(vertices, offsets, areas)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def polygon(self, index):
+        return self.vertices[self.offsets[index]:self.offsets[index + 1]]
+
+    def contains_point(self, x, y, indices):
+        """Gevectoriseerde even-odd test van één punt tegen de opgegeven polygonen; geeft een bool-array."""
+        indices = np.asarray(indices, dtype=np.int64)
+        if not len(indices): return np.zeros(0, dtype=bool)
+        starts = self.offsets[indices]; counts = self.offsets[indices + 1] - starts
+        seg_starts = np.cumsum(counts) - counts
+        edges = np.repeat(starts - seg_starts, counts) + np.arange(counts.sum(), dtype=np.int64)
+        p1 = self.vertices[edges]; p2 = self.vertices[self.next_index[edges]]
+        crosses = (p1[:, 1] > y) != (p2[:, 1] > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_intersection = (p2[:, 0] - p1[:, 0]) * (y - p1[:, 1]) / (p2[:, 1] - p1[:, 1]) + p1[:, 0]
+        hits = crosses & (x < x_intersection)
+        return np.add.reduceat(hits.astype(np.int64), seg_starts) % 2 == 1
+
+    @timed('geometry.hit_test')
+    def hit_test(self, x, y):
+        """Index van het kleinste bed dat het punt bevat (geneste bedden), of -1."""
+        candidates = self.index.query_point(x, y)
+        candidates = candidates[self.contains_point(x, y, candidates)]
+        if not len(candidates): return -1
+        return int(candidates[np.argmin(self.areas[candidates])])
+
+    def _compute_properties(self):
+        n = len(self); starts = self.offsets[:-1]
+        if n == 0:
+            self.next_index = np.empty(0, dtype=np.int64); self.areas = np.empty(0)
+            self.bboxes = np.empty((0, 4)); self.centroids = np.empty((0, 2)); return
+        # Index van de volgende vertex binnen dezelfde ring; de laatste vertex wijst terug naar de eerste.
+        self.next_index = np.arange(1, len(self.vertices) + 1, dtype=np.int64)
+        self.next_index[self.offsets[1:] - 1] = starts
+        x, y = self.vertices[:, 0], self.vertices[:, 1]; counts = np.diff(self.offsets)
+        self.bboxes = np.column_stack([np.minimum.reduceat(x, starts), np.minimum.reduceat(y, starts),
+                                       np.maximum.reduceat(x, starts), np.maximum.reduceat(y, starts)])
+        mean = np.column_stack([np.add.reduceat(x, starts), np.add.reduceat(y, starts)]) / counts[:, None]
+        # Shoelace relatief ten opzichte van de eerste vertex van elke ring: met RD-coördinaten (~10⁵ m) heffen de
+        # kruisproducten elkaar anders op tot ruis, wat bij kleine bedden oppervlakte en zwaartepunt onbruikbaar maakt.
+        origin = self.vertices[starts]; local = self.vertices - np.repeat(origin, counts, axis=0)
+        x, y = local[:, 0], local[:, 1]; xn, yn = x[self.next_index], y[self.next_index]
+        cross = x * yn - xn * y
+        signed_area = 0.5 * np.add.reduceat(cross, starts)
+        self.areas = np.abs(signed_area)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cx = np.add.reduceat((x + xn) * cross, starts) / (6.0 * signed_area)
+            cy = np.add.reduceat((y + yn) * cross, starts) / (6.0 * signed_area)
+        degenerate = ~np.isfinite(cx) | ~np.isfinite(cy) | (self.areas == 0)
+        self.centroids = np.where(degenerate[:, None], mean, origin + np.column_stack([cx, cy]))
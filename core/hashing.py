@@ -0,0 +1,9 @@
+# core/hashing.py
+# Inhoudshash van bestanden, gedeeld door de thumbnail-cache en het koppelen van afbeeldingen; zonder ReportLab of PIL.
+import hashlib
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''): h.update(block)
+    return h.hexdigest()
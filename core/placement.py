@@ -0,0 +1,110 @@
+# core/placement.py
+# Plantposities per bed op een driehoeks- (hex-)grid met de opgegeven dichtheid. De gridrijen van alle bedden worden
+# tegelijk gegenereerd en gevectoriseerd gemaskeerd: een scanline-even-odd test per rij plus de afstand tot de rand.
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from core.profiling import timed
+
+DEFAULT_EDGE_MARGIN = 0.5  # minimale afstand tot de rand, als fractie van de plantafstand
+MAX_PAIRS = 1 << 22  # (rij, rand)-paren plus gridpunten per blok, begrenst het geheugengebruik
+
+def hex_spacing(plants_per_m2):
+    """Plantafstand in een driehoeksverband: elke plant beslaat een zeshoek van √3/2·s² = 1/dichtheid."""
+    return np.sqrt(2.0 / (np.sqrt(3.0) * np.asarray(plants_per_m2, dtype=np.float64)))
+
+def _grid_rows(bboxes, spacing, margin):
+    """Hexgrid binnen de (met margin verkleinde) bbox van elk bed, gecentreerd: per rij (bed, y, x0, aantal kolommen)."""
+    row_height = spacing * np.sqrt(3.0) / 2
+    width = np.maximum(bboxes[:, 2] - bboxes[:, 0] - 2 * margin, 0.0); height = np.maximum(bboxes[:, 3] - bboxes[:, 1] - 2 * margin, 0.0)
+    nx = np.floor(width / spacing).astype(np.int64) + 1; ny = np.floor(height / row_height).astype(np.int64) + 1
+    x0 = bboxes[:, 0] + margin + (width - (nx - 1) * spacing) / 2; y0 = bboxes[:, 1] + margin + (height - (ny - 1) * row_height) / 2
+    bed = np.repeat(np.arange(len(bboxes)), ny); row = np.arange(ny.sum()) - np.repeat(np.cumsum(ny) - ny, ny)
+    # Oneven rijen een halve plantafstand verschoven; wat daardoor buiten het bed valt, valt in de maskering weg.
+    return bed, y0[bed] + row * row_height[bed], x0[bed] + 0.5 * (row % 2) * spacing[bed], nx[bed]
+
+def _expand(counts):
+    """(groep, positie binnen de groep) voor groepen van de opgegeven grootte."""
+    group = np.repeat(np.arange(len(counts)), counts)
+    return group, np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+def _place_block(store, beds, densities, edge_margin):
+    """Scanline per gridrij: de even-odd test telt de snijpunten van de rij met de bedrand links van elk punt,
+    de randafstand wordt alleen getoetst tegen randen die binnen margin van de rij liggen."""
+    spacing = hex_spacing(densities); margin = edge_margin * spacing; bboxes = store.bboxes[beds]
+    row_bed, row_y, row_x0, row_nx = _grid_rows(bboxes, spacing, margin)
+    starts = store.offsets[beds]; edge_counts = store.offsets[beds + 1] - starts
+
+    # (rij, rand)-paren van het eigen bed, beperkt tot randen waarvan het y-bereik (± margin) de rij raakt.
+    pair_row, local = _expand(edge_counts[row_bed]); edge = starts[row_bed[pair_row]] + local
+    a = store.vertices[edge]; b = store.vertices[store.next_index[edge]]; y = row_y[pair_row]; m = margin[row_bed[pair_row]]
+    near = (np.minimum(a[:, 1], b[:, 1]) - m <= y) & (y <= np.maximum(a[:, 1], b[:, 1]) + m)
+    pair_row, a, b, y = pair_row[near], a[near], b[near], y[near]
+
+    # Snijpunten per rij als sleutel rij + relatieve x binnen de bbox, zodat één searchsorted alle punten afhandelt.
+    x_min = bboxes[row_bed, 0]; scale = 1.0 / np.maximum((bboxes[row_bed, 2] - x_min) * (1 + 1e-9), 1e-12)
+    crosses = (a[:, 1] > y) != (b[:, 1] > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = (b[:, 0] - a[:, 0]) * (y - a[:, 1]) / (b[:, 1] - a[:, 1]) + a[:, 0]
+    cross_row = pair_row[crosses]
+    keys = np.sort(cross_row + np.clip((x_cross[crosses] - x_min[cross_row]) * scale[cross_row], 0.0, 1 - 1e-12))
+
+    point_row, column = _expand(row_nx); bed = row_bed[point_row]
+    points = np.column_stack([row_x0[point_row] + column * spacing[bed], row_y[point_row]])
+    point_key = point_row + np.clip((points[:, 0] - x_min[point_row]) * scale[point_row], 0.0, 1 - 1e-12)
+    inside = (np.searchsorted(keys, point_key) - np.searchsorted(keys, point_row)) % 2 == 1
+    points, point_row, bed = points[inside], point_row[inside], bed[inside]
+
+    if np.any(margin > 0) and len(points):
+        row_pairs = np.bincount(pair_row, minlength=len(row_bed)); row_first = np.cumsum(row_pairs) - row_pairs
+        pc = row_pairs[point_row]; has_edges = pc > 0
+        owner, local = _expand(pc[has_edges]); pair = row_first[point_row[has_edges]][owner] + local
+        p = points[has_edges][owner]; ea, d = a[pair], b[pair] - a[pair]; length2 = np.einsum('ij,ij->i', d, d)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.clip(np.where(length2 > 0, np.einsum('ij,ij->i', p - ea, d) / length2, 0.0), 0.0, 1.0)
+        offset = p - ea - t[:, None] * d; dist2 = np.full(len(points), np.inf)
+        dist2[has_edges] = np.minimum.reduceat(np.einsum('ij,ij->i', offset, offset), np.cumsum(pc[has_edges]) - pc[has_edges])
+        keep = dist2 >= margin[bed] ** 2; points, bed = points[keep], bed[keep]
+    return points, bed
+
+def _place(store, beds, densities, edge_margin):
+    # Per blok bedden zodat het aantal (rij, rand)-paren en gridpunten begrensd blijft.
+    spacing = hex_spacing(densities); b = store.bboxes[beds]
+    rows = (b[:, 3] - b[:, 1]) / (spacing * np.sqrt(3.0) / 2) + 1
+    cost = np.cumsum(rows * (store.offsets[beds + 1] - store.offsets[beds]) + rows * ((b[:, 2] - b[:, 0]) / spacing + 1))
+    blocks = np.searchsorted(cost, np.arange(MAX_PAIRS, cost[-1] + MAX_PAIRS, MAX_PAIRS)); start = 0; points, owner = [], []
+    for stop in np.unique(np.append(np.maximum(blocks, 1), len(beds))):
+        if stop <= start: continue
+        block_points, block_owner = _place_block(store, beds[start:stop], densities[start:stop], edge_margin)
+        points.append(block_points); owner.append(block_owner + start); start = stop
+    points, local_owner = np.concatenate(points), np.concatenate(owner)
+    # Bedden die kleiner zijn dan één plantafstand krijgen één plant op het zwaartepunt.
+    empty = np.flatnonzero((np.bincount(local_owner, minlength=len(beds)) == 0) & (store.areas[beds] > 0))
+    if len(empty):
+        points = np.concatenate([points, store.centroids[beds[empty]]]); local_owner = np.concatenate([local_owner, empty])
+        order = np.argsort(local_owner, kind='stable'); points, local_owner = points[order], local_owner[order]
+    return points, beds[local_owner]
+
+def _place_chunk(args):
+    vertices, offsets, areas, beds, densities, edge_margin = args
+    from core.geometry import PolygonStore
+    return _place(PolygonStore(vertices, offsets, areas), beds, densities, edge_margin)
+
+@timed('placement.place')
+def place_plants(store, beds, densities, edge_margin=DEFAULT_EDGE_MARGIN, workers=None):
+    """Plantposities voor de opgegeven bedden (index, dichtheid in planten per m²) op een hexgrid.
+
+    Geeft (punten (P, 2), bedindex per punt), gesorteerd op bed. Met workers > 1 worden de bedden over een
+    procespool verdeeld; dat loont pas bij tienduizenden bedden."""
+    beds = np.asarray(beds, dtype=np.int64); densities = np.broadcast_to(np.asarray(densities, dtype=np.float64), beds.shape)
+    valid = densities > 0; beds, densities = beds[valid], densities[valid]
+    if not len(beds): return np.empty((0, 2)), np.empty(0, dtype=np.int64)
+    if not workers or workers < 2 or len(beds) < 2 * workers: return _place(store, beds, densities, edge_margin)
+    chunks = [(store.vertices, store.offsets, store.areas, b, d, edge_margin) for b, d in zip(np.array_split(beds, workers), np.array_split(densities, workers))]
+    with ProcessPoolExecutor(max_workers=workers) as pool: results = list(pool.map(_place_chunk, chunks))
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+def plant_counts(store, beds, densities, edge_margin=DEFAULT_EDGE_MARGIN):
+    """Vormafhankelijk aantal planten per opgegeven bed (aantal gridposities in plaats van oppervlakte × dichtheid)."""
+    beds = np.asarray(beds, dtype=np.int64); _, owner = place_plants(store, beds, densities, edge_margin)
+    counts = np.bincount(owner, minlength=len(store)) if len(store) else np.zeros(0, dtype=np.int64)
+    return counts[beds]
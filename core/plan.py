@@ -0,0 +1,120 @@
+# core/plan.py
+import numpy as np
+from core.aggregation import SpeciesTotals, plant_count, calculate_species_totals
+from core.colors import SpeciesColors
+from core.curves import DEFAULT_TOLERANCE
+from core.dxf import load_polygons
+from core.geometry import PolygonStore
+from core.overlap import find_overlaps
+from core.placement import DEFAULT_EDGE_MARGIN, place_plants, plant_counts
+
+DEFAULT_DENSITY = 7
+
+class PlantingPlan:
+    """Headless model van een beplantingsplan: bedgeometrie, soort en dichtheid per bed, lopende totalen en soortkleuren.
+    De Qt-app, het matplotlib-prototype en de batchtools werken allemaal via dit model.
+    Met shape_aware telt een bed de posities op het plantgrid in plaats van oppervlakte × dichtheid."""
+
+    def __init__(self, store=None, shape_aware=False, edge_margin=DEFAULT_EDGE_MARGIN):
+        self.totals = SpeciesTotals(); self.colors = SpeciesColors(); self.shape_aware = shape_aware; self.edge_margin = edge_margin
+        self.set_store(store if store is not None else PolygonStore.from_polygons([]))
+
+    @classmethod
+    def from_dxf(cls, filepath, tolerance=DEFAULT_TOLERANCE, layers=None):
+        return cls(PolygonStore.from_polygons(*load_polygons(filepath, tolerance, layers)))
+
+    def set_store(self, store):
+        """Nieuwe geometrie; alle toewijzingen, totalen en kleuren vervallen."""
+        self.store = store; n = len(store)
+        self.species = [''] * n; self.densities = np.full(n, float(DEFAULT_DENSITY)); self.finished = np.zeros(n, dtype=bool)
+        self.totals.clear(); self.colors.clear(); self._overlaps = None; self._positions = {}
+
+    def __len__(self):
+        return len(self.store)
+
+    def hit_test(self, x, y):
+        return self.store.hit_test(x, y)
+
+    def area(self, index):
+        return float(self.store.areas[index])
+
+    def plant_count(self, index, plants_per_m2=None):
+        plants_per_m2 = self.densities[index] if plants_per_m2 is None else float(plants_per_m2)
+        return int(self._counts([index], [plants_per_m2])[0])
+
+    def _counts(self, indices, densities):
+        if self.shape_aware: return plant_counts(self.store, indices, densities, self.edge_margin)
+        return [plant_count(self.store.areas[index], density) for index, density in zip(indices, densities)]
+
+    def _assign(self, index, species_name, plants_per_m2, count):
+        self.species[index] = species_name; self.densities[index] = plants_per_m2; self.finished[index] = True
+        self.colors.assign(species_name); self._positions.pop(index, None)
+        return self.totals.set_bed(index, species_name, int(count))
+
+    def assign(self, index, species_name, plants_per_m2):
+        """Wijst soort en dichtheid toe aan één bed; geeft de soortlabels terug waarvan het totaal veranderde."""
+        plants_per_m2 = float(plants_per_m2)
+        return self._assign(index, species_name.strip().lower(), plants_per_m2, self.plant_count(index, plants_per_m2))
+
+    def assign_many(self, assignments):
+        """Bulkversie van assign voor een iterable van (index, soortnaam, planten per m²); aantallen in één keer berekend."""
+        assignments = [(index, species_name.strip().lower(), float(plants_per_m2)) for index, species_name, plants_per_m2 in assignments]
+        counts = self._counts([a[0] for a in assignments], [a[2] for a in assignments]); changed = set()
+        for (index, species_name, plants_per_m2), count in zip(assignments, counts): changed |= self._assign(index, species_name, plants_per_m2, count)
+        return changed
+
+    def set_shape_aware(self, shape_aware):
+        """Schakelt tussen oppervlakte × dichtheid en het aantal gridposities, en herberekent alle totalen."""
+        self.shape_aware = shape_aware; assignments = self.assignments(); self.totals.clear()
+        self.assign_many(assignments)
+
+    def plant_positions(self):
+        """Plantposities van alle toegewezen bedden als (punten (P, 2), bedindex per punt); per bed gecachet."""
+        indices = np.flatnonzero(self.finished); missing = [index for index in indices if index not in self._positions]
+        if missing:
+            # Alle ontbrekende bedden in één aanroep; de punten komen gesorteerd per bed terug.
+            points, owner = place_plants(self.store, missing, self.densities[missing], self.edge_margin)
+            ends = np.searchsorted(owner, missing, side='right')
+            for index, part in zip(missing, np.split(points, ends[:-1])): self._positions[index] = part
+        if not len(indices): return np.empty((0, 2)), np.empty(0, dtype=np.int64)
+        parts = [self._positions[index] for index in indices]
+        return np.concatenate(parts), np.repeat(indices, [len(part) for part in parts])
+
+    def set_density(self, index, plants_per_m2):
+        """Past alleen de dichtheid aan; bij een toegewezen bed wordt het totaal meegenomen."""
+        if self.finished[index]: return self.assign(index, self.species[index], plants_per_m2)
+        self.densities[index] = float(plants_per_m2); return set()
+
+    def clear_bed(self, index):
+        self.species[index] = ''; self.densities[index] = DEFAULT_DENSITY; self.finished[index] = False; self._positions.pop(index, None)
+        return self.totals.remove_bed(index)
+
+    def bed_counts(self):
+        """Aantal planten per bed zoals in de lopende totalen (0 voor bedden zonder toewijzing)."""
+        counts = np.zeros(len(self), dtype=np.int64); bed_counts = self.totals.bed_counts()
+        if bed_counts: counts[list(bed_counts)] = list(bed_counts.values())
+        return counts
+
+    def assignments(self):
+        """Toewijzingen als [(index, soortnaam, planten per m²)], in het formaat van core.project."""
+        return [(int(index), self.species[index], float(self.densities[index])) for index in np.flatnonzero(self.finished)]
+
+    def species_totals(self, net=False):
+        """Plantentotalen per soort; met net=True telt overlap tussen bedden van dezelfde soort maar één keer."""
+        if not net: return dict(self.totals.totals)
+        return dict(calculate_species_totals(self.net_areas(), self.assignments()))
+
+    @property
+    def overlaps(self):
+        """OverlapReport van de huidige geometrie; wordt bij het eerste gebruik berekend."""
+        if self._overlaps is None: self._overlaps = find_overlaps(self.store)
+        return self._overlaps
+
+    def net_areas(self):
+        return self.overlaps.net_areas(self.store.areas, self.species, self.finished)
+
+    def bed_color(self, index):
+        return self.colors.rgba(self.species[index]) if self.finished[index] else (0, 0, 0, 0)
+
+    def facecolors(self):
+        return self.colors.facecolors(self.species, self.finished)
@@ -0,0 +1,112 @@
+# core/pricing.py
+# Prijsberekening voor bestellijst en offertescenario's. Bedragen zijn Decimal op hele centen; binnen de
+# scenario-engine wordt gerekend in gehele centen (int64), wat exact dezelfde bedragen geeft als de bestellijst.
+from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
+from core.aggregation import species_label
+from core.profiling import timed
+
+CENT = Decimal('0.01'); BTW_RATE = Decimal('0.09')
+
+def money(value):
+    """Bedrag als Decimal op hele centen; prijzen uit de database (REAL) gaan via str om float-ruis te vermijden."""
+    return Decimal(str(value or 0)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+def vat(amount):
+    return (amount * BTW_RATE).quantize(CENT, rounding=ROUND_HALF_UP)
+
+def cents(value):
+    return int(money(value) * 100)
+
+def _normalize(name):
+    return name.strip().lower()
+
+class Scenario:
+    """Eén offertevariant ten opzichte van het plan; alle sleutels zijn soortnamen.
+
+    replace: {soort: vervangende soort}; density: {soort: planten per m²} voor alle bedden van die soort;
+    quality: {soort: (kwaliteit, prijs per stuk)}, bijvoorbeeld een grotere potmaat in plaats van P9.
+    density en quality gelden voor de soort ná vervanging, dus zoals die op de bestellijst komt."""
+
+    def __init__(self, name, replace=None, density=None, quality=None):
+        self.name = name
+        self.replace = {_normalize(k): _normalize(v) for k, v in (replace or {}).items()}
+        self.density = {_normalize(k): float(v) for k, v in (density or {}).items()}
+        self.quality = {_normalize(k): (q, p) for k, (q, p) in (quality or {}).items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data.get('replace'), data.get('density'), data.get('quality'))
+
+class ScenarioEngine:
+    """Houdt oppervlakte, soort-id en dichtheid van alle toegewezen bedden als arrays vast en rekent een hele reeks
+    scenario's in één gevectoriseerde stap door: (scenario, bed) → aantal → (scenario, soort) → bedrag.
+    Aantallen volgen oppervlakte × dichtheid per bed, net als de bestellijst."""
+
+    def __init__(self, areas, species, densities, catalogue):
+        self.catalogue = catalogue; self.names = []; self._ids = {}
+        self.areas = np.asarray(areas, dtype=np.float64); self.densities = np.asarray(densities, dtype=np.float64)
+        self.species_ids = np.array([self._id(name) for name in species], dtype=np.int64)
+
+    @classmethod
+    def from_plan(cls, plan, catalogue, net=False):
+        """Engine voor de toegewezen bedden van een PlantingPlan; met net=True op de netto oppervlaktes."""
+        indices = np.flatnonzero(plan.finished); areas = plan.net_areas() if net else plan.store.areas
+        return cls(areas[indices], [plan.species[index] for index in indices], plan.densities[indices], catalogue)
+
+    def _id(self, name):
+        name = _normalize(name)
+        if name not in self._ids: self._ids[name] = len(self.names); self.names.append(name)
+        return self._ids[name]
+
+    @timed('pricing.scenarios')
+    def compare(self, scenarios, baseline='Huidig plan'):
+        """Rekent alle scenario's door; met baseline staat het ongewijzigde plan als eerste kolom vooraan."""
+        scenarios = ([Scenario(baseline)] if baseline else []) + list(scenarios)
+        for scenario in scenarios:  # ook soorten die alleen in een scenario voorkomen krijgen een id
+            for name in [*scenario.replace.values(), *scenario.density, *scenario.quality]: self._id(name)
+        s, k = len(scenarios), len(self.names)
+        mapping = np.tile(np.arange(k), (s, 1)); density = np.full((s, k), np.nan)
+        details = [self.catalogue.get(name) for name in self.names]
+        price = np.tile(np.array([cents(d['price_per_unit']) if d else 0 for d in details], dtype=np.int64), (s, 1))
+        qualities = [[d['quality'] if d else 'N/A' for d in details] for _ in scenarios]
+        for row, scenario in enumerate(scenarios):
+            for old, new in scenario.replace.items():  # een soort die niet in het plan staat vervangen verandert niets
+                if old in self._ids: mapping[row, self._ids[old]] = self._ids[new]
+            for name, value in scenario.density.items(): density[row, self._ids[name]] = value
+            for name, (quality, unit_price) in scenario.quality.items():
+                qualities[row][self._ids[name]] = quality; price[row, self._ids[name]] = cents(unit_price)
+
+        rows = np.arange(s)[:, None]; species = mapping[:, self.species_ids]  # (scenario, bed)
+        override = density[rows, species]; bed_density = np.where(np.isnan(override), self.densities[None, :], override)
+        counts = np.floor(self.areas[None, :] * bed_density).astype(np.int64)
+        totals = np.bincount((rows * k + species).ravel(), weights=counts.ravel(), minlength=s * k).reshape(s, k).astype(np.int64)
+        return ScenarioComparison([scenario.name for scenario in scenarios], self.names, totals, price, qualities)
+
+class ScenarioComparison:
+    """Aantallen en bedragen per (scenario, soort) naast elkaar; bedragen in centen, totalen als Decimal."""
+
+    def __init__(self, names, species, counts, price, qualities):
+        self.names = names; self.species = species; self.counts = counts; self.price = price; self.qualities = qualities
+        self.line_cents = counts * price
+
+    def __len__(self):
+        return len(self.names)
+
+    def totals(self):
+        """[(totaal ex. BTW, BTW, totaal incl. BTW)] per scenario."""
+        result = []
+        for total in self.line_cents.sum(axis=1).tolist():
+            ex_btw = Decimal(total).scaleb(-2); result.append((ex_btw, vat(ex_btw), ex_btw + vat(ex_btw)))
+        return result
+
+    def rows(self):
+        """[(soortlabel, [(aantal, kwaliteit, bedrag) per scenario])] voor alle soorten die in minstens één scenario voorkomen."""
+        used = np.flatnonzero(self.counts.any(axis=0)); labels = [species_label(self.species[k]) for k in used]
+        return [(label, [(int(self.counts[s, k]), self.qualities[s][k], Decimal(int(self.line_cents[s, k])).scaleb(-2)) for s in range(len(self))])
+                for label, k in sorted(zip(labels, used.tolist()))]
+
+    def summary(self):
+        totals = self.totals(); base = totals[0][0]
+        return [f"{name}: € {ex:.2f} ex. BTW, € {inc:.2f} incl. BTW ({ex - base:+.2f} t.o.v. {self.names[0]})"
+                for name, (ex, _, inc) in zip(self.names, totals)]
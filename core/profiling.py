@@ -0,0 +1,61 @@
+# core/profiling.py
+# Lichte timers voor de dure paden (laden, hit-testing, bestellijst, database, PDF's).
+# DEAS_PROFILE=<naam>      legt de eerstvolgende uitvoering van die operatie vast met cProfile (<naam>.prof)
+# DEAS_STATS_FILE=<pad>    schrijft bij afsluiten alle tellers weg als .json of .csv
+import atexit
+import cProfile
+import csv
+import json
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+
+_lock = threading.Lock()
+_stats = {}
+_profile_target = os.environ.get('DEAS_PROFILE')
+
+class timed(ContextDecorator):
+    """Contextmanager en decorator: telt aanroepen en meet de tijd onder de opgegeven naam."""
+
+    def __init__(self, name):
+        self.name = name; self._profiler = None
+
+    def _recreate_cm(self):
+        # Nieuwe instantie per aanroep, zodat gelijktijdige aanroepen (loader-thread) elkaar niet overschrijven.
+        return timed(self.name)
+
+    def __enter__(self):
+        global _profile_target
+        if _profile_target == self.name:
+            _profile_target = None; self._profiler = cProfile.Profile(); self._profiler.enable()
+        self._start = time.perf_counter(); return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        if self._profiler:
+            self._profiler.disable(); self._profiler.dump_stats(f"{self.name}.prof")
+            print(f"Profiel van '{self.name}' opgeslagen in {self.name}.prof")
+        with _lock:
+            entry = _stats.setdefault(self.name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1; entry['total'] += elapsed; entry['max'] = max(entry['max'], elapsed)
+        return False
+
+def get_stats():
+    """Lijst met per operatie: naam, aantal, totaal, gemiddelde en maximum (seconden), duurste eerst."""
+    with _lock:
+        rows = [{'name': name, **entry, 'mean': entry['total'] / entry['count']} for name, entry in _stats.items()]
+    return sorted(rows, key=lambda row: row['total'], reverse=True)
+
+def reset_stats():
+    with _lock: _stats.clear()
+
+def dump_stats(path):
+    rows = get_stats()
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            writer = csv.DictWriter(f, fieldnames=['name', 'count', 'total', 'mean', 'max']); writer.writeheader(); writer.writerows(rows)
+        else: json.dump(rows, f, indent=2)
+
+if os.environ.get('DEAS_STATS_FILE'):
+    atexit.register(lambda: dump_stats(os.environ['DEAS_STATS_FILE']))
@@ -0,0 +1,74 @@
+# core/project.py
+# Projectbestand (.deas): bedgeometrie als ruwe arrays die direct met np.memmap te openen zijn,
+# gevolgd door een JSON-header met de bron-DXF (pad, grootte, mtime, sha1) en de toewijzingen per bed.
+#
+#   0   magic b'DEASPRJ1'
+#   8   uint64: byte-offset van de JSON-header
+#   64  float64[n_vertices, 2]  vertices
+#       int64[n_polygons + 1]   offsets
+#       float64[n_polygons]     oppervlaktes (exact uit bogen; ontbreekt in oudere bestanden)
+#       JSON-header (utf-8)
+import hashlib
+import json
+import os
+import struct
+import numpy as np
+
+from core.geometry import PolygonStore
+from core.profiling import timed
+
+MAGIC = b'DEASPRJ1'
+DATA_OFFSET = 64
+
+def dxf_fingerprint(dxf_path):
+    stat = os.stat(dxf_path); h = hashlib.sha1()
+    with open(dxf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''): h.update(block)
+    return {'dxf_path': os.path.abspath(dxf_path), 'dxf_size': stat.st_size, 'dxf_mtime_ns': stat.st_mtime_ns, 'dxf_sha1': h.hexdigest()}
+
+@timed('project.save')
+def save_project(path, store, assignments, dxf_path=None, fingerprint=None):
+    """Schrijft de store en de toewijzingen [(index, soortnaam, planten per m²), ...] weg."""
+    vertices = np.ascontiguousarray(store.vertices, dtype='<f8'); offsets = np.ascontiguousarray(store.offsets, dtype='<i8')
+    areas = np.ascontiguousarray(store.areas, dtype='<f8')
+    header = {'version': 1, 'n_vertices': len(vertices), 'n_polygons': len(store),
+              'vertices_offset': DATA_OFFSET, 'offsets_offset': DATA_OFFSET + vertices.nbytes,
+              'areas_offset': DATA_OFFSET + vertices.nbytes + offsets.nbytes,
+              'assignments': [[int(index), species, float(density)] for index, species, density in assignments]}
+    if fingerprint: header.update(fingerprint)
+    elif dxf_path and os.path.exists(dxf_path): header.update(dxf_fingerprint(dxf_path))
+    header_offset = header['areas_offset'] + areas.nbytes
+    with open(path + '.tmp', 'wb') as f:
+        f.write(MAGIC + struct.pack('<Q', header_offset)); f.write(b'\0' * (DATA_OFFSET - f.tell()))
+        f.write(vertices.tobytes()); f.write(offsets.tobytes()); f.write(areas.tobytes()); f.write(json.dumps(header).encode('utf-8'))
+    os.replace(path + '.tmp', path)
+
+@timed('project.load')
+def load_project(path):
+    """Geeft (store, toewijzingen, header); de geometrie wordt gememory-mapt in plaats van ingelezen."""
+    with open(path, 'rb') as f:
+        magic, header_offset = f.read(8), struct.unpack('<Q', f.read(8))[0]
+        if magic != MAGIC: raise ValueError(f"{path} is geen DEAS-projectbestand")
+        f.seek(header_offset); header = json.loads(f.read().decode('utf-8'))
+    n_vertices, n_polygons = header['n_vertices'], header['n_polygons']
+    vertices = np.memmap(path, dtype='<f8', mode='r', offset=header['vertices_offset'], shape=(n_vertices, 2)) if n_vertices else np.empty((0, 2))
+    offsets = np.memmap(path, dtype='<i8', mode='r', offset=header['offsets_offset'], shape=(n_polygons + 1,))
+    areas = np.memmap(path, dtype='<f8', mode='r', offset=header['areas_offset'], shape=(n_polygons,)) if n_polygons and 'areas_offset' in header else None
+    assignments = [(index, species, density) for index, species, density in header['assignments']]
+    return PolygonStore(vertices, offsets, areas), assignments, header
+
+def dxf_changed(header):
+    """True als de bron-DXF sinds het opslaan is gewijzigd; alleen bij een andere grootte/mtime wordt er gehasht."""
+    dxf_path = header.get('dxf_path')
+    if not dxf_path or not os.path.exists(dxf_path): return False
+    stat = os.stat(dxf_path)
+    if stat.st_size == header['dxf_size'] and stat.st_mtime_ns == header['dxf_mtime_ns']: return False
+    return dxf_fingerprint(dxf_path)['dxf_sha1'] != header['dxf_sha1']
+
+def transfer_assignments(old_store, assignments, new_store):
+    """Zet toewijzingen over naar een opnieuw geïmporteerde DXF: elk bed gaat naar het nieuwe bed onder zijn oude zwaartepunt."""
+    transferred = {}
+    for index, species, density in assignments:
+        new_index = new_store.hit_test(*old_store.centroids[index])
+        if new_index >= 0 and new_index not in transferred: transferred[new_index] = (new_index, species, density)
+    return list(transferred.values())
@@ -0,0 +1,71 @@
+# core/search.py
+import re
+import unicodedata
+from bisect import bisect_left
+import numpy as np
+from core.profiling import timed
+
+QUOTES = '"\'“”‘’„«»`'
+
+def normalize_search_text(text):
+    """Kleine letters zonder accenten, aanhalingstekens en hybride-kruisjes; 'subsp.'/'ssp.' worden 'ssp'."""
+    text = unicodedata.normalize('NFKD', text.replace('×', ' x '))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(f"[{QUOTES}]", ' ', text)
+    text = re.sub(r'\bsubsp\b\.?|\bssp\b\.?', 'ssp ', text)
+    tokens = [t for t in re.split(r'[^0-9a-z]+', text) if t and t != 'x']
+    return ' '.join(tokens)
+
+def trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SpeciesSearchIndex:
+    """Trigram-index over plantnamen voor gerangschikte, typfouttolerante zoekresultaten."""
+
+    @timed('search.build')
+    def __init__(self, names):
+        self.names = list(names); self.normalized = [normalize_search_text(name) for name in self.names]
+        postings = {}
+        for i, text in enumerate(self.normalized):
+            for gram in trigrams(text): postings.setdefault(gram, []).append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self.gram_counts = np.array([len(trigrams(text)) for text in self.normalized], dtype=np.float64)
+        # Gesorteerde woorden voor zoektermen die te kort zijn voor trigrammen.
+        self.words = sorted((word, i) for i, text in enumerate(self.normalized) for word in text.split())
+
+    def __len__(self):
+        return len(self.names)
+
+    @timed('search.query')
+    def search(self, query, limit=20):
+        query = normalize_search_text(query)
+        if not query or not self.names: return []
+        if len(query) < 3: return self._prefix_search(query, limit)
+        query_grams = [gram for gram in trigrams(query) if gram in self.postings]
+        if not query_grams: return []
+        hits = np.bincount(np.concatenate([self.postings[gram] for gram in query_grams]), minlength=len(self.names))
+        # Jaccard-overeenkomst tussen de trigramsets; naam die langer is dan de zoekterm telt minder zwaar mee.
+        n_query = len(trigrams(query))
+        scores = hits / (n_query + 0.25 * self.gram_counts - 0.25 * hits)
+        # Bonus voor namen die met de zoekterm beginnen (+1) of hem bevatten (+0,5) vóór het afkappen: lange namen
+        # hebben een lage Jaccard-score en zouden anders wegvallen. Alleen namen met alle trigrammen uit de zoekterm
+        # zelf (zonder de spaties eromheen) kunnen hem bevatten; alleen die worden als tekst vergeleken.
+        inner = {query[i:i + 3] for i in range(len(query) - 2)}
+        if all(gram in self.postings for gram in inner):
+            contains = np.bincount(np.concatenate([self.postings[gram] for gram in inner]), minlength=len(self.names)) == len(inner)
+            for i in np.flatnonzero(contains).tolist():
+                text = self.normalized[i]; scores[i] += 1.0 if text.startswith(query) else 0.5 if query in text else 0.0
+        candidates = np.flatnonzero(hits)
+        if len(candidates) > limit * 5: candidates = candidates[np.argpartition(-scores[candidates], limit * 5)[:limit * 5]]
+        ranked = sorted((-scores[i], len(self.normalized[i]), self.names[i]) for i in candidates.tolist())
+        return [name for _, _, name in ranked[:limit]]
+
+    def _prefix_search(self, query, limit):
+        start = bisect_left(self.words, (query, -1)); found = {}
+        for k in range(start, len(self.words)):
+            word, i = self.words[k]
+            if not word.startswith(query) or len(found) >= limit: break
+            found[i] = None
+        ranked = sorted(found, key=lambda i: (not self.normalized[i].startswith(query), self.names[i]))
+        return [self.names[i] for i in ranked]
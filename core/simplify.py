@@ -0,0 +1,46 @@
+# core/simplify.py
+import numpy as np
+from core.profiling import timed
+
+def _ring_neighbours(offsets, n_vertices):
+    counts = np.diff(offsets); starts = offsets[:-1]; ends = offsets[1:] - 1
+    prev_index = np.arange(-1, n_vertices - 1, dtype=np.int64); prev_index[starts] = ends
+    next_index = np.arange(1, n_vertices + 1, dtype=np.int64); next_index[ends] = starts
+    return counts, prev_index, next_index
+
+def simplify_polygons(vertices, offsets, tolerance, max_iterations=64):
+    """Visvalingam-achtige vereenvoudiging van alle ringen tegelijk.
+
+    Per ronde krijgt elke vertex de oppervlakte van de driehoek met zijn huidige buren; vertices onder
+    tolerance² die een lokaal minimum zijn worden in één keer verwijderd. Elke ring houdt minstens 3 punten."""
+    vertices = np.asarray(vertices, dtype=np.float64); offsets = np.asarray(offsets, dtype=np.int64)
+    threshold = tolerance * tolerance
+    for _ in range(max_iterations):
+        counts, prev_index, next_index = _ring_neighbours(offsets, len(vertices))
+        if not len(vertices): break
+        a = vertices[prev_index] - vertices; b = vertices[next_index] - vertices
+        area = 0.5 * np.abs(a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0])
+        remove = (area < threshold) & (area < area[prev_index]) & (area <= area[next_index])
+        removed_per_ring = np.add.reduceat(remove.astype(np.int64), offsets[:-1]) if len(counts) else np.zeros(0, dtype=np.int64)
+        # Ringen die onder de 3 punten zouden zakken blijven in deze ronde ongemoeid.
+        blocked = np.repeat(counts - removed_per_ring < 3, counts)
+        remove &= ~blocked
+        if not remove.any(): break
+        keep = ~remove
+        new_counts = np.add.reduceat(keep.astype(np.int64), offsets[:-1])
+        vertices = vertices[keep]; offsets = np.zeros(len(offsets), dtype=np.int64); np.cumsum(new_counts, out=offsets[1:])
+    return vertices, offsets
+
+@timed('geometry.lod_pyramid')
+def build_lod_pyramid(store, fractions=(1 / 4000, 1 / 1000, 1 / 250)):
+    """Niveau 0 is de originele geometrie; de volgende niveaus zijn vereenvoudigd met een tolerantie als
+    fractie van de planafmeting. Geeft een lijst (tolerantie, vertices, offsets), oplopend in tolerantie."""
+    levels = [(0.0, store.vertices, store.offsets)]
+    if not len(store): return levels
+    extent = max(store.bboxes[:, 2].max() - store.bboxes[:, 0].min(), store.bboxes[:, 3].max() - store.bboxes[:, 1].min())
+    vertices, offsets = store.vertices, store.offsets
+    for fraction in fractions:
+        # Elk niveau bouwt voort op het vorige, dus de kosten nemen per niveau af.
+        vertices, offsets = simplify_polygons(vertices, offsets, extent * fraction)
+        levels.append((extent * fraction, vertices, offsets))
+    return levels
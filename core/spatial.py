@@ -0,0 +1,57 @@
+# core/spatial.py
+import numpy as np
+
+class GridIndex:
+    """Uniform grid over bounding boxes (xmin, ymin, xmax, ymax); elk item wordt in alle cellen
+    geregistreerd die zijn bbox raakt, zodat een puntquery slechts één cel hoeft te bekijken."""
+
+    MAX_CELLS_PER_AXIS = 2048
+
+    def __init__(self, bboxes):
+        self.bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4); n = len(self.bboxes)
+        if n == 0:
+            self.origin = np.zeros(2); self.cell_size = 1.0; self.shape = (1, 1)
+            self.items = np.empty(0, dtype=np.int64); self.cell_starts = np.zeros(2, dtype=np.int64); return
+        x0, y0 = self.bboxes[:, 0].min(), self.bboxes[:, 1].min()
+        x1, y1 = self.bboxes[:, 2].max(), self.bboxes[:, 3].max()
+        width, height = max(x1 - x0, 1e-9), max(y1 - y0, 1e-9)
+        # Ongeveer één cel per item, maar niet kleiner dan een typisch bed (anders staat elk bed in veel cellen).
+        typical = np.median(np.maximum(self.bboxes[:, 2] - self.bboxes[:, 0], self.bboxes[:, 3] - self.bboxes[:, 1]))
+        cell = max(np.sqrt(width * height / n), typical, max(width, height) / self.MAX_CELLS_PER_AXIS, 1e-9)
+        nx, ny = int(width // cell) + 1, int(height // cell) + 1
+        self.origin = np.array([x0, y0]); self.cell_size = cell; self.shape = (nx, ny)
+
+        ix0, iy0 = self._cell_coords(self.bboxes[:, 0], self.bboxes[:, 1])
+        ix1, iy1 = self._cell_coords(self.bboxes[:, 2], self.bboxes[:, 3])
+        span_x = ix1 - ix0 + 1; counts = span_x * (iy1 - iy0 + 1)
+        item = np.repeat(np.arange(n, dtype=np.int64), counts)
+        local = np.arange(counts.sum(), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        cells = (iy0[item] + local // span_x[item]) * nx + ix0[item] + local % span_x[item]
+        order = np.argsort(cells, kind='stable')
+        self.items = item[order]
+        self.cell_starts = np.zeros(nx * ny + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=nx * ny), out=self.cell_starts[1:])
+
+    def _cell_coords(self, x, y):
+        nx, ny = self.shape
+        ix = np.clip(((np.asarray(x) - self.origin[0]) // self.cell_size).astype(np.int64), 0, nx - 1)
+        iy = np.clip(((np.asarray(y) - self.origin[1]) // self.cell_size).astype(np.int64), 0, ny - 1)
+        return ix, iy
+
+    def query_bbox(self, bbox):
+        """Indices van alle items waarvan de bbox de opgegeven bbox (xmin, ymin, xmax, ymax) raakt, oplopend."""
+        if not len(self.items): return self.items
+        ix0, iy0 = self._cell_coords(bbox[0], bbox[1]); ix1, iy1 = self._cell_coords(bbox[2], bbox[3])
+        cells = (np.arange(iy0, iy1 + 1)[:, None] * self.shape[0] + np.arange(ix0, ix1 + 1)[None, :]).ravel()
+        starts = self.cell_starts[cells]; counts = self.cell_starts[cells + 1] - starts
+        candidates = np.unique(self.items[np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())])
+        b = self.bboxes[candidates]
+        return candidates[(b[:, 0] <= bbox[2]) & (bbox[0] <= b[:, 2]) & (b[:, 1] <= bbox[3]) & (bbox[1] <= b[:, 3])]
+
+    def query_point(self, x, y):
+        """Indices van alle items waarvan de bbox het punt bevat."""
+        if not len(self.items): return self.items
+        ix, iy = self._cell_coords(x, y); cell = int(iy) * self.shape[0] + int(ix)
+        candidates = self.items[self.cell_starts[cell]:self.cell_starts[cell + 1]]
+        b = self.bboxes[candidates]
+        return candidates[(b[:, 0] <= x) & (x <= b[:, 2]) & (b[:, 1] <= y) & (y <= b[:, 3])]
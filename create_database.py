@@ -1,17 +1,113 @@
 # create_database.py
+# Gebruik: python create_database.py [--db planten.db] [--reset]
+import argparse
 import sqlite3
 
-def create_database():
-    """Maakt een nieuwe SQLite database aan en vult deze met voorbeeldplanten."""
+SEARCH_TABLE_SQL = [
+    "DROP TABLE IF EXISTS plants_fts",
+    "CREATE VIRTUAL TABLE plants_fts USING fts5(name, content='plants', content_rowid='id', tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS plants_fts_insert AFTER INSERT ON plants BEGIN
+        INSERT INTO plants_fts (rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS plants_fts_delete AFTER DELETE ON plants BEGIN
+        INSERT INTO plants_fts (plants_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS plants_fts_update AFTER UPDATE OF name ON plants BEGIN
+        INSERT INTO plants_fts (plants_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO plants_fts (rowid, name) VALUES (new.id, new.name);
+    END""",
+    "INSERT INTO plants_fts (plants_fts) VALUES ('rebuild')",
+]
+
+def create_search_table(conn):
+    """FTS5-trigramtabel op plantnaam, via triggers synchroon gehouden met 'plants'. Optioneel: zonder FTS5 wordt alleen
+    de index in het geheugen gebruikt. Losse statements in plaats van executescript, dat tussendoor zou committen."""
+    try:
+        for statement in SEARCH_TABLE_SQL: conn.execute(statement)
+    except sqlite3.OperationalError as e:
+        print(f"FTS5-zoektabel niet aangemaakt ({e}); zoeken gebeurt alleen in het geheugen.")
+
+# Catalogusversie: elke wijziging aan 'plants', door welke verbinding of welk programma dan ook, hoogt het
+# versienummer op. Clients houden een snapshot van de catalogus vast zolang het nummer gelijk blijft.
+CATALOGUE_VERSION_SQL = [
+    "CREATE TABLE IF NOT EXISTS catalogue_meta (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO catalogue_meta (id, version) VALUES (1, 1)",
+    *(f"""CREATE TRIGGER IF NOT EXISTS plants_version_{event.lower()} AFTER {event} ON plants BEGIN
+        UPDATE catalogue_meta SET version = version + 1 WHERE id = 1;
+    END""" for event in ('INSERT', 'UPDATE', 'DELETE')),
+]
+
+def create_version_table(conn):
+    for statement in CATALOGUE_VERSION_SQL: conn.execute(statement)
+
+# Kolommen die bij het samenvoegen van dubbele planten van de nieuwste rij worden overgenomen (zoals een upsert zou doen).
+CATALOGUE_COLUMNS = ['quality', 'price_per_unit', 'plants_per_m2', 'flower_start_month', 'flower_end_month',
+                     'structure_start_month', 'structure_end_month']
+
+def create_unique_name_index(conn):
+    """Maakt plantnamen hoofdletterongevoelig uniek, zodat de import op dezelfde naam matcht als de rest van de app.
+    Bestaande dubbelen (zelfde naam, andere hoofdletters) worden eerst samengevoegd: de oudste rij blijft met zijn
+    schrijfwijze en afbeelding, de catalogusgegevens komen van de nieuwste rij."""
+    columns = ', '.join(CATALOGUE_COLUMNS)
+    for keep, newest in conn.execute("SELECT MIN(id), MAX(id) FROM plants GROUP BY name COLLATE NOCASE HAVING COUNT(*) > 1").fetchall():
+        conn.execute(f"UPDATE plants SET ({columns}) = (SELECT {columns} FROM plants WHERE id = ?) WHERE id = ?", (newest, keep))
+        removed = conn.execute("DELETE FROM plants WHERE id != ? AND name = (SELECT name FROM plants WHERE id = ?) COLLATE NOCASE", (keep, keep)).rowcount
+        print(f"Dubbele plant samengevoegd: {removed} rij(en) met dezelfde naam als id {keep} verwijderd.")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_plants_name_unique_nocase ON plants (name COLLATE NOCASE)")
+    conn.execute("DROP INDEX IF EXISTS idx_plants_name_nocase")
+
+# Schema-migraties in volgorde (SQL of een functie die de verbinding krijgt);
+# PRAGMA user_version onthoudt hoeveel er al zijn uitgevoerd.
+MIGRATIONS = [
+    # 1: hoofdletterongevoelige index zodat opzoeken op naam geen full table scan meer is.
+    "CREATE INDEX IF NOT EXISTS idx_plants_name_nocase ON plants (name COLLATE NOCASE)",
+    # 2-4: afmetingen en inhoudshash van de afbeelding, gevuld door update_database_images.py.
+    "ALTER TABLE plants ADD COLUMN image_width INTEGER",
+    "ALTER TABLE plants ADD COLUMN image_height INTEGER",
+    "ALTER TABLE plants ADD COLUMN image_hash TEXT",
+    # 5: optionele FTS5-zoektabel voor plantnamen.
+    create_search_table,
+    # 6: catalogusversie voor gedeeld gebruik door meerdere werkplekken.
+    create_version_table,
+    # 7: unieke hoofdletterongevoelige naamindex (vervangt die van migratie 1), conflictdoel van de import.
+    create_unique_name_index,
+]
+
+def apply_migrations(conn):
+    """Voert alle nog niet toegepaste migraties uit op een bestaande database, in één schrijftransactie: twee
+    werkplekken die tegelijk starten voeren een migratie dus nooit allebei uit."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS): return
+    conn.commit(); conn.execute("BEGIN IMMEDIATE")
     try:
-        conn = sqlite3.connect('planten.db')
-        cursor = conn.cursor()
-        print("Database 'planten.db' succesvol aangemaakt/geopend.")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, statement in enumerate(MIGRATIONS[version:], start=version + 1):
+            if callable(statement): statement(conn)
+            else: conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {number}")
+        conn.commit()
+    except BaseException:
+        conn.rollback(); raise
 
-        cursor.execute("DROP TABLE IF EXISTS plants")
+SAMPLE_PLANTS = [
+    ('Aster "Little Carlow"', 'P9', 3.50, 7, 8, 10, 1, 12, None),
+    ('Calamintha nepeta ssp. nepeta', 'P9', 3.00, 9, 6, 9, 2, 11, None),
+    ('Echinops bannaticus "Taplow Blue"', 'P9', 3.25, 7, 7, 8, 0, 0, None),
+    ('Geranium x oxonianum "Rose Clair"', 'P9', 3.50, 8, 6, 9, 0, 0, None),
+    ('Salvia nemerosa "Schneehugel"', 'P9', 3.75, 7, 6, 8, 0, 0, None)
+]
 
-        cursor.execute("""
-        CREATE TABLE plants (
+def create_database(db_file='planten.db', reset=False):
+    """Maakt de database aan (of werkt een bestaande bij) en vult een lege catalogus met voorbeeldplanten.
+
+    De tabel wordt nooit verwijderd: andere werkplekken kunnen de catalogus op dat moment gebruiken. Met reset=True
+    wordt de inhoud in één transactie vervangen door de voorbeeldplanten; lezers zien de oude of de nieuwe
+    catalogus en laden die opnieuw omdat de catalogusversie verandert."""
+    try:
+        conn = sqlite3.connect(db_file, timeout=5)
+        print(f"Database '{db_file}' succesvol aangemaakt/geopend.")
+
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS plants (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL UNIQUE,
             quality TEXT,
@@ -24,23 +120,20 @@ def create_database():
             image_path TEXT
         )
         """)
-        print("Tabel 'plants' succesvol aangemaakt.")
-
-        sample_plants = [
-            ('Aster "Little Carlow"', 'P9', 3.50, 7, 8, 10, 1, 12, None),
-            ('Calamintha nepeta ssp. nepeta', 'P9', 3.00, 9, 6, 9, 2, 11, None),
-            ('Echinops bannaticus "Taplow Blue"', 'P9', 3.25, 7, 7, 8, 0, 0, None),
-            ('Geranium x oxonianum "Rose Clair"', 'P9', 3.50, 8, 6, 9, 0, 0, None),
-            ('Salvia nemerosa "Schneehugel"', 'P9', 3.75, 7, 6, 8, 0, 0, None)
-        ]
-
-        cursor.executemany("""
-        INSERT INTO plants (name, quality, price_per_unit, plants_per_m2, flower_start_month, flower_end_month, structure_start_month, structure_end_month, image_path) 
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, sample_plants)
-        
-        print(f"{len(sample_plants)} voorbeeldplanten succesvol toegevoegd.")
-        
+        apply_migrations(conn)
+
+        conn.execute("BEGIN IMMEDIATE")
+        if reset:
+            conn.execute("DELETE FROM plants"); print("Bestaande planten verwijderd.")
+        if conn.execute("SELECT COUNT(*) FROM plants").fetchone()[0] == 0:
+            conn.executemany("""
+            INSERT INTO plants (name, quality, price_per_unit, plants_per_m2, flower_start_month, flower_end_month, structure_start_month, structure_end_month, image_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, SAMPLE_PLANTS)
+            print(f"{len(SAMPLE_PLANTS)} voorbeeldplanten succesvol toegevoegd.")
+        else:
+            print("Catalogus bevat al planten; er zijn geen voorbeeldplanten toegevoegd.")
+
         conn.commit()
         conn.close()
         print("Wijzigingen opgeslagen en verbinding gesloten.")
@@ -49,4 +142,8 @@ def create_database():
         print(f"Een databasefout is opgetreden: {e}")
 
 if __name__ == "__main__":
-    create_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Maak de plantencatalogus aan of werk het schema bij.")
+    parser.add_argument('--db', default='planten.db')
+    parser.add_argument('--reset', action='store_true', help="vervang de hele catalogus door de voorbeeldplanten")
+    args = parser.parse_args()
+    create_database(args.db, args.reset)
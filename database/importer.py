@@ -0,0 +1,94 @@
+# database/importer.py
+import csv
+import os
+import sqlite3
+
+from core.profiling import timed
+
+COLUMNS = ['name', 'quality', 'price_per_unit', 'plants_per_m2',
+           'flower_start_month', 'flower_end_month', 'structure_start_month', 'structure_end_month']
+# Kolomnamen zoals ze in prijslijsten van leveranciers voorkomen.
+ALIASES = {'naam': 'name', 'plantnaam': 'name', 'kwaliteit': 'quality', 'prijs': 'price_per_unit', 'prijs_per_stuk': 'price_per_unit',
+           'planten_per_m2': 'plants_per_m2', 'dichtheid': 'plants_per_m2', 'bloei_start': 'flower_start_month',
+           'bloei_eind': 'flower_end_month', 'structuur_start': 'structure_start_month', 'structuur_eind': 'structure_end_month'}
+
+# Conflictdoel is de hoofdletterongevoelige unieke index uit migratie 7: 'aster "little carlow"' werkt de bestaande
+# plant bij (met behoud van de schrijfwijze) in plaats van een tweede rij toe te voegen.
+UPSERT = f"""
+INSERT INTO plants ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})
+ON CONFLICT(name COLLATE NOCASE) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in COLUMNS[1:])}
+"""
+
+def _header_key(header):
+    key = str(header or '').strip().lower().replace(' ', '_').replace('²', '2')
+    return ALIASES.get(key, key)
+
+def iter_rows(path):
+    """Streamt (regelnummer, dict) uit een CSV- of XLSX-bestand zonder het hele bestand in te lezen."""
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise RuntimeError("Voor XLSX-import is het pakket 'openpyxl' nodig (pip install openpyxl).")
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [_header_key(h) for h in next(rows, [])]
+            for number, values in enumerate(rows, start=2):
+                if any(v not in (None, '') for v in values): yield number, dict(zip(headers, values))
+        finally:
+            workbook.close()
+        return
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        sample = f.read(4096); f.seek(0)
+        # Een bestand met één kolom (of een vreemd voorbeeld) laat de Sniffer falen; val dan terug op komma's.
+        try: dialect = csv.Sniffer().sniff(sample, delimiters=',;\t') if sample else csv.excel
+        except csv.Error: dialect = csv.excel
+        reader = csv.reader(f, dialect); headers = [_header_key(h) for h in next(reader, [])]
+        for number, values in enumerate(reader, start=2):
+            if any(v.strip() for v in values): yield number, dict(zip(headers, values))
+
+def _number(value, kind):
+    if value is None or (isinstance(value, str) and not value.strip()): return None
+    if isinstance(value, str): value = value.strip().replace('€', '').replace(',', '.')
+    try: number = float(value)
+    except (TypeError, ValueError): raise ValueError(f"'{value}' is geen getal")
+    if kind is not int: return number
+    if not number.is_integer(): raise ValueError(f"'{value}' is geen geheel getal")  # 7.5 planten/m² niet stil afronden
+    return int(number)
+
+def validate_row(row):
+    """Zet een ruwe rij om naar een tuple voor UPSERT; gooit ValueError met de reden bij een ongeldige rij."""
+    name = str(row.get('name') or '').strip()
+    if not name: raise ValueError("naam ontbreekt")
+    try:
+        price = _number(row.get('price_per_unit'), float); density = _number(row.get('plants_per_m2'), int)
+        months = [_number(row.get(c), int) for c in COLUMNS[4:]]
+    except ValueError as e:
+        raise ValueError(f"ongeldige prijs, dichtheid of maand: {e}")
+    if price is not None and price < 0: raise ValueError(f"negatieve prijs {price}")
+    if density is not None and density <= 0: raise ValueError(f"ongeldige dichtheid {density}")
+    for label, (start, end) in (('bloei', months[0:2]), ('structuur', months[2:4])):
+        if any(m is not None and not 0 <= m <= 12 for m in (start, end)): raise ValueError(f"{label}maand buiten 0-12")
+        if (start is None) != (end is None) or (start == 0) != (end == 0): raise ValueError(f"{label}periode onvolledig")
+    quality = str(row.get('quality') or '').strip() or None
+    return (name, quality, price, density, *months)
+
+@timed('db.import')
+def import_catalogue(conn, path, batch_size=5000, rejects_path=None):
+    """Upsert een prijslijst in batches van executemany; de tabel wordt nooit geleegd of verwijderd.
+    Geeft (aantal verwerkt, lijst met afgewezen rijen [(regel, reden), ...])."""
+    conn.execute("PRAGMA journal_mode = WAL"); conn.execute("PRAGMA synchronous = NORMAL")
+    imported = 0; rejects = []; batch = []
+    def flush():
+        with conn: conn.executemany(UPSERT, batch)
+        batch.clear()
+    for number, row in iter_rows(path):
+        try: batch.append(validate_row(row))
+        except ValueError as e: rejects.append((number, str(e))); continue
+        if len(batch) >= batch_size: imported += len(batch); flush()
+    if batch: imported += len(batch); flush()
+    if rejects_path:
+        with open(rejects_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f); writer.writerow(['regel', 'reden']); writer.writerows(rejects)
+    return imported, rejects
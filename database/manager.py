@@ -1,36 +1,162 @@
 # database/manager.py
+# DEAS_DB=<pad>            catalogus (standaard planten.db), bijvoorbeeld gedeeld op een netwerkshare
+# DEAS_DB_REPLICA=<pad>    lokale leeskopie van die catalogus, ververst zodra de catalogusversie verandert
+import os
 import sqlite3
+import threading
+import time
+from create_database import apply_migrations
+from database.pool import BUSY_TIMEOUT_MS, ConnectionPool, configure_connection
+from core.profiling import timed
+
+REPLICA_CHECK_INTERVAL = 2.0  # seconden tussen twee versiecontroles van de primaire database
+
+def normalize_name(name):
+    return name.strip().lower()
+
+def read_version(conn):
+    """Catalogusversie uit catalogue_meta (migratie 6), of None als die tabel ontbreekt."""
+    try: return conn.execute("SELECT version FROM catalogue_meta WHERE id = 1").fetchone()[0]
+    except (sqlite3.OperationalError, TypeError): return None
+
+class CatalogueSnapshot(dict):
+    """Volledige catalogus als gewone dicts (picklebaar), gesleuteld op genormaliseerde naam, met de catalogusversie
+    waarvan hij is gemaakt. Wordt gedeeld tussen threads en aanroepers: niet wijzigen."""
+
+    def __init__(self, version, rows=()):
+        super().__init__(rows); self.version = version
 
 class DatabaseManager:
-    def __init__(self, db_file):
-        self.db_file = db_file
-        self.conn = None
+    """Toegang tot de plantencatalogus voor meerdere threads via een verbindingspool in WAL-modus.
+
+    Met replica=<pad> wordt er gelezen uit een lokale kopie van db_file (backup-API) die pas opnieuw wordt gekopieerd
+    als de catalogusversie van db_file verandert; db_file houdt dan zijn eigen journal-modus, want WAL werkt niet
+    over een netwerkshare."""
+    # SQLite staat standaard maximaal 999 parameters per query toe.
+    MAX_QUERY_PARAMS = 900
+    # IN-lijsten worden aangevuld tot een van deze lengtes, zodat sqlite3 de voorbereide statements hergebruikt.
+    IN_SIZES = (8, 64, MAX_QUERY_PARAMS)
+
+    def __init__(self, db_file, use_cache=True, pool_size=4, journal_mode='wal', replica=None):
+        self.db_file = db_file; self.replica = replica
+        self.use_cache = use_cache; self.pool_size = pool_size; self.journal_mode = journal_mode
+        self.pool = None; self._primary = None; self._replica_lock = threading.Lock(); self._replica_checked = 0.0
+        self._lock = threading.Lock(); self._cache = {}; self._cache_version = None; self._snapshot = None; self._snapshot_lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, **kwargs):
+        return cls(os.environ.get('DEAS_DB', 'planten.db'), replica=os.environ.get('DEAS_DB_REPLICA') or None, **kwargs)
 
     def connect(self):
         try:
-            self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
-            print(f"Database succesvol verbonden: {self.db_file}")
+            if self.replica:
+                self._primary = configure_connection(sqlite3.connect(self.db_file, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000), None)
+                apply_migrations(self._primary)
+                self.pool = ConnectionPool(self.replica, self.pool_size, self.journal_mode); self._sync_replica(force=True)
+            else:
+                self.pool = ConnectionPool(self.db_file, self.pool_size, self.journal_mode)
+                with self.pool.connection() as conn: apply_migrations(conn)
+            print(f"Database succesvol verbonden: {self.db_file}" + (f" (replica {self.replica})" if self.replica else ""))
         except sqlite3.Error as e:
             print(f"Fout bij verbinden met database: {e}")
+            self.close(quiet=True)
 
-    def close(self):
-        if self.conn:
-            self.conn.close()
-            print("Databaseverbinding gesloten.")
+    def close(self, quiet=False):
+        if self.pool: self.pool.close(); self.pool = None
+        if self._primary: self._primary.close(); self._primary = None
+        if not quiet: print("Databaseverbinding gesloten.")
 
+    def _sync_replica(self, force=False):
+        """Kopieert db_file naar de replica als de catalogusversie is veranderd; lezers van de replica houden tijdens
+        het kopiëren hun eigen stand."""
+        with self._replica_lock:
+            now = time.monotonic()
+            if not force and now - self._replica_checked < REPLICA_CHECK_INTERVAL: return
+            self._replica_checked = now
+            try:
+                version = read_version(self._primary)
+                with self.pool.connection() as conn:
+                    if version is None or read_version(conn) != version: self._primary.backup(conn)
+            except sqlite3.Error as e:
+                print(f"Fout bij verversen van replica {self.replica}: {e}")
+
+    def catalogue_version(self):
+        """Verandert bij elke wijziging aan de catalogus, door welke verbinding of welk programma dan ook."""
+        if not self.pool: return None
+        if self.replica: self._sync_replica()
+        with self.pool.connection() as conn: return read_version(conn)
+
+    @timed('db.plant_names')
     def get_all_plant_names(self):
-        if not self.conn: return []
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT name FROM plants ORDER BY name ASC")
-        return [row['name'] for row in cursor.fetchall()]
+        if not self.pool: return []
+        with self.pool.connection() as conn:
+            return [row['name'] for row in conn.execute("SELECT name FROM plants ORDER BY name ASC")]
+
+    @timed('db.catalogue_snapshot')
+    def get_catalogue_snapshot(self):
+        """Volledige catalogus als CatalogueSnapshot. Zolang de catalogusversie gelijk blijft, krijgt elke aanroep
+        hetzelfde snapshot terug; anders wordt de catalogus in één leestransactie opnieuw ingelezen."""
+        if not self.pool: return CatalogueSnapshot(None)
+        version = self.catalogue_version(); snapshot = self._snapshot
+        if snapshot is not None and version is not None and snapshot.version == version: return snapshot
+        # Eén thread leest opnieuw in; threads die tegelijk dezelfde nieuwe versie zien, wachten en krijgen dat snapshot.
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and version is not None and snapshot.version is not None and snapshot.version >= version: return snapshot
+            with self.pool.read_transaction() as conn:
+                snapshot = CatalogueSnapshot(read_version(conn), ((normalize_name(row['name']), dict(row)) for row in conn.execute("SELECT * FROM plants")))
+            self._snapshot = snapshot
+        return snapshot
+
+    @timed('db.search_names')
+    def search_plant_names(self, query, limit=20):
+        """Zoekt via de FTS5-trigramtabel (minstens 3 tekens); lege lijst als die tabel ontbreekt."""
+        if not self.pool or len(query.strip()) < 3: return []
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.execute("SELECT name FROM plants_fts WHERE plants_fts MATCH ? ORDER BY bm25(plants_fts) LIMIT ?",
+                                      ('"' + query.strip().replace('"', '""') + '"', limit))
+                return [row['name'] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Fout bij zoeken naar '{query}': {e}")
+            return []
 
     def get_plant_details(self, name):
-        if not self.conn: return None
+        return self.get_plant_details_many([name]).get(normalize_name(name))
+
+    @timed('db.plant_details')
+    def get_plant_details_many(self, names):
+        """Haalt de details van meerdere planten op met één IN-query per blok namen, of uit het snapshot als dat
+        bij de huidige catalogusversie hoort. Geeft een dict genormaliseerde naam -> rij; onbekende namen ontbreken."""
+        if not self.pool: return {}
+        keys = list(dict.fromkeys(normalize_name(name) for name in names))
+        if self.use_cache:
+            self._validate_cache(); snapshot = self._snapshot
+            if snapshot is not None and snapshot.version is not None and snapshot.version == self._cache_version:
+                return {key: snapshot[key] for key in keys if key in snapshot}
+            with self._lock: missing = [key for key in keys if key not in self._cache]
+        else:
+            missing = keys
+        found = {}
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM plants WHERE LOWER(name)=?", (name.lower(),))
-            return cursor.fetchone()
+            with self.pool.connection() as conn:
+                for start in range(0, len(missing), self.MAX_QUERY_PARAMS):
+                    chunk = missing[start:start + self.MAX_QUERY_PARAMS]; size = next(s for s in self.IN_SIZES if s >= len(chunk))
+                    cursor = conn.execute(f"SELECT * FROM plants WHERE name COLLATE NOCASE IN ({', '.join('?' * size)})",
+                                          chunk + chunk[-1:] * (size - len(chunk)))
+                    for row in cursor.fetchall(): found[normalize_name(row['name'])] = row
         except sqlite3.Error as e:
-            print(f"Fout bij ophalen details voor {name}: {e}")
-            return None
\ No newline at end of file
+            print(f"Fout bij ophalen details voor {len(missing)} planten: {e}")
+            return {}
+        if not self.use_cache: return found
+        # Ook onbekende namen worden onthouden, zodat ze niet bij elke export opnieuw worden opgevraagd.
+        with self._lock:
+            for key in missing: self._cache[key] = found.get(key)
+            return {key: self._cache[key] for key in keys if self._cache.get(key) is not None}
+
+    def _validate_cache(self):
+        """Leegt de cache zodra de catalogusversie verandert (of onbekend is)."""
+        version = self.catalogue_version()
+        with self._lock:
+            if version is None or version != self._cache_version:
+                self._cache.clear(); self._cache_version = version
@@ -0,0 +1,77 @@
+# database/pool.py
+# Verbindingen naar dezelfde catalogus voor meerdere threads. Een SQLite-verbinding mag niet door twee threads
+# tegelijk worden gebruikt; de pool leent elke verbinding aan één thread tegelijk uit.
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+BUSY_TIMEOUT_MS = 5000
+
+def configure_connection(conn, journal_mode='wal'):
+    """Busy-timeout (wachten op een schrijver in plaats van direct 'database is locked') en de journal-modus.
+
+    In WAL-modus blokkeren lezers en schrijver elkaar niet, maar WAL werkt alleen als alle gebruikers op dezelfde
+    machine draaien. Voor een database op een netwerkshare journal_mode=None (bestaande modus laten staan) gebruiken,
+    eventueel met een lokale replica (zie DatabaseManager)."""
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    if journal_mode:
+        mode = conn.execute(f"PRAGMA journal_mode = {journal_mode}").fetchone()[0]
+        if mode.lower() != journal_mode.lower(): print(f"WAARSCHUWING: journal_mode {journal_mode} niet mogelijk voor deze database, '{mode}' wordt gebruikt.")
+    if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal': conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+class ConnectionPool:
+    """Maximaal size verbindingen, lui geopend: connection() leent er een uit voor de duur van een with-blok en wacht
+    (hooguit timeout seconden) als ze allemaal in gebruik zijn."""
+
+    def __init__(self, db_file, size=4, journal_mode='wal', timeout=None):
+        self.db_file = db_file; self.size = size; self.journal_mode = journal_mode; self.timeout = timeout
+        self._idle = queue.LifoQueue(); self._opened = 0; self._lock = threading.Lock(); self._closed = False
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_file, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000)
+        return configure_connection(conn, self.journal_mode)
+
+    def acquire(self):
+        if self._closed: raise sqlite3.ProgrammingError("De verbindingspool is gesloten.")
+        try: return self._idle.get_nowait()
+        except queue.Empty: pass
+        with self._lock:
+            open_new = self._opened < self.size
+            if open_new: self._opened += 1
+        if open_new:
+            try: return self._open()
+            except BaseException:
+                with self._lock: self._opened -= 1
+                raise
+        try: return self._idle.get(timeout=self.timeout)
+        except queue.Empty: raise sqlite3.OperationalError(f"Geen vrije databaseverbinding binnen {self.timeout} s.")
+
+    def release(self, conn):
+        if conn.in_transaction: conn.rollback()  # een halve transactie gaat niet mee naar de volgende gebruiker
+        if self._closed: conn.close()
+        else: self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try: yield conn
+        finally: self.release(conn)
+
+    @contextmanager
+    def read_transaction(self):
+        """Verbinding binnen één leestransactie: alle queries zien dezelfde stand van de catalogus, ook als er
+        ondertussen iemand schrijft."""
+        with self.connection() as conn:
+            conn.execute("BEGIN")
+            try: yield conn
+            finally: conn.rollback()
+
+    def close(self):
+        """Sluit de vrije verbindingen; uitgeleende verbindingen worden gesloten zodra ze terugkomen."""
+        self._closed = True
+        while True:
+            try: self._idle.get_nowait().close()
+            except queue.Empty: break
@@ -1,18 +1,64 @@
 # exporting/pdf_generator.py
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Image, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Image, Paragraph, Spacer, PageBreak
 from reportlab.lib.pagesizes import landscape, A4
 from reportlab.lib import colors
 from reportlab.lib.units import cm
 from reportlab.pdfgen import canvas
 from reportlab.lib.styles import getSampleStyleSheet
+from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
+from exporting.pdf_streams import PAGE_COMPRESSION, binary_streams
+from exporting.thumbnails import ThumbnailCache
+from core.pricing import CENT, money, vat
+from core.profiling import timed
 
+FLOWERING_COLORS = {1: colors.HexColor('#d4edbc'), 2: colors.HexColor('#bce8f1')}  # 1 = structuur, 2 = bloei
+
+def _month(value):
+    """Maandnummer 1-12, of 0 voor leeg, onleesbaar ('abc', '3.5') of buiten bereik (13): geen periode in plaats van een crash."""
+    try: number = float(str(value).strip()) if value not in (None, '') else 0.0
+    except ValueError: return 0
+    return int(number) if number.is_integer() and 1 <= number <= 12 else 0
+
+def month_mask(starts, ends):
+    """(n, 12) bool-matrix met de bezette maanden; start > eind loopt door over de jaarwisseling, 0/None is geen periode."""
+    starts = np.array([_month(s) for s in starts], dtype=np.int64)[:, None]; ends = np.array([_month(e) for e in ends], dtype=np.int64)[:, None]
+    months = np.arange(1, 13)[None, :]; valid = (starts > 0) & (ends > 0)
+    inside = np.where(starts <= ends, (months >= starts) & (months <= ends), (months >= starts) | (months <= ends))
+    return inside & valid
+
+def flowering_matrix(plants):
+    """Celstatus per plant en maand in één gevectoriseerde stap: 0 leeg, 1 structuur, 2 bloei (bloei gaat voor)."""
+    structure = month_mask([p['structure_start_month'] for p in plants], [p['structure_end_month'] for p in plants])
+    flower = month_mask([p['flower_start_month'] for p in plants], [p['flower_end_month'] for p in plants])
+    return np.where(flower, 2, np.where(structure, 1, 0)).reshape(len(plants), 12)
+
+def merged_spans(state):
+    """Aaneengesloten cellen met dezelfde status als rechthoeken (rij0, kolom0, rij1, kolom1, status):
+    eerst per rij samengevoegd, daarna identieke runs in opeenvolgende rijen."""
+    if not state.size: return []
+    padded = np.pad(state, ((0, 0), (1, 1))); change = padded[:, 1:] != padded[:, :-1]
+    rows, cols = np.nonzero(change)  # per rij afwisselend begin en einde (exclusief) van een run, inclusief status 0
+    starts = cols; ends = np.append(cols[1:], 0); same_row = np.append(rows[1:] == rows[:-1], False)
+    run_rows, run_c0, run_c1 = rows[same_row], starts[same_row], ends[same_row] - 1
+    run_state = state[run_rows, run_c0]; keep = run_state > 0
+    runs = np.column_stack([run_c0[keep], run_c1[keep], run_state[keep], run_rows[keep]])
+    runs = runs[np.lexsort((runs[:, 3], runs[:, 2], runs[:, 1], runs[:, 0]))]
+    # Verticaal samenvoegen: zelfde kolommen en status, rij direct onder de vorige.
+    new_span = np.ones(len(runs), dtype=bool)
+    new_span[1:] = (runs[1:, :3] != runs[:-1, :3]).any(axis=1) | (runs[1:, 3] != runs[:-1, 3] + 1)
+    first = np.flatnonzero(new_span)
+    last_row = np.maximum.reduceat(runs[:, 3], first) if len(first) else first
+    return [(int(runs[i, 3]), int(runs[i, 0]), int(last_row[k]), int(runs[i, 1]), int(runs[i, 2])) for k, i in enumerate(first)]
+
+@timed('pdf.flowering')
+@binary_streams
 def generate_flowering_pdf(filename, species_details_list):
-    doc = SimpleDocTemplate(filename, pagesize=landscape(A4), topMargin=1.5*cm, bottomMargin=1.5*cm)
+    doc = SimpleDocTemplate(filename, pagesize=landscape(A4), topMargin=1.5*cm, bottomMargin=1.5*cm, pageCompression=PAGE_COMPRESSION)
     elements = []
     
     months = ["Jan", "Feb", "Maa", "Apr", "Mei", "Jun", "Jul", "Aug", "Sep", "Okt", "Nov", "Dec"]
     header = ["Vaste planten"] + months
-    data = [header]
     
     style_commands = [
         ('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('GRID', (0,0), (-1,-1), 0.5, colors.black),
@@ -20,66 +66,122 @@ def generate_flowering_pdf(filename, species_details_list):
         ('VALIGN', (0,0), (-1,-1), 'MIDDLE'), ('ALIGN', (0,1), (0,-1), 'LEFT'), ('LEFTPADDING', (0,1), (0,-1), 5),
     ]
 
-    for i, plant_info in enumerate(sorted(species_details_list, key=lambda p: p['name'])):
-        row_num = i + 1
-        row_data = [plant_info['name'].capitalize()] + [''] * 12
-        
-        struct_start, struct_end = plant_info['structure_start_month'], plant_info['structure_end_month']
-        flower_start, flower_end = plant_info['flower_start_month'], plant_info['flower_end_month']
+    plants = sorted(species_details_list, key=lambda p: p['name'])
+    state = flowering_matrix(plants)
+    cells = np.array(['', 'S', 'B'])[state].tolist()
+    data = [header] + [[plant_info['name'].capitalize()] + row for plant_info, row in zip(plants, cells)]
 
-        if struct_start and struct_end:
-            for m in range(struct_start, struct_end + 1):
-                row_data[m] = 'S'
-                style_commands.append(('BACKGROUND', (m, row_num), (m, row_num), colors.HexColor('#d4edbc')))
-        
-        if flower_start and flower_end:
-            for m in range(flower_start, flower_end + 1):
-                row_data[m] = 'B'
-                style_commands.append(('BACKGROUND', (m, row_num), (m, row_num), colors.HexColor('#bce8f1')))
-        
-        data.append(row_data)
+    # Eén BACKGROUND-commando per samengevoegd blok in plaats van per cel; rij +1 voor de kop, kolom +1 voor de naam.
+    for row0, col0, row1, col1, cell_state in merged_spans(state):
+        style_commands.append(('BACKGROUND', (col0 + 1, row0 + 1), (col1 + 1, row1 + 1), FLOWERING_COLORS[cell_state]))
     
-    table = Table(data, colWidths=[6*cm] + [1.9*cm] * 12, rowHeights=0.7*cm)
+    table = Table(data, colWidths=[6*cm] + [1.9*cm] * 12, rowHeights=0.7*cm, repeatRows=1)
     table.setStyle(TableStyle(style_commands))
     
     elements.append(table)
     doc.build(elements)
 
-def generate_order_list_pdf(filename, species_totals, plant_details_map):
-    c = canvas.Canvas(filename, pagesize=A4); width, height = A4
-    c.setFont("Helvetica-Bold", 12); c.drawString(15*cm, height - 2*cm, "DEAS V.O.F")
-    c.setFont("Helvetica", 10); c.drawString(15*cm, height - 2.5*cm, "Haldereng 39 6721XR Bennekom"); c.drawString(15*cm, height - 3*cm, "BTW: NL862942111B01 KVK: 836355")
-    
-    data = [['Omschrijving', 'Kwaliteit', 'Aantal', 'P/eenheid', 'Prijs in euro']]; total_ex_btw = 0
-    
+ORDER_COLUMNS = ['Omschrijving', 'Kwaliteit', 'Aantal', 'P/eenheid', 'Prijs in euro']
+ORDER_ROW_HEIGHT = 0.6*cm
+ORDER_TOP = A4[1] - 4*cm
+ORDER_ROWS_PER_PAGE = int((ORDER_TOP - 2*cm) // ORDER_ROW_HEIGHT) - 2  # kop- en subtotaalrij
+
+def order_lines(species_totals, plant_details_map):
+    """Genereert (tabelrij, regelbedrag) per soort op alfabetische volgorde."""
     for species, total_amount in sorted(species_totals.items()):
         details = plant_details_map.get(species.lower())
-        quality, price = (details['quality'], details['price_per_unit']) if details else ('N/A', 0)
-        
-        line_total = total_amount * price; total_ex_btw += line_total
-        data.append([
-            species.capitalize(), quality, str(total_amount), f"€ {price:.2f}", f"€ {line_total:.2f}"
-        ])
-        
-    table = Table(data, colWidths=[8*cm, 2*cm, 2*cm, 2.5*cm, 3*cm])
-    style = TableStyle([('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('GRID', (0,0), (-1,-1), 1, colors.black),
-                        ('ALIGN', (0,0), (-1,-1), 'LEFT'), ('ALIGN', (2,1), (-1,-1), 'RIGHT'),
-                        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'), ('BOTTOMPADDING', (0,0), (-1,0), 12)])
-    table.setStyle(style); table.wrapOn(c, width, height); table.drawOn(c, 2*cm, height - 8*cm)
-    
-    btw_9_procent = total_ex_btw * 0.09; total_inc_btw = total_ex_btw + btw_9_procent
-    c.setFont("Helvetica-Bold", 12); c.drawRightString(width - 2*cm, height - 12*cm, f"TOTAAL EX. BTW: € {total_ex_btw:.2f}")
-    c.setFont("Helvetica", 10); c.drawRightString(width - 2*cm, height - 12.5*cm, f"BTW 9%: € {btw_9_procent:.2f}")
-    c.setFont("Helvetica-Bold", 14); c.drawRightString(width - 2*cm, height - 13.5*cm, f"TOTAAL INCL. BTW: € {total_inc_btw:.2f}")
+        quality, price = (details['quality'], money(details['price_per_unit'])) if details else ('N/A', money(0))
+        line_total = (price * total_amount).quantize(CENT, rounding=ROUND_HALF_UP)
+        yield [species.capitalize(), quality, str(total_amount), f"€ {price:.2f}", f"€ {line_total:.2f}"], line_total
+
+def order_pages(lines, rows_per_page):
+    """Verdeelt (tabelrij, regelbedrag) over pagina's: genereert (rijen, paginasubtotaal) per pagina van hoogstens
+    rows_per_page regels, zonder de hele lijst vast te houden. Een lege bestellijst geeft één lege pagina."""
+    rows = []; subtotal = Decimal('0.00'); pages = 0
+    for row, line_total in lines:
+        rows.append(row); subtotal += line_total
+        if len(rows) == rows_per_page:
+            yield rows, subtotal; pages += 1; rows = []; subtotal = Decimal('0.00')
+    if rows or not pages: yield rows, subtotal
+
+def _draw_order_header(c, width, height, page_number):
+    c.setFont("Helvetica-Bold", 12); c.drawString(15*cm, height - 2*cm, "DEAS V.O.F")
+    c.setFont("Helvetica", 10); c.drawString(15*cm, height - 2.5*cm, "Haldereng 39 6721XR Bennekom"); c.drawString(15*cm, height - 3*cm, "BTW: NL862942111B01 KVK: 836355")
+    c.setFont("Helvetica", 8); c.drawRightString(width - 2*cm, 1.2*cm, f"Pagina {page_number}")
+
+def _draw_order_page(c, rows, subtotal, top):
+    """Tekent één pagina van de bestellijst: kop, regels en paginasubtotaal; geeft de onderkant van de tabel terug."""
+    data = [ORDER_COLUMNS] + rows + [['Subtotaal pagina', '', '', '', f"€ {subtotal:.2f}"]]
+    table = Table(data, colWidths=[8*cm, 2*cm, 2*cm, 2.5*cm, 3*cm], rowHeights=ORDER_ROW_HEIGHT)
+    table.setStyle(TableStyle([('BACKGROUND', (0,0), (-1,0), colors.lightgrey), ('GRID', (0,0), (-1,-1), 1, colors.black),
+                               ('ALIGN', (0,0), (-1,-1), 'LEFT'), ('ALIGN', (2,1), (-1,-1), 'RIGHT'), ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+                               ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'), ('FONTNAME', (0,-1), (-1,-1), 'Helvetica-Bold'),
+                               ('SPAN', (0,-1), (3,-1)), ('BACKGROUND', (0,-1), (-1,-1), colors.whitesmoke)]))
+    _, table_height = table.wrap(0, 0); table.drawOn(c, 2*cm, top - table_height)
+    return top - table_height
+
+@timed('pdf.order_list')
+@binary_streams
+def generate_order_list_pdf(filename, species_totals, plant_details_map):
+    """Bestellijst over zoveel pagina's als nodig: per pagina een tabel met herhaalde kop en subtotaal, totalen op het eind.
+    Regels worden per pagina opgebouwd en getekend, zodat het geheugen niet met de lengte van de lijst meegroeit."""
+    c = canvas.Canvas(filename, pagesize=A4, pageCompression=PAGE_COMPRESSION); width, height = A4
+    top = ORDER_TOP; total_ex_btw = Decimal('0.00'); page_number = 0
+
+    for rows, subtotal in order_pages(order_lines(species_totals, plant_details_map), ORDER_ROWS_PER_PAGE):
+        if page_number: c.showPage()
+        page_number += 1; total_ex_btw += subtotal
+        _draw_order_header(c, width, height, page_number); bottom = _draw_order_page(c, rows, subtotal, top)
+    if bottom - 3.5*cm < 2*cm:  # totalen passen niet meer onder de laatste tabel
+        c.showPage(); page_number += 1; _draw_order_header(c, width, height, page_number); bottom = top
+
+    btw_9_procent = vat(total_ex_btw); total_inc_btw = total_ex_btw + btw_9_procent
+    c.setFont("Helvetica-Bold", 12); c.drawRightString(width - 2*cm, bottom - 1*cm, f"TOTAAL EX. BTW: € {total_ex_btw:.2f}")
+    c.setFont("Helvetica", 10); c.drawRightString(width - 2*cm, bottom - 1.5*cm, f"BTW 9%: € {btw_9_procent:.2f}")
+    c.setFont("Helvetica-Bold", 14); c.drawRightString(width - 2*cm, bottom - 2.5*cm, f"TOTAAL INCL. BTW: € {total_inc_btw:.2f}")
     c.save()
 
-def generate_image_layout_pdf(filename, species_details_list):
-    """Genereert een PDF met een grid van plantafbeeldingen en namen."""
-    doc = SimpleDocTemplate(filename, pagesize=landscape(A4), topMargin=1.5*cm, bottomMargin=1.5*cm)
+SCENARIOS_PER_PAGE = 4
+
+@timed('pdf.scenarios')
+@binary_streams
+def generate_scenario_pdf(filename, comparison):
+    """Offertevergelijking: per soort aantal, kwaliteit en bedrag per scenario naast elkaar, met totalen en het verschil
+    ten opzichte van het eerste scenario. Bij meer scenario's dan op één pagina passen volgen ze op de volgende pagina's."""
+    doc = SimpleDocTemplate(filename, pagesize=landscape(A4), topMargin=1.5*cm, bottomMargin=1.5*cm, leftMargin=2*cm, rightMargin=2*cm, pageCompression=PAGE_COMPRESSION)
+    rows = comparison.rows(); totals = comparison.totals(); elements = []
+    footers = [('Totaal ex. BTW', [t[0] for t in totals], '.2f'), ('BTW 9%', [t[1] for t in totals], '.2f'),
+               ('Totaal incl. BTW', [t[2] for t in totals], '.2f'), ('Verschil ex. BTW', [t[0] - totals[0][0] for t in totals], '+.2f')]
+    for first in range(0, len(comparison), SCENARIOS_PER_PAGE):
+        group = range(first, min(first + SCENARIOS_PER_PAGE, len(comparison)))
+        data = [['Soort'] + [cell for s in group for cell in (comparison.names[s], '', '')],
+                [''] + ['Aantal', 'Kwaliteit', 'Bedrag'] * len(group)]
+        data += [[label] + [cell for s in group for cell in (str(cells[s][0]), cells[s][1], f"€ {cells[s][2]:.2f}")] for label, cells in rows]
+        for caption, values, spec in footers:
+            data.append([caption] + [cell for s in group for cell in (f"€ {values[s]:{spec}}", '', '')])
+        style = [('BACKGROUND', (0,0), (-1,1), colors.lightgrey), ('GRID', (0,0), (-1,-1), 0.5, colors.black),
+                 ('FONTNAME', (0,0), (-1,1), 'Helvetica-Bold'), ('FONTNAME', (0,-4), (-1,-1), 'Helvetica-Bold'),
+                 ('BACKGROUND', (0,-4), (-1,-1), colors.whitesmoke), ('ALIGN', (1,2), (-1,-1), 'RIGHT'), ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+                 ('SPAN', (0,0), (0,1))]
+        for column in range(1, 3 * len(group), 3):
+            style += [('SPAN', (column, 0), (column + 2, 0)), ('ALIGN', (column, 0), (column + 2, 0), 'CENTER')]
+            style += [('SPAN', (column, row), (column + 2, row)) for row in range(len(data) - 4, len(data))]
+        table = Table(data, colWidths=[6*cm] + [1.5*cm, 1.3*cm, 2.1*cm] * len(group), repeatRows=2)
+        table.setStyle(TableStyle(style)); elements.append(table)
+        if group.stop < len(comparison): elements.append(PageBreak())
+    doc.build(elements)
+
+@timed('pdf.image_layout')
+@binary_streams
+def generate_image_layout_pdf(filename, species_details_list, thumbnail_cache=None):
+    """Genereert een PDF met een grid van plantafbeeldingen en namen.
+    Afbeeldingen komen uit de thumbnail-cache; geef thumbnail_cache=False om de originele bestanden te gebruiken."""
+    doc = SimpleDocTemplate(filename, pagesize=landscape(A4), topMargin=1.5*cm, bottomMargin=1.5*cm, pageCompression=PAGE_COMPRESSION)
     styles = getSampleStyleSheet(); styleN = styles['Normal']; styleN.alignment = 1
     elements = []
     
     cols = 3; table_data = []; row_data = []
+    if thumbnail_cache is None: thumbnail_cache = ThumbnailCache()
 
     for plant_info in sorted(species_details_list, key=lambda p: p['name']):
         # --- DE CORRECTIE ---
@@ -88,8 +190,15 @@ def generate_image_layout_pdf(filename, species_details_list):
         if not path:
             continue
 
+        # Afmetingen staan in de catalogus (update_database_images.py), dan hoeft de bron niet geopend te worden.
+        keys = plant_info.keys()
+        width_px, height_px = (plant_info['image_width'], plant_info['image_height']) if 'image_width' in keys else (None, None)
+
         try:
-            img = Image(path, width=8*cm, height=6*cm, kind='proportional')
+            if thumbnail_cache: path, width_px, height_px = thumbnail_cache.get(path)
+            if width_px and height_px:
+                scale = min(8*cm / width_px, 6*cm / height_px); img = Image(path, width=width_px * scale, height=height_px * scale)
+            else: img = Image(path, width=8*cm, height=6*cm, kind='proportional')
             name_paragraph = Paragraph(plant_info['name'].capitalize(), styleN)
             cell_story = [img, Spacer(1, 0.2*cm), name_paragraph]
             row_data.append(cell_story)
@@ -104,6 +213,7 @@ def generate_image_layout_pdf(filename, species_details_list):
         while len(row_data) < cols: row_data.append("")
         table_data.append(row_data)
 
+    if thumbnail_cache: thumbnail_cache.save_index()
     if not table_data:
         print("Geen planten met afbeeldingen gevonden om te exporteren."); return
 
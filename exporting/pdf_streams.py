@@ -0,0 +1,17 @@
+# exporting/pdf_streams.py
+# Paginastromen en afbeeldingen binair opnemen in plaats van ASCII85: ReportLab codeert ASCII85 in pure Python,
+# wat bij afbeeldingen en grote plantekeningen meer tijd kostte dan de rest van de export. ReportLab kent daarvoor
+# alleen de procesbrede instelling rl_config.useA85; die wordt hier alleen tijdens onze eigen exports omgezet.
+import functools
+from reportlab import rl_config
+
+PAGE_COMPRESSION = 1  # per canvas/document meegegeven, los van rl_config.pageCompression
+
+def binary_streams(function):
+    """Decorator: zet useA85 uit zolang de export loopt en herstelt daarna de oorspronkelijke waarde."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        previous = rl_config.useA85; rl_config.useA85 = 0
+        try: return function(*args, **kwargs)
+        finally: rl_config.useA85 = previous
+    return wrapper
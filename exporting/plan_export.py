@@ -0,0 +1,250 @@
+# exporting/plan_export.py
+# Het beplantingsplan zelf als vectortekening (PDF via ReportLab of SVG): gekleurde bedden, labels (soort, aantal)
+# en een legenda. Per soort gaan alle bedden in één pad waarvan de code gevectoriseerd wordt geformatteerd en direct
+# in de paginastroom wordt geschreven; er worden geen matplotlib-artists opgebouwd. Grote plannen worden op schaal
+# over meerdere bladen verdeeld, en labels die elkaar zouden overlappen worden via een rasterindex verschoven of weggelaten.
+import math
+from collections import defaultdict
+from xml.sax.saxutils import escape
+import numpy as np
+from reportlab.lib.pagesizes import landscape, A3
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from core.aggregation import species_label
+from core.profiling import timed
+from exporting.pdf_streams import PAGE_COMPRESSION, binary_streams
+
+PLAN_PAGESIZE = landscape(A3)
+PLAN_MARGIN = 1.5*cm; HEADER_HEIGHT = 1*cm; LEGEND_WIDTH = 6*cm; LEGEND_GAP = 0.5*cm; LEGEND_ROW = 0.5*cm
+LABEL_FONT = 'Helvetica'; LABEL_SIZE = 6; LABEL_LINE = 1.2 * LABEL_SIZE; LABEL_MAX_CHARS = 28
+STANDARD_SCALES = (50, 100, 200, 250, 500, 1000, 2000, 2500, 5000, 10000)
+MIN_BED_SIZE = 1.5*cm  # automatische schaal: een mediaan bed moet op papier minstens zo groot zijn
+MAX_SHEETS = 24
+OUTLINE_COLOR = (0.25, 0.25, 0.25); EMPTY_COLOR = (0.6, 0.6, 0.6)
+
+def plan_frame(pagesize=PLAN_PAGESIZE):
+    """Tekenvlak (x0, y0, x1, y1) op de pagina, links van de legenda en onder de kop."""
+    width, height = pagesize
+    return np.array([PLAN_MARGIN, PLAN_MARGIN, width - PLAN_MARGIN - LEGEND_WIDTH - LEGEND_GAP, height - PLAN_MARGIN - HEADER_HEIGHT])
+
+def world_bbox(store):
+    b = store.bboxes
+    return np.array([b[:, 0].min(), b[:, 1].min(), b[:, 2].max(), b[:, 3].max()]) if len(b) else np.array([0.0, 0.0, 1.0, 1.0])
+
+def points_per_meter(scale):
+    """Punten op papier per meter in het plan bij schaal 1:scale."""
+    return 100 * cm / scale
+
+def fit_scale(bbox, frame, padding=0.02):
+    """Schaalgetal N (1:N) waarbij de hele bbox, met wat witruimte rondom, in het tekenvlak past."""
+    return (1 + 2 * padding) * max((bbox[2] - bbox[0]) * 100 * cm / (frame[2] - frame[0]), (bbox[3] - bbox[1]) * 100 * cm / (frame[3] - frame[1]), 1e-9)
+
+def sheets(bbox, frame, scale):
+    """Bladen (naam, bbox in plancoördinaten) om de bbox op schaal 1:scale te tekenen; rij A is de bovenste."""
+    ppm = points_per_meter(scale); tile_w, tile_h = (frame[2] - frame[0]) / ppm, (frame[3] - frame[1]) / ppm
+    nx = max(math.ceil((bbox[2] - bbox[0]) / tile_w - 1e-9), 1); ny = max(math.ceil((bbox[3] - bbox[1]) / tile_h - 1e-9), 1)
+    x0 = (bbox[0] + bbox[2] - nx * tile_w) / 2; y1 = (bbox[1] + bbox[3] + ny * tile_h) / 2
+    return [(f"{chr(65 + row % 26)}{col + 1}", np.array([x0 + col * tile_w, y1 - (row + 1) * tile_h, x0 + (col + 1) * tile_w, y1 - row * tile_h]))
+            for row in range(ny) for col in range(nx)]
+
+def auto_scale(store, frame, min_bed_size=MIN_BED_SIZE, max_sheets=MAX_SHEETS):
+    """Grofste standaardschaal waarop een mediaan bed leesbaar is, met hoogstens max_sheets bladen;
+    None als het plan al leesbaar op één blad past (of geen standaardschaal binnen max_sheets blijft)."""
+    if not len(store): return None
+    bbox = world_bbox(store); fit = fit_scale(bbox, frame); b = store.bboxes
+    wanted = float(np.median(np.maximum(b[:, 2] - b[:, 0], b[:, 3] - b[:, 1]))) * 100 * cm / min_bed_size
+    if wanted >= fit: return None
+    options = [scale for scale in STANDARD_SCALES if scale < fit and len(sheets(bbox, frame, scale)) <= max_sheets]
+    readable = [scale for scale in options if scale <= wanted]
+    return max(readable) if readable else (min(options) if options else None)
+
+def _transform(origin, scale, frame, flip_height=None):
+    """Plancoördinaten -> paginacoördinaten; met flip_height loopt y naar beneden (SVG)."""
+    ppm = points_per_meter(scale)
+    def to_page(points):
+        page = (np.asarray(points, dtype=np.float64) - origin) * ppm + frame[:2]
+        if flip_height is not None: page[..., 1] = flip_height - page[..., 1]
+        return page
+    return to_page
+
+def ring_code(store, beds, to_page, move, line, close, separator):
+    """Padcode van de ringen van de opgegeven bedden in één string; move en line zijn %-sjablonen voor x en y."""
+    starts = store.offsets[beds]; counts = store.offsets[beds + 1] - starts
+    if not counts.sum(): return ''
+    first = np.cumsum(counts) - counts
+    index = np.repeat(starts - first, counts) + np.arange(counts.sum())
+    is_first = np.zeros(len(index), dtype=bool); is_first[first] = True
+    templates = np.where(is_first, move, line); templates = np.where(np.roll(is_first, -1), np.char.add(templates, close), templates)
+    return separator.join(templates.tolist()) % tuple(to_page(store.vertices[index]).ravel().tolist())
+
+def _species_groups(plan, beds):
+    """{soortnaam of None (geen toewijzing): bedindices}, in tekenvolgorde."""
+    groups = defaultdict(list)
+    for index in beds.tolist(): groups[plan.species[index] if plan.finished[index] else None].append(index)
+    return {species: np.array(indices, dtype=np.int64) for species, indices in groups.items()}
+
+class LabelGrid:
+    """Rasterindex van de al geplaatste labelkaders (x0, y0, x1, y1): een nieuw label wordt alleen getoetst
+    tegen de labels in de cellen die het raakt in plaats van tegen alle labels."""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size; self.cells = defaultdict(list)
+
+    def _keys(self, box):
+        x0, y0, x1, y1 = (int(value // self.cell_size) for value in box)
+        return [(i, j) for i in range(x0, x1 + 1) for j in range(y0, y1 + 1)]
+
+    def fits(self, box):
+        return not any(box[0] < other[2] and other[0] < box[2] and box[1] < other[3] and other[1] < box[3]
+                       for key in self._keys(box) for other in self.cells.get(key, ()))
+
+    def add(self, box):
+        for key in self._keys(box): self.cells[key].append(box)
+
+def _short(text, limit=LABEL_MAX_CHARS):
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+def place_labels(plan, beds, to_page, frame, counts=None):
+    """Labels (soort, aantal) voor de toegewezen bedden, grootste bedden eerst; geeft [(x, y, regels)] met het midden
+    van het label in paginacoördinaten. Per bed worden enkele posities rond het zwaartepunt geprobeerd; botst elk
+    daarvan met een eerder label of valt het buiten het tekenvlak, dan vervalt het label."""
+    beds = beds[plan.finished[beds]]
+    if not len(beds): return []
+    beds = beds[np.argsort(-plan.store.areas[beds], kind='stable')]
+    counts = plan.bed_counts() if counts is None else counts
+    centers = to_page(plan.store.centroids[beds]); corners = to_page(plan.store.bboxes[beds].reshape(-1, 2)).reshape(-1, 2, 2)
+    boxes = np.concatenate([corners.min(axis=1), corners.max(axis=1)], axis=1)
+    grid = LabelGrid(4 * LABEL_LINE); widths = {}; labels = []
+    for (x, y), (bx0, by0, bx1, by1), index in zip(centers.tolist(), boxes.tolist(), beds.tolist()):
+        height = 2 * LABEL_LINE
+        if by1 - by0 < height: continue  # bed is op deze schaal te klein voor een label
+        lines = [_short(species_label(plan.species[index])), f"{counts[index]} st."]
+        if lines[0] not in widths: widths[lines[0]] = stringWidth(lines[0], LABEL_FONT, LABEL_SIZE)
+        width = max(widths[lines[0]], stringWidth(lines[1], LABEL_FONT, LABEL_SIZE)) + 2
+        if bx1 - bx0 < 0.6 * width: continue
+        for cx, cy in ((x, y), (x, y + height), (x, y - height), (x + width, y), (x - width, y)):
+            if not (bx0 <= cx <= bx1 and by0 <= cy <= by1): continue
+            box = (cx - width / 2, cy - height / 2, cx + width / 2, cy + height / 2)
+            if box[0] < frame[0] or box[1] < frame[1] or box[2] > frame[2] or box[3] > frame[3] or not grid.fits(box): continue
+            grid.add(box); labels.append((cx, cy, lines)); break
+    return labels
+
+def legend_entries(plan):
+    """[(soortlabel, RGBA, totaal)] op alfabetische volgorde."""
+    totals = plan.species_totals(); names = {species_label(name): name for name in set(plan.species) if name}
+    return [(label, plan.colors.rgba(names[label]), totals[label]) for label in sorted(totals) if label in names]
+
+def _draw_beds(c, plan, beds, to_page):
+    """Eén gevuld pad per soort; bedden zonder toewijzing alleen als omtrek."""
+    c.setLineWidth(0.3); c.setLineJoin(1)
+    for species, indices in _species_groups(plan, beds).items():
+        code = ring_code(plan.store, indices, to_page, '%.2f %.2f m', '%.2f %.2f l', ' h', '\n')
+        if species is None: c.setStrokeColorRGB(*EMPTY_COLOR); c.addLiteral(code + '\nS'); continue
+        r, g, b, alpha = plan.colors.rgba(species)
+        c.setFillColorRGB(r, g, b, alpha=alpha); c.setStrokeColorRGB(*OUTLINE_COLOR); c.addLiteral(code + '\nB')
+
+def _draw_labels(c, labels):
+    c.setFont(LABEL_FONT, LABEL_SIZE); c.setFillColorRGB(0, 0, 0, alpha=1)
+    for x, y, lines in labels:
+        for row, text in enumerate(lines): c.drawCentredString(x, y + LABEL_LINE * (len(lines) / 2 - row - 1) + 0.3 * LABEL_SIZE, text)
+
+def _draw_legend(c, entries, x, top, bottom):
+    """Tekent zoveel legendaregels als er tussen top en bottom passen; geeft het aantal getekende regels terug."""
+    c.setFont('Helvetica-Bold', 10); c.setFillColorRGB(0, 0, 0, alpha=1); c.drawString(x, top - 0.4*cm, "Legenda")
+    rows = max(int((top - bottom) // LEGEND_ROW) - 2, 0); c.setFont('Helvetica', 8); c.setLineWidth(0.3)
+    for row, (label, (r, g, b, alpha), total) in enumerate(entries[:rows]):
+        y = top - (row + 2) * LEGEND_ROW
+        c.setFillColorRGB(r, g, b, alpha=alpha); c.setStrokeColorRGB(*OUTLINE_COLOR); c.rect(x, y, 0.35*cm, 0.35*cm, fill=1, stroke=1)
+        c.setFillColorRGB(0, 0, 0, alpha=1); c.drawString(x + 0.55*cm, y + 0.08*cm, f"{_short(label, 34)} ({total} st.)")
+    return min(rows, len(entries))
+
+def _draw_page(c, pagesize, plan, frame, to_page, beds, title, subtitle, entries, labels=True, counts=None):
+    width, height = pagesize
+    c.setFont('Helvetica-Bold', 12); c.drawString(PLAN_MARGIN, height - PLAN_MARGIN - 0.5*cm, title)
+    c.setFont('Helvetica', 9); c.drawRightString(width - PLAN_MARGIN, height - PLAN_MARGIN - 0.5*cm, subtitle)
+    c.saveState()
+    clip = c.beginPath(); clip.rect(frame[0], frame[1], frame[2] - frame[0], frame[3] - frame[1]); c.clipPath(clip, stroke=0, fill=0)
+    _draw_beds(c, plan, beds, to_page)
+    if labels: _draw_labels(c, place_labels(plan, beds, to_page, frame, counts))
+    c.restoreState()
+    c.setLineWidth(0.5); c.setStrokeColorRGB(0, 0, 0); c.rect(frame[0], frame[1], frame[2] - frame[0], frame[3] - frame[1])
+    drawn = _draw_legend(c, entries, frame[2] + LEGEND_GAP, frame[3], frame[1] + LEGEND_ROW)
+    if drawn < len(entries):
+        c.setFont('Helvetica-Oblique', 8); c.drawString(frame[2] + LEGEND_GAP, frame[1], f"... en {len(entries) - drawn} soorten meer, zie de laatste bladen")
+
+@timed('pdf.plan')
+@binary_streams
+def generate_plan_pdf(filename, plan, scale='auto', pagesize=PLAN_PAGESIZE, title="Beplantingsplan"):
+    """Plantekening als vector-PDF. scale=None past het hele plan op één blad, een getal N tekent op schaal 1:N over
+    zoveel bladen als nodig (met een overzichtsblad vooraf), 'auto' kiest een leesbare standaardschaal."""
+    c = canvas.Canvas(filename, pagesize=pagesize, pageCompression=PAGE_COMPRESSION); store = plan.store; frame = plan_frame(pagesize)
+    bbox = world_bbox(store); entries = legend_entries(plan); counts = plan.bed_counts()
+    if scale == 'auto': scale = auto_scale(store, frame)
+    fit = fit_scale(bbox, frame); tiles = sheets(bbox, frame, scale) if scale and scale < fit else []
+    # Overzicht op de passende schaal, gecentreerd in het tekenvlak.
+    origin = (bbox[:2] + bbox[2:]) / 2 - (frame[2:] - frame[:2]) / 2 / points_per_meter(fit)
+    overview = _transform(origin, fit, frame); all_beds = np.arange(len(store))
+    _draw_page(c, pagesize, plan, frame, overview, all_beds, title, f"Overzicht, schaal 1:{fit:.0f}" + (f", {len(tiles)} bladen" if tiles else ''),
+               entries, labels=not tiles, counts=counts)
+    if tiles:
+        c.saveState(); clip = c.beginPath(); clip.rect(frame[0], frame[1], frame[2] - frame[0], frame[3] - frame[1]); c.clipPath(clip, stroke=0, fill=0)
+        c.setLineWidth(0.6); c.setStrokeColorRGB(0.8, 0.1, 0.1); c.setDash(4, 3); c.setFont('Helvetica-Bold', 9); c.setFillColorRGB(0.8, 0.1, 0.1, alpha=1)
+        for name, tile in tiles:
+            (x0, y0), (x1, y1) = overview(tile.reshape(2, 2)).tolist()
+            c.rect(x0, y0, x1 - x0, y1 - y0); c.drawString(max(x0, frame[0]) + 2, min(y1, frame[3]) - 10, name)
+        c.restoreState()
+    for number, (name, tile) in enumerate(tiles, start=1):
+        beds = store.index.query_bbox(tile)
+        if not len(beds): continue
+        c.showPage()
+        _draw_page(c, pagesize, plan, frame, _transform(tile[:2], scale, frame), beds, title,
+                   f"Blad {name} ({number} van {len(tiles)}), schaal 1:{scale}", entries, counts=counts)
+    # Restant van een lange legenda op eigen bladen.
+    width, height = pagesize; start = min(max(int((frame[3] - frame[1] - LEGEND_ROW) // LEGEND_ROW) - 2, 0), len(entries))
+    columns = max(int((width - 2 * PLAN_MARGIN) // LEGEND_WIDTH), 1)
+    while start < len(entries):
+        c.showPage()
+        for column in range(columns):
+            if start >= len(entries): break
+            start += _draw_legend(c, entries[start:], PLAN_MARGIN + column * LEGEND_WIDTH, height - PLAN_MARGIN, PLAN_MARGIN)
+    c.save()
+
+def _hex(rgba):
+    return '#%02x%02x%02x' % tuple(int(round(255 * v)) for v in rgba[:3])
+
+@timed('svg.plan')
+def generate_plan_svg(filename, plan, pagesize=PLAN_PAGESIZE, title="Beplantingsplan"):
+    """Plantekening als één SVG op passende schaal (vector, dus verder in te zoomen), met labels en legenda.
+    Elementen worden per soort direct naar het bestand geschreven."""
+    store = plan.store; frame = plan_frame(pagesize); bbox = world_bbox(store); entries = legend_entries(plan)
+    width, height = pagesize; height = max(height, PLAN_MARGIN * 2 + HEADER_HEIGHT + (len(entries) + 2) * LEGEND_ROW)
+    fit = fit_scale(bbox, frame); origin = (bbox[:2] + bbox[2:]) / 2 - (frame[2:] - frame[:2]) / 2 / points_per_meter(fit)
+    # Het tekenvlak ligt bovenaan; in SVG loopt y naar beneden, dus het frame wordt gespiegeld ten opzichte van de pagina.
+    page_frame = frame + np.array([0, height - pagesize[1], 0, height - pagesize[1]])
+    to_page = _transform(origin, fit, page_frame, flip_height=height); beds = np.arange(len(store))
+    svg_frame = np.array([page_frame[0], height - page_frame[3], page_frame[2], height - page_frame[1]])
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}pt" height="{height:.0f}pt" viewBox="0 0 {width:.2f} {height:.2f}">\n')
+        f.write(f'<text x="{PLAN_MARGIN:.2f}" y="{PLAN_MARGIN + 0.5*cm:.2f}" font-family="Helvetica" font-weight="bold" font-size="12">{escape(title)}</text>\n')
+        f.write(f'<text x="{width - PLAN_MARGIN:.2f}" y="{PLAN_MARGIN + 0.5*cm:.2f}" font-family="Helvetica" font-size="9" text-anchor="end">Schaal 1:{fit:.0f}</text>\n')
+        f.write(f'<defs><clipPath id="frame"><rect x="{svg_frame[0]:.2f}" y="{svg_frame[1]:.2f}" width="{svg_frame[2] - svg_frame[0]:.2f}" height="{svg_frame[3] - svg_frame[1]:.2f}"/></clipPath></defs>\n')
+        f.write('<g clip-path="url(#frame)" stroke-width="0.3" stroke-linejoin="round">\n')
+        for species, indices in _species_groups(plan, beds).items():
+            d = ring_code(store, indices, to_page, 'M%.2f %.2f', 'L%.2f %.2f', 'Z', ' ')
+            if species is None: f.write(f'<path d="{d}" fill="none" stroke="{_hex(EMPTY_COLOR)}"/>\n'); continue
+            rgba = plan.colors.rgba(species)
+            f.write(f'<path d="{d}" fill="{_hex(rgba)}" fill-opacity="{rgba[3]:.2f}" stroke="{_hex(OUTLINE_COLOR)}"/>\n')
+        f.write(f'<g font-family="{LABEL_FONT}" font-size="{LABEL_SIZE}" text-anchor="middle">\n')
+        for x, y, lines in place_labels(plan, beds, to_page, svg_frame):
+            for row, text in enumerate(lines):
+                f.write(f'<text x="{x:.2f}" y="{y - LABEL_LINE * (len(lines) / 2 - row - 1) - 0.3 * LABEL_SIZE:.2f}">{escape(text)}</text>\n')
+        f.write('</g>\n</g>\n')
+        f.write(f'<rect x="{svg_frame[0]:.2f}" y="{svg_frame[1]:.2f}" width="{svg_frame[2] - svg_frame[0]:.2f}" height="{svg_frame[3] - svg_frame[1]:.2f}" fill="none" stroke="black" stroke-width="0.5"/>\n')
+        x = frame[2] + LEGEND_GAP; top = PLAN_MARGIN + HEADER_HEIGHT
+        f.write(f'<text x="{x:.2f}" y="{top + 0.4*cm:.2f}" font-family="Helvetica" font-weight="bold" font-size="10">Legenda</text>\n')
+        for row, (label, rgba, total) in enumerate(entries):
+            y = top + (row + 1) * LEGEND_ROW
+            f.write(f'<rect x="{x:.2f}" y="{y:.2f}" width="{0.35*cm:.2f}" height="{0.35*cm:.2f}" fill="{_hex(rgba)}" fill-opacity="{rgba[3]:.2f}" stroke="{_hex(OUTLINE_COLOR)}" stroke-width="0.3"/>\n')
+            f.write(f'<text x="{x + 0.55*cm:.2f}" y="{y + 0.27*cm:.2f}" font-family="Helvetica" font-size="8">{escape(_short(label, 34))} ({total} st.)</text>\n')
+        f.write('</svg>\n')
@@ -0,0 +1,66 @@
+# exporting/thumbnails.py
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from reportlab.lib.units import cm
+from core.hashing import file_hash
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+class ThumbnailCache:
+    """Schijfcache met verkleinde plantafbeeldingen, gesleuteld op de inhoud (sha1) van het bronbestand.
+    Een bron wordt alleen opnieuw gehasht als de mtime of grootte is veranderd. Meerdere processen (batch_export)
+    mogen dezelfde cachemap delen: bestanden worden via een uniek tijdelijk bestand en os.replace geschreven."""
+
+    def __init__(self, cache_dir='.thumbnail_cache', dpi=150, size=(8*cm, 6*cm)):
+        self.cache_dir = cache_dir; self.dpi = dpi; self.size = size
+        self.index_path = os.path.join(cache_dir, 'index.json'); self._index = None
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, encoding='utf-8') as f: self._index = json.load(f)
+            except (OSError, ValueError): self._index = {}
+        return self._index
+
+    def save_index(self):
+        if self._index is None: return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._atomic_write(self.index_path, '.json') as f: f.write(json.dumps(self._index).encode('utf-8'))
+
+    @contextmanager
+    def _atomic_write(self, target, suffix):
+        """Open binair bestand dat na het with-blok target vervangt; een half geschreven bestand wordt nooit zichtbaar."""
+        fd, tmp = tempfile.mkstemp(suffix=suffix, dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f: yield f
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp); raise
+
+    def source_hash(self, path):
+        index = self._load_index(); stat = os.stat(path); key = os.path.abspath(path)
+        entry = index.get(key)
+        if not entry or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            entry = index[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': file_hash(path)}
+        return entry['hash']
+
+    def get(self, path):
+        """Geeft (pad naar thumbnail, breedte_px, hoogte_px). De bron wordt altijd ge-stat, zodat een bewerkte
+        afbeelding een nieuwe thumbnail krijgt; opnieuw hashen gebeurt alleen als mtime of grootte veranderde."""
+        if PILImage is None: return path, None, None
+        content_hash = self.source_hash(path)
+        thumb_path = os.path.join(self.cache_dir, f"{content_hash}_{self.dpi}.jpg")
+        if os.path.exists(thumb_path):
+            with PILImage.open(thumb_path) as img: return thumb_path, img.width, img.height
+        max_px = (round(self.size[0] / 72 * self.dpi), round(self.size[1] / 72 * self.dpi))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with PILImage.open(path) as img:
+            img.draft('RGB', max_px)  # JPEG direct op lagere resolutie decoderen
+            img = img.convert('RGB'); img.thumbnail(max_px, PILImage.LANCZOS)
+            with self._atomic_write(thumb_path, '.jpg') as f: img.save(f, 'JPEG', quality=85, optimize=True)
+        return thumb_path, img.width, img.height
@@ -0,0 +1,29 @@
+# import_catalogue.py
+# Importeert de wekelijkse prijslijst van de leverancier (CSV of XLSX) in de plantencatalogus.
+# Bestaande planten worden bijgewerkt, nieuwe toegevoegd; afbeeldingsgegevens blijven behouden.
+#
+# Gebruik: python import_catalogue.py prijslijst.csv [--db planten.db] [--rejects afgewezen.csv]
+import argparse
+import csv
+import sqlite3
+import time
+
+from create_database import apply_migrations
+from database.importer import import_catalogue
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Importeer een prijslijst in de plantencatalogus.")
+    parser.add_argument('path'); parser.add_argument('--db', default='planten.db')
+    parser.add_argument('--rejects', help="schrijf afgewezen rijen met reden naar dit CSV-bestand")
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+    try:
+        conn = sqlite3.connect(args.db); apply_migrations(conn)
+        start = time.perf_counter()
+        imported, rejects = import_catalogue(conn, args.path, batch_size=args.batch_size, rejects_path=args.rejects)
+        conn.close()
+        for number, reason in rejects[:20]: print(f"Regel {number} afgewezen: {reason}")
+        if len(rejects) > 20: print(f"... en nog {len(rejects) - 20} afgewezen regels.")
+        print(f"{imported} planten geïmporteerd, {len(rejects)} afgewezen in {time.perf_counter() - start:.2f}s.")
+    except (sqlite3.Error, OSError, RuntimeError, csv.Error) as e:
+        print(f"Fout bij importeren: {e}")
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# Pytest-suite naast de benchmarks; draait vanuit de repository-root met: python -m pytest tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,41 @@
+# tests/test_aggregation.py
+# De lopende totalen moeten na elke wijziging gelijk zijn aan een volledige herberekening.
+import random
+import numpy as np
+from core.aggregation import SpeciesTotals, calculate_species_totals, plant_count
+from core.geometry import PolygonStore
+from core.plan import PlantingPlan
+
+SPECIES = ['Aster "Little Carlow"', 'salvia nemerosa', 'Geranium', '  geranium ', '']
+
+def random_store(rng, n):
+    polygons = [np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]]) for x, y, w, h in rng.uniform(0.5, 20, (n, 4))]
+    return PolygonStore.from_polygons(polygons)
+
+def test_species_totals_match_full_recompute():
+    rng = random.Random(1); areas = np.random.default_rng(1).uniform(0.1, 50, 40); totals = SpeciesTotals(); beds = {}
+    for _ in range(2000):
+        index = rng.randrange(len(areas))
+        if rng.random() < 0.25: totals.remove_bed(index); beds.pop(index, None)
+        else:
+            species, density = rng.choice(SPECIES), rng.choice([1, 5, 7.5, 9])
+            totals.set_bed(index, species, plant_count(areas[index], density)); beds[index] = (index, species, density)
+        assert totals.totals == dict(calculate_species_totals(areas, beds.values()))
+
+def test_planting_plan_totals_match_full_recompute():
+    rng = random.Random(2); plan = PlantingPlan(random_store(np.random.default_rng(2), 30))
+    for _ in range(1000):
+        index = rng.randrange(len(plan)); action = rng.random()
+        if action < 0.4: plan.assign(index, rng.choice(SPECIES), rng.choice([3, 7, 11.5]))
+        elif action < 0.6: plan.clear_bed(index)
+        elif action < 0.8: plan.set_density(index, rng.uniform(1, 12))
+        else: plan.assign_many([(i, rng.choice(SPECIES), 7) for i in rng.sample(range(len(plan)), 3)])
+        assert plan.species_totals() == dict(calculate_species_totals(plan.store.areas, plan.assignments()))
+
+def test_changed_labels_are_reported():
+    totals = SpeciesTotals()
+    assert totals.set_bed(0, 'aster', 10) == {'Aster'}
+    assert totals.set_bed(0, 'salvia', 4) == {'Aster', 'Salvia'}
+    assert totals.totals == {'Salvia': 4}
+    assert totals.remove_bed(0) == {'Salvia'} and totals.totals == {}
+    assert totals.remove_bed(0) == set()
@@ -0,0 +1,64 @@
+# tests/test_catalogue.py
+# Gedeelde catalogus: versie, snapshot en detailcache volgen schrijfacties van andere verbindingen en programma's,
+# ook via een lokale replica, en lezers zien tijdens gelijktijdige schrijfacties nooit een halve wijziging.
+import sqlite3
+import threading
+import pytest
+import database.manager
+from create_database import create_database
+from database.manager import DatabaseManager
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / 'planten.db'); create_database(path)
+    return path
+
+def set_all_prices(path, price):
+    conn = sqlite3.connect(path, timeout=5)
+    with conn: conn.execute("UPDATE plants SET price_per_unit = ?", (price,))
+    conn.close()
+
+def first_name(manager):
+    return manager.get_all_plant_names()[0]
+
+def test_snapshot_and_details_follow_writes_by_other_programs(db_file):
+    manager = DatabaseManager(db_file); manager.connect()
+    try:
+        name = first_name(manager); snapshot = manager.get_catalogue_snapshot(); version = manager.catalogue_version()
+        assert manager.get_catalogue_snapshot() is snapshot and manager.get_plant_details(name) is not None
+        set_all_prices(db_file, 9.99)
+        assert manager.catalogue_version() > version
+        fresh = manager.get_catalogue_snapshot()
+        assert fresh is not snapshot and {row['price_per_unit'] for row in fresh.values()} == {9.99}
+        assert manager.get_plant_details(name.upper())['price_per_unit'] == 9.99
+    finally:
+        manager.close(quiet=True)
+
+def test_replica_is_refreshed_when_the_version_changes(db_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(database.manager, 'REPLICA_CHECK_INTERVAL', 0.0)
+    manager = DatabaseManager(db_file, journal_mode=None, replica=str(tmp_path / 'replica.db')); manager.connect()
+    try:
+        name = first_name(manager); assert manager.get_plant_details(name) is not None
+        set_all_prices(db_file, 4.25)
+        assert manager.get_plant_details(name)['price_per_unit'] == 4.25
+    finally:
+        manager.close(quiet=True)
+
+def test_readers_never_see_a_partial_write(db_file):
+    manager = DatabaseManager(db_file, pool_size=4); manager.connect(); stop = threading.Event(); problems = []
+    def read():
+        last = 0
+        while not stop.is_set():
+            snapshot = manager.get_catalogue_snapshot()
+            if len({row['price_per_unit'] for row in snapshot.values()}) != 1 or snapshot.version < last: problems.append(snapshot.version)
+            last = snapshot.version
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    try:
+        set_all_prices(db_file, 1.0)
+        for thread in readers: thread.start()
+        for i in range(40): set_all_prices(db_file, 1.0 + i / 100)
+    finally:
+        stop.set()
+        for thread in readers: thread.join()
+        manager.close(quiet=True)
+    assert problems == []
@@ -0,0 +1,114 @@
+# tests/test_dxf.py
+# Gebogen bedden: bulges, cirkels, ellipsen en arceringen worden afgevlakt binnen de koordetolerantie, met exacte oppervlaktes.
+# Lagen en blokken via tests/fixtures/beds.dxf: bulges, POLYLINE met VERTEX-entiteiten, geschaalde en gedraaide INSERTs, een
+# MINSERT-raster, geneste blokken, laag 0 in blokken en een object in de papierruimte. Alle oppervlaktes zijn exact bekend.
+import math
+import os
+import numpy as np
+import pytest
+import core.dxf
+from core.dxf import _IndexedSource, _open, insert_transforms, load_polygons, scan_layers
+from core.geometry import PolygonStore
+
+ezdxf = pytest.importorskip('ezdxf')
+PI = math.pi
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'beds.dxf')
+PLANTVAK = [12.0, PI]  # laag 0: nemen de laag van de INSERT over
+EXPECTED = {
+    'BEPLANTING': [4 + PI / 2, 9.0] + [4 * a for a in PLANTVAK] + PLANTVAK * 6,
+    'VERHARDING': [25.0, 4.0] + [1.0] * 6,
+    'BOMEN': [2.5 ** 2 * PI] * 2,
+}
+
+def curved_drawing(path):
+    doc = ezdxf.new('R2010'); msp = doc.modelspace()
+    msp.add_lwpolyline([(0, 0, 0), (2, 0, 1), (2, 2, 0), (0, 2, 0)], format='xyb', close=True)  # halve cirkel naar buiten
+    msp.add_polyline2d([(10, 0), (14, 0), (14, 4), (10, 4)], close=True).vertices[3].dxf.bulge = -1  # halve cirkel naar binnen
+    msp.add_circle((20, 0), 2)
+    msp.add_ellipse((30, 0), major_axis=(3, 0), ratio=0.5)
+    msp.add_lwpolyline([(40, 0), (41, 0), (41, 1)])  # open: geen bed
+    hatch = msp.add_hatch(); hatch.paths.add_polyline_path([(50, 0, 0), (52, 0, 1), (52, 2, 0), (50, 2, 0)], is_closed=True)
+    doc.saveas(path)
+    return [4 + PI / 2, 16 - 2 * PI, 4 * PI, PI * 3 * 1.5, 4 + PI / 2]
+
+@pytest.mark.parametrize('tolerance', [0.001, 0.01, 0.1])
+def test_curved_beds_have_exact_areas_and_bounded_chords(tmp_path, tolerance):
+    path = str(tmp_path / 'bogen.dxf'); expected = curved_drawing(path)
+    store = PolygonStore.from_polygons(*load_polygons(path, tolerance=tolerance))
+    assert store.areas == pytest.approx(expected, rel=1e-9)
+    ring = store.polygon(0); arc = ring[ring[:, 0] > 2 + 1e-9]  # punten op de halve cirkel rond (2, 1) met straal 1
+    assert len(arc) > 2 and np.allclose(np.hypot(arc[:, 0] - 2, arc[:, 1] - 1), 1.0)
+    chords = np.vstack([[2, 0], arc, [2, 2]]); middle = (chords[1:] + chords[:-1]) / 2
+    assert np.all(1.0 - np.hypot(middle[:, 0] - 2, middle[:, 1] - 1) <= tolerance * (1 + 1e-9))
+    assert store.bboxes[0] == pytest.approx([0, 0, 3, 2]) and store.bboxes[1] == pytest.approx([10, 0, 14, 4])
+    circle = store.polygon(2); assert np.allclose(np.hypot(circle[:, 0] - 20, circle[:, 1]), 2.0)
+
+def load_store(path=FIXTURE, layers=None):
+    return PolygonStore.from_polygons(*load_polygons(path, layers=layers))
+
+def test_scan_layers_counts_modelspace_objects():
+    assert scan_layers(FIXTURE) == {'BEPLANTING': 5, 'BOMEN': 1, 'VERHARDING': 1}
+
+@pytest.mark.parametrize('layer', sorted(EXPECTED))
+def test_layer_selection_areas(layer):
+    store = load_store(layers=[layer.lower()])
+    assert sorted(store.areas) == pytest.approx(sorted(EXPECTED[layer]), rel=1e-9)
+
+def test_all_layers_keeps_loose_beds_first():
+    store = load_store()
+    assert len(store) == sum(len(areas) for areas in EXPECTED.values())
+    assert store.areas[:3] == pytest.approx([4 + PI / 2, 9.0, 25.0])
+    assert sorted(store.areas) == pytest.approx(sorted(a for areas in EXPECTED.values() for a in areas), rel=1e-9)
+
+def test_bulge_is_flattened_within_tolerance():
+    store = load_store(layers=['BEPLANTING']); ring = store.polygon(0)
+    arc = ring[ring[:, 0] > 2 + 1e-9]  # punten op de halve cirkel rond (2, 1) met straal 1
+    assert len(arc) > 4 and np.allclose(np.hypot(arc[:, 0] - 2, arc[:, 1] - 1), 1.0)
+    assert store.bboxes[0] == pytest.approx([0, 0, 3, 2])
+
+def test_insert_placement():
+    store = load_store(layers=['BEPLANTING'])
+    # INSERT op (100, 0), basispunt (2, 2), schaal 2, 30°: hoek (0, 0) van de rechthoek ligt op (100, 0) + R·2·(-2, -2).
+    c, s = math.cos(math.radians(30)), math.sin(math.radians(30))
+    corner = np.array([100 + 2 * (-2 * c + 2 * s), 2 * (-2 * s - 2 * c)])
+    assert np.min(np.hypot(*(store.polygon(2) - corner).T)) < 1e-9
+    # MINSERT 2 × 3 op (200, 0) met 30 × 5: de rechthoeken liggen op een raster.
+    rectangles = [i for i in range(4, len(store)) if store.areas[i] == pytest.approx(12.0)]
+    corners = sorted(tuple(np.round(store.bboxes[i, :2], 9)) for i in rectangles)
+    assert corners == [(198.0 + 30 * col, -2.0 + 5 * row) for col in range(2) for row in range(3)]
+
+def test_insert_transforms_expand_minsert_grid():
+    A, t, owner = insert_transforms((1, 1), [(10, 0)], [2], [3], [90], columns=[2], rows=[2], column_spacing=[5], row_spacing=[7])
+    assert owner.tolist() == [0, 0, 0, 0] and np.allclose(np.abs(np.linalg.det(A)), 6)
+    points = np.einsum('kij,j->ki', A, [1, 1]) + t  # basispunt komt op het invoegpunt plus de (gedraaide) rasterverschuiving
+    assert np.allclose(points, [[10, 0], [10, 5], [3, 0], [3, 5]])
+
+def load_both(path, monkeypatch, layers=None):
+    """Bedden via de tekstindex en via het publieke ezdxf.readfile (de terugvaloptie voor niet-geteste versies)."""
+    indexed = load_polygons(path, layers=layers)
+    with monkeypatch.context() as patch:
+        patch.setattr(core.dxf, 'INDEXED_EZDXF_VERSIONS', set()); document = load_polygons(path, layers=layers)
+    return indexed, document
+
+def assert_same_beds(indexed, document):
+    assert len(indexed[0]) == len(document[0]) and indexed[1] == pytest.approx(document[1], rel=1e-12)
+    for a, b in zip(indexed[0], document[0]): assert np.allclose(a, b)
+
+def test_installed_ezdxf_uses_the_index():
+    source = _open(FIXTURE)
+    try: assert isinstance(source, _IndexedSource)
+    finally: source.close()
+
+@pytest.mark.parametrize('layers', [None, ['beplanting'], ['bomen']])
+def test_index_matches_readfile(monkeypatch, layers):
+    assert_same_beds(*load_both(FIXTURE, monkeypatch, layers))
+
+def test_index_matches_readfile_with_crlf(tmp_path, monkeypatch):
+    with open(FIXTURE, 'rb') as f: data = f.read().replace(b'\r\n', b'\n').replace(b'\n', b'\r\n')
+    path = tmp_path / 'crlf.dxf'; path.write_bytes(data)
+    indexed, document = load_both(str(path), monkeypatch)
+    assert_same_beds(indexed, document); assert_same_beds(indexed, load_polygons(FIXTURE))
+
+def test_binary_dxf_falls_back_to_readfile(tmp_path):
+    path = str(tmp_path / 'binary.dxf'); ezdxf.readfile(FIXTURE).saveas(path, fmt='bin')
+    assert_same_beds(load_polygons(path), load_polygons(FIXTURE))
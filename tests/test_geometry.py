@@ -0,0 +1,61 @@
+# tests/test_geometry.py
+# PolygonStore.hit_test en GridIndex tegen de oorspronkelijke ray cast en een brute-force bbox-test.
+import numpy as np
+from core.geometry import PolygonStore, calculate_polygon_area, is_point_in_polygon
+from core.spatial import GridIndex
+
+def random_polygons(rng, n, extent=100.0):
+    """Sterpolygonen (ook concaaf, beide draairichtingen) en een paar geneste vierkanten."""
+    polygons = []
+    for _ in range(n):
+        k = rng.integers(3, 12); angles = np.sort(rng.uniform(0, 2 * np.pi, k)); radii = rng.uniform(0.5, 6, k)
+        ring = rng.uniform(0, extent, 2) + np.column_stack([np.cos(angles), np.sin(angles)]) * radii[:, None]
+        polygons.append(ring[::-1] if rng.random() < 0.5 else ring)
+    for size in (20.0, 10.0, 5.0): polygons.append(np.array([[50 - size, 50 - size], [50 + size, 50 - size], [50 + size, 50 + size], [50 - size, 50 + size]]))
+    return polygons
+
+def reference_hit(polygons, x, y):
+    inside = [i for i, p in enumerate(polygons) if is_point_in_polygon((x, y), p.tolist())]
+    return min(inside, key=lambda i: calculate_polygon_area(polygons[i])) if inside else -1
+
+def test_hit_test_matches_ray_cast():
+    rng = np.random.default_rng(3); polygons = random_polygons(rng, 300); store = PolygonStore.from_polygons(polygons)
+    for x, y in rng.uniform(-5, 105, (2000, 2)):
+        assert store.hit_test(x, y) == reference_hit(polygons, x, y)
+
+def test_hit_test_picks_smallest_nested_bed():
+    rng = np.random.default_rng(4); polygons = random_polygons(rng, 0); store = PolygonStore.from_polygons(polygons)
+    assert store.hit_test(50, 50) == 2 and store.hit_test(50, 41) == 1 and store.hit_test(50, 31) == 0 and store.hit_test(0, 0) == -1
+
+def test_store_properties_match_single_polygon_functions():
+    rng = np.random.default_rng(5); polygons = random_polygons(rng, 200); store = PolygonStore.from_polygons(polygons)
+    assert np.allclose(store.areas, [calculate_polygon_area(p) for p in polygons])
+    assert np.allclose(store.bboxes, [[*p.min(axis=0), *p.max(axis=0)] for p in polygons])
+    assert all(np.array_equal(store.polygon(i), p) for i, p in enumerate(polygons))
+
+def random_bboxes(rng):
+    xy = rng.uniform(0, 1000, (2000, 2)); wh = rng.exponential(8, (2000, 2))
+    return np.column_stack([xy, xy + wh])
+
+def test_grid_index_point_query_matches_brute_force():
+    rng = np.random.default_rng(6); bboxes = random_bboxes(rng); index = GridIndex(bboxes)
+    for x, y in rng.uniform(-10, 1010, (500, 2)):
+        expected = np.flatnonzero((bboxes[:, 0] <= x) & (x <= bboxes[:, 2]) & (bboxes[:, 1] <= y) & (y <= bboxes[:, 3]))
+        assert np.array_equal(np.sort(index.query_point(x, y)), expected)
+
+def test_grid_index_empty_and_degenerate():
+    assert len(GridIndex(np.empty((0, 4))).query_point(0, 0)) == 0
+    index = GridIndex([[1, 1, 1, 1], [1, 1, 1, 1]])
+    assert index.query_point(1, 1).tolist() == [0, 1] and len(index.query_point(2, 1)) == 0
+
+def test_small_beds_at_rd_coordinates_keep_area_and_centroid():
+    square = np.array([[0, 0], [0.2, 0], [0.2, 0.2], [0, 0.2]]) + (155000.0, 463000.0)
+    store = PolygonStore.from_polygons([square, square[::-1]])
+    assert np.allclose(store.areas, 0.04, rtol=1e-9) and np.allclose(store.centroids, [155000.1, 463000.1], atol=1e-9, rtol=0)
+
+def test_grid_index_bbox_query_matches_brute_force():
+    rng = np.random.default_rng(7); bboxes = random_bboxes(rng); index = GridIndex(bboxes)
+    for x, y, w, h in np.column_stack([rng.uniform(-50, 1000, (300, 2)), rng.exponential(40, (300, 2))]):
+        box = (x, y, x + w, y + h)
+        expected = np.flatnonzero((bboxes[:, 0] <= box[2]) & (box[0] <= bboxes[:, 2]) & (bboxes[:, 1] <= box[3]) & (box[1] <= bboxes[:, 3]))
+        assert np.array_equal(index.query_bbox(box), expected)
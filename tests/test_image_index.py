@@ -0,0 +1,45 @@
+# tests/test_image_index.py
+import os
+import sqlite3
+import subprocess
+import sys
+import pytest
+from update_database_images import candidate_keys, update_images
+
+def catalogue(names):
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE plants (id INTEGER PRIMARY KEY, name TEXT, image_path TEXT, image_width INTEGER, image_height INTEGER, image_hash TEXT)")
+    conn.executemany("INSERT INTO plants (name) VALUES (?)", [(name,) for name in names])
+    return conn
+
+def test_candidate_keys_never_match_on_genus_alone():
+    assert candidate_keys('Geranium x oxonianum "Rose Clair"') == ['geranium oxonianum rose clair', 'geranium rose clair', 'rose clair', 'geranium oxonianum']
+    assert 'geranium' not in candidate_keys('Geranium "Rozanne"')
+
+def test_genus_only_matches_are_reported_not_linked(tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    for filename in ('Geranium.jpg', 'geranium_rozanne.jpg'): Image.new('RGB', (40, 30)).save(tmp_path / filename)
+    conn = catalogue(['Geranium "Rozanne"', 'Geranium x oxonianum "Rose Clair"', 'Geranium macrorrhizum'])
+    matched, cleared, found, genus_only = update_images(conn, str(tmp_path))
+    paths = dict(conn.execute("SELECT name, image_path FROM plants"))
+    assert (matched, found) == (1, 2) and paths['Geranium "Rozanne"'].endswith('geranium_rozanne.jpg')
+    assert paths['Geranium macrorrhizum'] is None and [name for name, _ in genus_only] == ['Geranium x oxonianum "Rose Clair"', 'Geranium macrorrhizum']
+    matched, *_ = update_images(conn, str(tmp_path), genus_fallback=True)
+    assert matched == 3
+
+def test_unreadable_images_are_skipped(tmp_path, capsys):
+    Image = pytest.importorskip('PIL.Image')
+    Image.new('RGB', (40, 30)).save(tmp_path / 'salvia_nemorosa.jpg'); Image.new('RGB', (40, 30)).save(tmp_path / 'iris.png')
+    (tmp_path / 'aster_frikartii.jpg').write_bytes(b'geen jpeg')
+    (tmp_path / 'iris.png').write_bytes((tmp_path / 'iris.png').read_bytes()[:20])  # afgebroken midden in de header
+    conn = catalogue(['Salvia nemorosa', 'Aster frikartii', 'Iris'])
+    conn.execute("UPDATE plants SET image_path = 'oud.jpg' WHERE name = 'Iris'")
+    matched, _, found, _ = update_images(conn, str(tmp_path))
+    paths = dict(conn.execute("SELECT name, image_path FROM plants"))
+    assert (matched, found) == (1, 3) and paths['Salvia nemorosa'].endswith('salvia_nemorosa.jpg')
+    assert paths['Aster frikartii'] is None and paths['Iris'] == 'oud.jpg'
+    assert capsys.readouterr().out.count('onleesbaar') == 2
+
+def test_script_does_not_need_reportlab():
+    code = "import sys; sys.modules['reportlab'] = None; import update_database_images"
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,46 @@
+# tests/test_importer.py
+import sqlite3
+import pytest
+from create_database import MIGRATIONS, apply_migrations, create_database
+from database.importer import import_catalogue, validate_row
+
+HEADER = 'naam;kwaliteit;prijs;planten_per_m2;bloei_start;bloei_eind;structuur_start;structuur_eind\n'
+
+@pytest.fixture
+def conn(tmp_path):
+    db_file = str(tmp_path / 'planten.db'); create_database(db_file); conn = sqlite3.connect(db_file)
+    yield conn
+    conn.close()
+
+def test_reimport_with_other_case_updates_existing_plant(conn, tmp_path):
+    price_list = tmp_path / 'prijslijst.csv'
+    price_list.write_text(HEADER + 'aster "little carlow";P11;4,10;9;8;10;0;0\n', encoding='utf-8')
+    assert import_catalogue(conn, str(price_list)) == (1, [])
+    rows = conn.execute("SELECT name, quality, price_per_unit, plants_per_m2 FROM plants WHERE name LIKE 'aster%'").fetchall()
+    assert rows == [('Aster "Little Carlow"', 'P11', 4.10, 9)]
+
+def test_fractional_integers_are_rejected():
+    row = {'name': 'Salvia', 'price_per_unit': '3,50', 'plants_per_m2': '7.5'}
+    with pytest.raises(ValueError, match='geen geheel getal'): validate_row(row)
+    with pytest.raises(ValueError, match='geen geheel getal'): validate_row({**row, 'plants_per_m2': '7', 'flower_start_month': '3.9', 'flower_end_month': '5'})
+    assert validate_row({**row, 'plants_per_m2': '7.0'})[3] == 7
+
+def test_migration_merges_case_duplicates(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'oud.db'))
+    conn.execute("CREATE TABLE plants (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, quality TEXT, price_per_unit REAL, "
+                 "plants_per_m2 INTEGER, flower_start_month INTEGER, flower_end_month INTEGER, structure_start_month INTEGER, "
+                 "structure_end_month INTEGER, image_path TEXT)")
+    conn.execute("PRAGMA user_version = 6")
+    conn.executemany("INSERT INTO plants (name, price_per_unit, image_path) VALUES (?, ?, ?)",
+                     [('Aster "Little Carlow"', 3.5, 'aster.jpg'), ('aster "little carlow"', 4.1, None), ('Salvia', 2.0, None)])
+    apply_migrations(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    assert conn.execute("SELECT name, price_per_unit, image_path FROM plants ORDER BY id").fetchall() == \
+        [('Aster "Little Carlow"', 4.1, 'aster.jpg'), ('Salvia', 2.0, None)]
+    with pytest.raises(sqlite3.IntegrityError): conn.execute("INSERT INTO plants (name) VALUES ('SALVIA')")
+
+def test_single_column_file_is_imported(conn, tmp_path):
+    price_list = tmp_path / 'namen.csv'
+    price_list.write_text('naam\nSalvia nemorosa\nGeranium Rozanne\n', encoding='utf-8')
+    assert import_catalogue(conn, str(price_list)) == (2, [])
+    assert conn.execute("SELECT COUNT(*) FROM plants WHERE name IN ('Salvia nemorosa', 'Geranium Rozanne')").fetchone()[0] == 2
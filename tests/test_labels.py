@@ -0,0 +1,49 @@
+# tests/test_labels.py
+# Labelplaatsing op de plantekening: LabelGrid tegen een brute-force overlaptest en place_labels op een druk plan,
+# zowel op het overzichtsblad als op een ingezoomd blad waar bedden over de rand van het tekenvlak lopen.
+import numpy as np
+import pytest
+from core.geometry import PolygonStore
+from core.plan import PlantingPlan
+from exporting.plan_export import (LABEL_FONT, LABEL_LINE, LABEL_SIZE, LabelGrid, _transform, fit_scale, place_labels,
+                                   plan_frame, points_per_meter, world_bbox)
+
+pytest.importorskip('reportlab')
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+def overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def busy_plan(rng, n=600):
+    """Overlappende rechthoekige bedden van 2 tot 40 m op RD-coördinaten met lange en korte soortnamen."""
+    xy = rng.uniform(0, 400, (n, 2)) + (155000, 463000); wh = rng.uniform(2, 40, (n, 2))
+    plan = PlantingPlan(PolygonStore.from_polygons([np.array([p, p + (w[0], 0), p + w, p + (0, w[1])]) for p, w in zip(xy, wh)]))
+    names = ['Geranium', 'Salvia nemorosa "Caradonna"', 'Calamagrostis x acutiflora "Karl Foerster"', 'Iris']
+    plan.assign_many((i, names[i % len(names)], 7) for i in range(n) if i % 5)  # elk vijfde bed blijft leeg
+    return plan
+
+def label_boxes(labels):
+    boxes = []
+    for x, y, lines in labels:
+        width = max(stringWidth(line, LABEL_FONT, LABEL_SIZE) for line in lines) + 2
+        boxes.append((x - width / 2, y - LABEL_LINE, x + width / 2, y + LABEL_LINE))
+    return boxes
+
+def test_label_grid_matches_brute_force():
+    rng = np.random.default_rng(31); grid = LabelGrid(20.0); placed = []
+    for x, y, w, h in zip(*rng.uniform(-200, 200, (2, 3000)), *rng.uniform(1, 60, (2, 3000))):
+        box = (x, y, x + w, y + h); expected = not any(overlaps(box, other) for other in placed)
+        assert grid.fits(box) == expected
+        if expected: grid.add(box); placed.append(box)
+    assert len(placed) > 50
+
+@pytest.mark.parametrize('zoom', [1, 8])
+def test_labels_do_not_overlap_and_stay_in_the_frame(zoom):
+    rng = np.random.default_rng(32); plan = busy_plan(rng); frame = plan_frame(); bbox = world_bbox(plan.store)
+    scale = fit_scale(bbox, frame) / zoom; origin = (bbox[:2] + bbox[2:]) / 2 - (frame[2:] - frame[:2]) / 2 / points_per_meter(scale)
+    beds = np.arange(len(plan.store)); labels = place_labels(plan, beds, _transform(origin, scale, frame), frame)
+    boxes = label_boxes(labels)
+    assert len(labels) > 10
+    for i, box in enumerate(boxes):
+        assert frame[0] <= box[0] and frame[1] <= box[1] and box[2] <= frame[2] and box[3] <= frame[3]
+        assert not any(overlaps(box, other) for other in boxes[i + 1:])
@@ -0,0 +1,51 @@
+# tests/test_order_list.py
+# Bestellijst: regelbedragen in Decimal. De prijs per stuk wordt eerst op hele centen afgerond (zoals hij op de lijst
+# staat) en daarna met het aantal vermenigvuldigd, zodat aantal × getoonde prijs altijd het getoonde regelbedrag is.
+# Daarnaast de paginering: paginagrenzen, subtotalen per pagina en een eindtotaal dat gelijk is aan hun som.
+from decimal import Decimal
+import pytest
+
+pytest.importorskip('reportlab')
+from exporting.pdf_generator import ORDER_ROWS_PER_PAGE, generate_order_list_pdf, money, order_lines, order_pages
+
+def test_money_rounds_half_up_without_float_noise():
+    assert money(2.675) == Decimal('2.68') and money(0.125) == Decimal('0.13') and money(1.005) == Decimal('1.01')
+    assert money(None) == Decimal('0.00') and money('3.5') == Decimal('3.50')
+
+def test_unit_price_is_rounded_before_multiplying():
+    [(row, amount)] = order_lines({'Aster': 3}, {'aster': {'quality': 'P9', 'price_per_unit': 0.125}})
+    assert row[3:] == ['€ 0.13', '€ 0.39'] and amount == Decimal('0.39')  # 3 × 0,125 zou 0,38 geven
+    [(_, amount)] = order_lines({'Aster': 1001}, {'aster': {'quality': 'P9', 'price_per_unit': 3.335}})
+    assert amount == Decimal('3343.34')  # 1001 × 3,34
+
+def test_order_lines_sorted_with_missing_details():
+    totals = {'salvia nemerosa': 1001, 'Aster "little carlow"': 3, 'Onbekend': 5}
+    details = {'aster "little carlow"': {'quality': 'P9', 'price_per_unit': 3.335}, 'salvia nemerosa': {'quality': 'P11', 'price_per_unit': 0.1}}
+    lines = list(order_lines(totals, details))
+    assert [row[:3] for row, _ in lines] == [['Aster "little carlow"', 'P9', '3'], ['Onbekend', 'N/A', '5'], ['Salvia nemerosa', 'P11', '1001']]
+    assert [amount for _, amount in lines] == [Decimal('10.02'), Decimal('0.00'), Decimal('100.10')]
+
+def order(n):
+    totals = {f"soort {i:04d}": i % 7 + 1 for i in range(n)}
+    details = {name: {'quality': 'P9', 'price_per_unit': 0.125 + i * 0.01} for i, name in enumerate(totals)}
+    return totals, details
+
+def test_pages_break_at_rows_per_page_with_subtotals():
+    lines = list(order_lines(*order(2 * ORDER_ROWS_PER_PAGE + 5)))
+    pages = list(order_pages(iter(lines), ORDER_ROWS_PER_PAGE))
+    assert [len(rows) for rows, _ in pages] == [ORDER_ROWS_PER_PAGE, ORDER_ROWS_PER_PAGE, 5]
+    assert [row for rows, _ in pages for row in rows] == [row for row, _ in lines]
+    for page, (rows, subtotal) in enumerate(pages):
+        first = page * ORDER_ROWS_PER_PAGE
+        assert subtotal == sum(amount for _, amount in lines[first:first + len(rows)])
+    assert sum(subtotal for _, subtotal in pages) == sum(amount for _, amount in lines)
+
+def test_full_last_page_and_empty_list():
+    lines = list(order_lines(*order(2 * ORDER_ROWS_PER_PAGE)))
+    assert [len(rows) for rows, _ in order_pages(lines, ORDER_ROWS_PER_PAGE)] == [ORDER_ROWS_PER_PAGE] * 2  # geen lege derde pagina
+    assert list(order_pages([], ORDER_ROWS_PER_PAGE)) == [([], Decimal('0.00'))]
+
+def test_pdf_has_one_page_per_block_of_rows(tmp_path):
+    for n, expected in ((1, 1), (ORDER_ROWS_PER_PAGE + 1, 2), (2 * ORDER_ROWS_PER_PAGE + 5, 3)):
+        path = tmp_path / f"bestellijst_{n}.pdf"; generate_order_list_pdf(str(path), *order(n))
+        assert path.read_bytes().count(b'/Type /Page\n') == expected
@@ -0,0 +1,44 @@
+# tests/test_overlap.py
+# Exacte overlapoppervlaktes tegen rechthoeken en L-vormen, waarvan de doorsnede analytisch bekend is.
+import numpy as np
+from core.geometry import PolygonStore
+from core.overlap import candidate_pairs, find_overlaps, overlap_areas
+
+def rectangle(x0, y0, x1, y1, clockwise=False):
+    ring = np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=np.float64)
+    return ring[::-1] if clockwise else ring
+
+def l_shape(x, y, size):
+    """L-vorm (concaaf) als ring plus de twee disjuncte rechthoeken waaruit hij bestaat."""
+    ring = np.array([[x, y], [x + 2 * size, y], [x + 2 * size, y + size], [x + size, y + size], [x + size, y + 2 * size], [x, y + 2 * size]])
+    return ring, [(x, y, x + 2 * size, y + size), (x, y + size, x + size, y + 2 * size)]
+
+def rect_overlap(a, b):
+    return max(min(a[2], b[2]) - max(a[0], b[0]), 0) * max(min(a[3], b[3]) - max(a[1], b[1]), 0)
+
+def test_overlap_areas_match_analytic_intersections():
+    rng = np.random.default_rng(7); polygons, pieces = [], []
+    for i in range(150):
+        x, y = rng.uniform(0, 60, 2); size = rng.uniform(1, 8)
+        if i % 2:
+            ring, parts = l_shape(x, y, size)
+        else:
+            w, h = rng.uniform(1, 12, 2); parts = [(x, y, x + w, y + h)]; ring = rectangle(*parts[0], clockwise=rng.random() < 0.5)
+        polygons.append(ring + 155000.0); pieces.append([tuple(np.add(p, 155000.0)) for p in parts])  # RD-achtige coördinaten
+    store = PolygonStore.from_polygons(polygons); pairs = candidate_pairs(store.bboxes)
+    expected = [sum(rect_overlap(a, b) for a in pieces[i] for b in pieces[j]) for i, j in pairs.tolist()]
+    assert np.allclose(overlap_areas(store, pairs), expected, atol=1e-6)
+
+def test_candidate_pairs_match_brute_force():
+    rng = np.random.default_rng(8); xy = rng.uniform(0, 100, (400, 2)); bboxes = np.column_stack([xy, xy + rng.uniform(0, 6, (400, 2))])
+    expected = {(i, j) for i in range(400) for j in range(i + 1, 400)
+                if bboxes[i, 0] <= bboxes[j, 2] and bboxes[j, 0] <= bboxes[i, 2] and bboxes[i, 1] <= bboxes[j, 3] and bboxes[j, 1] <= bboxes[i, 3]}
+    assert set(map(tuple, candidate_pairs(bboxes).tolist())) == expected
+
+def test_duplicates_and_touching_beds():
+    store = PolygonStore.from_polygons([rectangle(0, 0, 4, 4), rectangle(0, 0, 4, 4, clockwise=True), rectangle(4, 0, 8, 4), rectangle(2, 2, 6, 6)])
+    report = find_overlaps(store)
+    rows = {(a, b): (round(area, 9), duplicate) for a, b, area, duplicate in report.rows()}
+    assert rows == {(0, 1): (16.0, True), (0, 3): (4.0, False), (1, 3): (4.0, False), (2, 3): (4.0, False)}
+    net = report.net_areas(store.areas, ['aster', 'aster', 'aster', 'salvia'], np.ones(4, dtype=bool))
+    assert np.allclose(net, [16, 0, 16, 16])
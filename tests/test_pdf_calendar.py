@@ -0,0 +1,59 @@
+# tests/test_pdf_calendar.py
+# Bloeikalender: maandmatrix (ook over de jaarwisseling) en de samengevoegde achtergrondblokken tegen een controle per cel.
+import numpy as np
+import pytest
+
+pytest.importorskip('reportlab')
+from exporting.pdf_generator import flowering_matrix, merged_spans, month_mask
+
+def reference_months(start, end):
+    """Maanden 1-12 van een periode zoals de oude kalender ze per cel vulde, plus doorlopen over de jaarwisseling."""
+    if not start or not end: return set()
+    return set(range(start, end + 1)) if start <= end else set(range(start, 13)) | set(range(1, end + 1))
+
+def plant(flower=(None, None), structure=(None, None)):
+    return {'flower_start_month': flower[0], 'flower_end_month': flower[1], 'structure_start_month': structure[0], 'structure_end_month': structure[1]}
+
+def test_month_mask_matches_per_cell_reference():
+    pairs = [(s, e) for s in [None, 0, *range(1, 13)] for e in [None, 0, *range(1, 13)]]
+    mask = month_mask([s for s, _ in pairs], [e for _, e in pairs])
+    for (start, end), row in zip(pairs, mask):
+        assert set(np.flatnonzero(row) + 1) == reference_months(start, end)
+
+def test_season_over_new_year():
+    assert np.flatnonzero(month_mask([11], [2])[0]).tolist() == [0, 1, 10, 11]
+    assert month_mask([5], [5])[0].sum() == 1 and month_mask([5], [None])[0].sum() == 0
+
+def test_flowering_takes_precedence_over_structure():
+    state = flowering_matrix([plant(flower=(6, 8), structure=(4, 10)), plant(structure=(11, 2)), plant()])
+    assert state[0].tolist() == [0, 0, 0, 1, 1, 2, 2, 2, 1, 1, 0, 0]
+    assert state[1].tolist() == [1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1] and not state[2].any()
+
+def covered(spans, shape):
+    """Status per cel volgens de blokken; een cel die in twee blokken valt telt als fout."""
+    cells = np.zeros(shape, dtype=np.int64); hits = np.zeros(shape, dtype=np.int64)
+    for row0, col0, row1, col1, state in spans:
+        assert row0 <= row1 and col0 <= col1 and state > 0
+        cells[row0:row1 + 1, col0:col1 + 1] = state; hits[row0:row1 + 1, col0:col1 + 1] += 1
+    assert hits.max(initial=0) <= 1
+    return cells
+
+def test_merged_spans_cover_every_cell_exactly_once():
+    rng = np.random.default_rng(15); starts = rng.integers(0, 13, (2, 400)); ends = rng.integers(0, 13, (2, 400))
+    plants = [plant((fs, fe), (ss, se)) for fs, fe, ss, se in zip(starts[0], ends[0], starts[1], ends[1])]
+    plants += [plant((4, 6), (3, 9))] * 5  # identieke rijen worden verticaal samengevoegd
+    state = flowering_matrix(plants); spans = merged_spans(state)
+    assert np.array_equal(covered(spans, state.shape), state)
+    runs = sum(int(((np.diff(np.pad(row, 1)) != 0) & (np.pad(row, 1)[1:] > 0)).sum()) for row in state)
+    assert len(spans) < runs  # minder blokken dan horizontale runs per rij
+
+def test_merged_spans_join_adjacent_rows():
+    state = flowering_matrix([plant((4, 6), (3, 9))] * 3 + [plant((4, 6))])
+    assert sorted(merged_spans(state)) == [(0, 2, 2, 2, 1), (0, 3, 3, 5, 2), (0, 6, 2, 8, 1)]
+    assert merged_spans(np.zeros((0, 12), dtype=np.int64)) == []
+
+def test_malformed_months_count_as_unset():
+    mask = month_mask(['abc', '3', 3.0, 13, -2, '3.5', ' 11 ', '', 'nan'], [5, ' 5', '5', 5, 5, 5, '2', 5, 5])
+    assert [np.flatnonzero(row).tolist() for row in mask] == \
+        [[], [2, 3, 4], [2, 3, 4], [], [], [], [0, 1, 10, 11], [], []]
+    assert not flowering_matrix([plant(flower=('mei', 'juni'), structure=(4, 99))]).any()
@@ -0,0 +1,55 @@
+# tests/test_placement.py
+# place_plants tegen een eenvoudige controle per punt: ray cast voor "binnen het bed" en de afstand tot elke rand.
+import numpy as np
+import pytest
+from core.geometry import PolygonStore, is_point_in_polygon
+from core.placement import hex_spacing, place_plants, plant_counts
+
+def random_beds(rng, n):
+    """Concave sterbedden van 1 tot 15 m in beide draairichtingen, op RD-achtige coördinaten, plus een paar kleine bedden."""
+    polygons = []
+    for _ in range(n):
+        k = rng.integers(3, 12); angles = np.sort(rng.uniform(0, 2 * np.pi, k)); radii = rng.uniform(1, 15, k)
+        ring = rng.uniform(0, 500, 2) + (155000, 463000) + np.column_stack([np.cos(angles), np.sin(angles)]) * radii[:, None]
+        polygons.append(ring[::-1] if rng.random() < 0.5 else ring)
+    polygons += [np.array([[0, 0], [0.2, 0], [0.2, 0.2], [0, 0.2]]) + (155000 + 10 * i, 462000) for i in range(3)]
+    return polygons
+
+def edge_distance(point, ring):
+    a = ring; d = np.roll(ring, -1, axis=0) - a; length2 = np.einsum('ij,ij->i', d, d)
+    t = np.clip(np.einsum('ij,ij->i', point - a, d) / length2, 0.0, 1.0)
+    return np.min(np.hypot(*(point - a - t[:, None] * d).T))
+
+@pytest.mark.parametrize('edge_margin', [0.0, 0.5])
+def test_points_lie_inside_their_bed_and_respect_the_margin(edge_margin):
+    rng = np.random.default_rng(11); store = PolygonStore.from_polygons(random_beds(rng, 150))
+    beds = np.arange(len(store)); densities = rng.choice([1.0, 4.0, 7.0, 12.0], len(store))
+    points, owner = place_plants(store, beds, densities, edge_margin)
+    assert np.all(np.diff(owner) >= 0) and set(owner.tolist()) == set(beds.tolist())
+    counts = np.bincount(owner, minlength=len(store))
+    for point, bed in zip(points, owner):
+        ring = store.polygon(bed)
+        assert is_point_in_polygon(tuple(point), ring.tolist())
+        if counts[bed] > 1 or not np.allclose(point, store.centroids[bed]):  # zwaartepunt van een te klein bed: geen randafstand
+            assert edge_distance(point, ring) >= edge_margin * hex_spacing(densities[bed]) * (1 - 1e-9)
+
+def test_points_keep_the_plant_spacing():
+    rng = np.random.default_rng(12); store = PolygonStore.from_polygons(random_beds(rng, 40)); density = 7.0
+    points, owner = place_plants(store, np.arange(len(store)), density)
+    for bed in np.unique(owner):
+        p = points[owner == bed]
+        if len(p) < 2: continue
+        gaps = np.hypot(*(p[:, None] - p[None]).transpose(2, 0, 1)) + np.eye(len(p)) * 1e9
+        assert gaps.min() >= hex_spacing(density) * (1 - 1e-9)
+
+def test_small_beds_get_one_plant_and_zero_density_none():
+    rng = np.random.default_rng(13); polygons = random_beds(rng, 5); store = PolygonStore.from_polygons(polygons)
+    small = np.arange(len(store) - 3, len(store)); densities = np.array([7.0, 0.0, 7.0])
+    points, owner = place_plants(store, small, densities)
+    assert owner.tolist() == [small[0], small[2]] and np.allclose(points, store.centroids[[small[0], small[2]]])
+    assert plant_counts(store, small, densities).tolist() == [1, 0, 1]
+
+def test_large_rectangle_count_matches_density():
+    store = PolygonStore.from_polygons([np.array([[0, 0], [100, 0], [100, 50], [0, 50]], dtype=float)])
+    points, _ = place_plants(store, [0], 7.0, edge_margin=0.0)
+    assert len(points) == pytest.approx(100 * 50 * 7.0, rel=0.02)
@@ -0,0 +1,59 @@
+# tests/test_pricing.py
+# Scenario-engine (gehele centen, gevectoriseerd) tegen de bestellijst in Decimal, bed voor bed.
+from decimal import Decimal
+import numpy as np
+import pytest
+from core.aggregation import calculate_species_totals
+from core.pricing import Scenario, ScenarioEngine, cents, money, vat
+
+pytest.importorskip('reportlab')
+from exporting.pdf_generator import order_lines
+
+def test_cents_and_vat_use_the_order_list_rounding():
+    assert cents(0.285) == 29 and cents(2.675) == 268 and money(2.675) == Decimal('2.68')
+    assert vat(Decimal('10.50')) == Decimal('0.95') and vat(Decimal('0.05')) == Decimal('0.00')
+
+def random_engine_input(rng, n, names):
+    """Bedden met willekeurige oppervlaktes en dichtheden; prijzen op een halve cent om de afronding te toetsen."""
+    areas = rng.uniform(0.05, 80, n); species = rng.choice(names, n).tolist(); densities = rng.choice([0.5, 3, 5, 7, 9, 11.5], n)
+    catalogue = {name: {'name': name, 'quality': 'P9', 'price_per_unit': float(rng.integers(50, 500)) / 100 + 0.005} for name in names[:-2]}
+    return areas, species, densities, catalogue  # de laatste twee soorten staan niet in de catalogus
+
+def decimal_total(areas, species, densities, catalogue, scenario):
+    """Scenario bed voor bed toepassen en de bestellijst prijzen in Decimal, zoals de PDF dat doet."""
+    assignments = []
+    for index, (name, density) in enumerate(zip(species, densities)):
+        name = scenario.replace.get(name.lower(), name.lower()); assignments.append((index, name, scenario.density.get(name, density)))
+    details = dict(catalogue)
+    for name, (quality, price) in scenario.quality.items(): details[name] = dict(details.get(name, {}), quality=quality, price_per_unit=price)
+    lines = list(order_lines(calculate_species_totals(areas, assignments), details))
+    return sum((amount for _, amount in lines), Decimal('0.00')), lines
+
+def test_scenario_totals_equal_decimal_order_lines():
+    rng = np.random.default_rng(21); names = [f"soort {i:02d}" for i in range(30)]
+    areas, species, densities, catalogue = random_engine_input(rng, 3000, names); scenarios = []
+    for k in range(12):
+        picks = rng.choice(names + ['nieuwe soort'], size=6, replace=False).tolist()
+        scenarios.append(Scenario(f"Variant {k}", replace={picks[0]: picks[1]}, density={picks[2]: float(rng.choice([4, 6.5, 13]))},
+                                  quality={picks[3]: ('C2', 3.955), picks[4]: ('P11', 0.285)}))
+    comparison = ScenarioEngine(areas, species, densities, catalogue).compare(scenarios)
+    assert comparison.names[0] == 'Huidig plan' and len(comparison) == len(scenarios) + 1
+    for column, scenario in enumerate([Scenario('Huidig plan')] + scenarios):
+        expected, lines = decimal_total(areas, species, densities, catalogue, scenario)
+        assert comparison.totals()[column] == (expected, vat(expected), expected + vat(expected))
+        line_amounts = sorted(amount for _, amount in lines if amount)
+        assert sorted(cells[column][2] for _, cells in comparison.rows() if cells[column][2]) == line_amounts
+
+def test_scenario_counts_follow_floor_per_bed():
+    areas = [0.7, 1.3, 10 / 3]; catalogue = {'a': {'quality': 'P9', 'price_per_unit': 1.005}}
+    comparison = ScenarioEngine(areas, ['A', 'a', 'A '], [3, 3, 3], catalogue).compare([Scenario('dicht', density={'a': 7})])
+    assert comparison.counts[:, 0].tolist() == [2 + 3 + 10, 4 + 9 + 23]
+    assert [ex for ex, _, _ in comparison.totals()] == [Decimal('15.15'), Decimal('36.36')]
+
+def test_replacing_a_species_outside_the_plan_changes_nothing():
+    catalogue = {'aster': {'quality': 'P9', 'price_per_unit': 2.5}, 'geranium': {'quality': 'P9', 'price_per_unit': 3.0}}
+    comparison = ScenarioEngine([10.0, 5.0], ['aster', 'salvia'], [7, 7], catalogue).compare(
+        [Scenario('a', replace={'geranium': 'aster'}), Scenario('b', replace={'aster': 'geranium', 'lupine': 'salvia'})])
+    assert comparison.totals()[1] == comparison.totals()[0]
+    counts = dict(zip(comparison.species, comparison.counts[2].tolist()))
+    assert counts['aster'] == 0 and counts['geranium'] == 70 and counts['salvia'] == 35
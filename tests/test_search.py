@@ -0,0 +1,28 @@
+# tests/test_search.py
+# Gerangschikt zoeken: een naam die met de zoekterm begint, wint altijd van vage treffers, ook als die naam lang is.
+import random
+import string
+from core.search import SpeciesSearchIndex, normalize_search_text
+
+def fuzzy_names(rng, count):
+    """Korte namen die bijna alle trigrammen van 'geranium' delen, maar de zoekterm zelf niet bevatten."""
+    names = set()
+    while len(names) < count: names.add('Geranim ' + ''.join(rng.choice(string.ascii_lowercase) for _ in range(3)))
+    return sorted(names)
+
+def test_long_prefix_match_beats_many_short_fuzzy_matches():
+    rng = random.Random(13); long_name = 'Geranium x oxonianum "Rose Clair" ssp. walichianum Buxton\'s variety, laag blijvende vorm'
+    index = SpeciesSearchIndex(fuzzy_names(rng, 400) + ['Salvia "Caradonna" met geranium-achtig blad', long_name])
+    results = index.search('geranium', limit=5)
+    assert results[:2] == [long_name, 'Salvia "Caradonna" met geranium-achtig blad']
+
+def test_ranking_matches_full_scoring():
+    rng = random.Random(14); words = ['aster', 'salvia', 'geranium', 'nepeta', 'iris', 'rosea', 'alba', 'major', 'minor']
+    names = sorted({' '.join(rng.choice(words) for _ in range(rng.randint(1, 4))) + f" {k}" for k in range(3000)})
+    index = SpeciesSearchIndex(names)
+    for query in ['geranium', 'sal', 'ros alb', 'nepeta major', 'irs']:
+        full = SpeciesSearchIndex(names); full_results = full.search(query, limit=len(names))
+        assert index.search(query, limit=10) == full_results[:10]
+        q = normalize_search_text(query)
+        prefix = [n for n in full_results if normalize_search_text(n).startswith(q)]
+        assert full_results[:len(prefix)] == prefix
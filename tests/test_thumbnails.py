@@ -0,0 +1,33 @@
+# tests/test_thumbnails.py
+import multiprocessing
+import os
+import pytest
+from exporting.thumbnails import ThumbnailCache
+
+Image = pytest.importorskip('PIL.Image')
+
+def write_image(path, color, size=(1200, 900)):
+    Image.new('RGB', size, color).save(path, 'JPEG')
+
+def make_thumbnail(cache_dir, source, results):
+    try: results.put(ThumbnailCache(cache_dir=cache_dir).get(source)[0])
+    except Exception as e: results.put(repr(e))
+
+def test_edited_source_gets_new_thumbnail(tmp_path):
+    source = str(tmp_path / 'aster.jpg'); write_image(source, 'red'); cache = ThumbnailCache(cache_dir=str(tmp_path / 'cache'))
+    first, width, height = cache.get(source)
+    assert (width, height) == (472, 354)
+    write_image(source, 'blue', (600, 900)); os.utime(source, ns=(1, 1))  # andere inhoud, ook bij gelijke mtime-resolutie
+    second, width, height = cache.get(source)
+    assert second != first and height == 354
+    with Image.open(second) as img: assert img.getpixel((10, 10))[2] > 200
+
+def test_concurrent_processes_share_cache(tmp_path):
+    source = str(tmp_path / 'salvia.jpg'); write_image(source, 'green'); cache_dir = str(tmp_path / 'cache')
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=make_thumbnail, args=(cache_dir, source, results)) for _ in range(8)]
+    for worker in workers: worker.start()
+    paths = {results.get(timeout=60) for _ in workers}
+    for worker in workers: worker.join()
+    assert len(paths) == 1 and os.path.exists(paths.pop())
+    assert [name for name in os.listdir(cache_dir) if not name.endswith('.jpg')] == []
@@ -0,0 +1,30 @@
+# ui/loader.py
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.curves import DEFAULT_TOLERANCE
+from core.dxf import iter_polygon_batches
+from core.profiling import timed
+from core.project import dxf_fingerprint
+
+class DxfLoader(QThread):
+    """Leest een DXF-bestand buiten de GUI-thread in en stuurt de bedden per batch door."""
+    batch_loaded = pyqtSignal(list, list)
+    progress = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, filepath, parent=None, tolerance=DEFAULT_TOLERANCE, layers=None):
+        super().__init__(parent)
+        self.filepath = filepath; self.tolerance = tolerance; self.layers = layers
+        self.fingerprint = None
+
+    @timed('dxf.load')
+    def run(self):
+        try:
+            for batch, areas, fraction in iter_polygon_batches(self.filepath, tolerance=self.tolerance, layers=self.layers):
+                if self.isInterruptionRequested(): return
+                if batch: self.batch_loaded.emit(batch, areas.tolist())
+                self.progress.emit(int(fraction * 100))
+            # Vingerafdruk van de bron voor projectbestanden; hier berekend zodat de GUI-thread niet hoeft te hashen.
+            self.fingerprint = dxf_fingerprint(self.filepath)
+        except Exception as e:
+            self.failed.emit(str(e))
@@ -1,44 +1,35 @@
 # ui/main_window.py
+import os
 import sys
-from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QFileDialog, QCompleter
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QFileDialog, QCompleter, QProgressDialog
+from PyQt6.QtCore import Qt, QThread, QTimer, QStringListModel, pyqtSignal
 
-from ui.widgets import MatplotlibCanvas, ControlPanel
+from ui.widgets import MatplotlibCanvas, ControlPanel, StatsDialog, LayerDialog
+from ui.loader import DxfLoader
+from ui.search import SpeciesSearchWorker
 from database.manager import DatabaseManager
-from exporting.pdf_generator import generate_flowering_pdf, generate_order_list_pdf, generate_image_layout_pdf
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT
-from matplotlib.patches import Polygon
-import ezdxf
-import numpy as np
-from collections import defaultdict
-
-def calculate_polygon_area(vertices):
-    x = np.array([v[0] for v in vertices]); y = np.array([v[1] for v in vertices])
-    return 0.5 * np.abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
-
-def is_point_in_polygon(point, polygon_vertices):
-    x, y = point; n = len(polygon_vertices); is_inside = False
-    p1x, p1y = polygon_vertices[0]
-    for i in range(n + 1):
-        p2x, p2y = polygon_vertices[i % n]
-        if y > min(p1y, p2y):
-            if y <= max(p1y, p2y):
-                if x <= max(p1x, p2x):
-                    if p1y != p2y: x_intersection = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                    if p1x == p2x or x <= x_intersection: is_inside = not is_inside
-        p1x, p1y = p2x, p2y
-    return is_inside
+from core.dxf import scan_layers
+from core.geometry import PolygonStore
+from core.plan import PlantingPlan
+from core.profiling import timed
+from core.project import save_project, load_project, dxf_changed, transfer_assignments
 
 class MainWindow(QWidget):
+    search_requested = pyqtSignal(int, str)
+    load_catalogue_requested = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle('Plantencalculator Pro'); self.resize(1200, 700)
-        self.db_manager = DatabaseManager('planten.db'); self.db_manager.connect()
-        self.polygons_data = []; self.selected_poly_data = None
-        self.species_color_map = {}; self.next_color_index = 0
-        self.plant_names = self.db_manager.get_all_plant_names()
-        self.COLOR_CYCLE = ['#8dd3c7', '#ffffb3', '#bebada', '#fb8072', '#80b1d3', '#fdb462', '#b3de69', '#fccde5', '#d9d9d9', '#bc80bd', '#ccebc5', '#ffed6f']
+        self.db_manager = DatabaseManager.from_environment()
+        self.plan = PlantingPlan(); self.selected_index = -1
+        self._loader = None; self._loaded_polygons = []; self._loaded_areas = []
+        self.dxf_fingerprint = None; self._pending_transfer = None
+        self.plant_names = []
         self.initUI(); self.connect_signals(); self.setup_completer()
+        # Database en catalogus pas na het tonen van het venster; de namen en zoekindex komen uit de zoekthread.
+        QTimer.singleShot(0, self.load_catalogue)
 
     def initUI(self):
         main_layout = QHBoxLayout()
@@ -52,26 +43,61 @@ class MainWindow(QWidget):
 
     def connect_signals(self):
         self.controls.load_button.clicked.connect(self.select_file)
+        self.controls.layers_button.clicked.connect(self.change_layers)
         self.controls.export_order_button.clicked.connect(self.export_order_list_pdf)
         self.controls.export_flowering_button.clicked.connect(self.export_flowering_pdf)
         self.controls.export_image_button.clicked.connect(self.export_image_layout_pdf)
+        self.controls.export_plan_button.clicked.connect(self.export_plan)
+        self.controls.save_project_button.clicked.connect(self.save_project)
+        self.controls.open_project_button.clicked.connect(self.open_project)
+        self.controls.stats_button.clicked.connect(lambda: StatsDialog(self).exec())
         self.canvas.mpl_connect('button_press_event', self.on_canvas_click)
         self.controls.species_input.returnPressed.connect(self.finalize_selection)
         self.controls.density_input.returnPressed.connect(self.finalize_selection)
+        self.controls.net_area_checkbox.toggled.connect(self.update_order_list)
+        self.controls.shape_count_checkbox.toggled.connect(self.on_count_mode_toggled)
+        self.controls.show_plants_checkbox.toggled.connect(self.update_plant_positions)
 
     def setup_completer(self):
-        completer = QCompleter(self.plant_names)
-        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive); completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        self.controls.species_input.setCompleter(completer)
-        completer.activated.connect(self.on_species_selected)
+        # De completer filtert zelf niet: de lijst komt gerangschikt uit de zoekindex in de zoekthread.
+        self._completer_model = QStringListModel(self)
+        completer = QCompleter(self._completer_model, self)
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        completer.setWidget(self.controls.species_input)
+        completer.activated.connect(self.on_completion_activated)
         self._completer = completer
+        self._search_thread = QThread(self); self._search_worker = SpeciesSearchWorker(self.db_manager)
+        self._search_worker.moveToThread(self._search_thread)
+        self.search_requested.connect(self._search_worker.search); self.load_catalogue_requested.connect(self._search_worker.load_catalogue)
+        self._search_worker.results_ready.connect(self.on_search_results); self._search_worker.catalogue_loaded.connect(self.on_catalogue_loaded)
+        self._search_thread.start(); self._search_request = 0
+        self.controls.species_input.textEdited.connect(self.on_species_text_edited)
+
+    def load_catalogue(self):
+        self.db_manager.connect(); self.load_catalogue_requested.emit()
+
+    def on_catalogue_loaded(self, names):
+        self.plant_names = names
+
+    def on_species_text_edited(self, text):
+        self._search_request += 1; self.search_requested.emit(self._search_request, text)
+
+    def on_search_results(self, request_id, names):
+        if request_id != self._search_request: return  # verouderd antwoord, er is alweer verder getypt
+        self._completer_model.setStringList(names)
+        if names and self.controls.species_input.hasFocus(): self._completer.complete()
+        else: self._completer.popup().hide()
+
+    def on_completion_activated(self, species_name):
+        self.controls.species_input.setText(species_name); self.on_species_selected(species_name)
 
     def export_flowering_pdf(self):
         species_in_project = list(self.calculate_species_totals().keys())
         if not species_in_project: return
         filename, _ = QFileDialog.getSaveFileName(self, "Sla Bloeikalender op", "", "PDF (*.pdf)")
         if not filename: return
-        plant_details_list = [self.db_manager.get_plant_details(name.lower()) for name in species_in_project if self.db_manager.get_plant_details(name.lower()) is not None]
+        from exporting.pdf_generator import generate_flowering_pdf  # ReportLab pas bij de eerste export laden
+        plant_details_list = list(self.db_manager.get_plant_details_many(species_in_project).values())
         generate_flowering_pdf(filename, plant_details_list)
         print(f"Bloeikalender opgeslagen: {filename}")
 
@@ -80,7 +106,8 @@ class MainWindow(QWidget):
         if not species_totals: return
         filename, _ = QFileDialog.getSaveFileName(self, "Sla Bestellijst op", "", "PDF (*.pdf)")
         if not filename: return
-        plant_details_map = {name.lower(): self.db_manager.get_plant_details(name.lower()) for name in species_totals.keys()}
+        from exporting.pdf_generator import generate_order_list_pdf
+        plant_details_map = self.db_manager.get_plant_details_many(species_totals.keys())
         generate_order_list_pdf(filename, species_totals, plant_details_map)
         print(f"Bestellijst opgeslagen: {filename}")
         
@@ -89,106 +116,191 @@ class MainWindow(QWidget):
         if not species_in_project: return
         filename, _ = QFileDialog.getSaveFileName(self, "Sla Afbeeldingenlayout op", "", "PDF (*.pdf)")
         if not filename: return
-        plant_details_list = [self.db_manager.get_plant_details(name.lower()) for name in species_in_project if self.db_manager.get_plant_details(name.lower()) is not None]
+        from exporting.pdf_generator import generate_image_layout_pdf
+        plant_details_list = list(self.db_manager.get_plant_details_many(species_in_project).values())
         generate_image_layout_pdf(filename, plant_details_list)
         print(f"Afbeeldingenlayout opgeslagen: {filename}")
 
+    def export_plan(self):
+        """Plantekening als vector-PDF (op een leesbare schaal over meerdere bladen) of als SVG."""
+        if not len(self.plan): return
+        filename, selected_filter = QFileDialog.getSaveFileName(self, "Sla Plantekening op", "", "PDF (*.pdf);;SVG (*.svg)")
+        if not filename: return
+        from exporting.plan_export import generate_plan_pdf, generate_plan_svg
+        if filename.lower().endswith('.svg') or selected_filter.startswith('SVG'): generate_plan_svg(filename, self.plan)
+        else: generate_plan_pdf(filename, self.plan)
+        print(f"Plantekening opgeslagen: {filename}")
+
     def on_species_selected(self, species_name):
         details = self.db_manager.get_plant_details(species_name)
         if details:
             plants_per_m2 = details['plants_per_m2'] if details['plants_per_m2'] else 7
             self.controls.density_input.setText(str(plants_per_m2))
-            if self.selected_poly_data:
-                self.selected_poly_data['plants_per_m2'] = plants_per_m2
-                self.update_calculation()
+            if self.selected_index >= 0:
+                self.update_calculation(); self.update_bed_totals(self.plan.set_density(self.selected_index, plants_per_m2))
+                self.update_plant_positions()
     
     def select_file(self):
         filepath, _ = QFileDialog.getOpenFileName(self, "Selecteer een DXF-bestand", "", "DXF Files (*.dxf)")
         if not filepath: return
-        try:
-            ax = self.canvas.ax_tekengebied; ax.clear(); self.polygons_data.clear(); self.selected_poly_data = None
-            self.species_color_map.clear(); self.next_color_index = 0
-            doc = ezdxf.readfile(filepath); msp = doc.modelspace()
-            for entity in msp:
-                points = []; entity_type = entity.dxftype()
-                if entity_type in ('LWPOLYLINE', 'POLYLINE') and entity.is_closed:
-                    if entity_type == 'LWPOLYLINE': points = [(v[0], v[1]) for v in entity.vertices()]
-                    elif entity_type == 'POLYLINE': points = [(v.dxf.location.x, v.dxf.location.y) for v in entity.vertices]
-                    if points:
-                        poly = Polygon(points, closed=True, facecolor='none', edgecolor='black', linewidth=1)
-                        ax.add_patch(poly)
-                        self.polygons_data.append({'patch': poly, 'vertices': points, 'plants_per_m2': 7, 'species_name': '', 'is_finished': False})
-            ax.set_title("Beplantingsplan"); ax.set_aspect('equal', 'box'); ax.autoscale_view(); self.canvas.draw()
-            self.update_ui_on_selection(); self.update_order_list()
-        except Exception as e: print(f"Fout bij laden: {e}")
+        layers = self.choose_layers(filepath)
+        if layers is not False: self.load_dxf(filepath, layers=layers)
+
+    def choose_layers(self, filepath, selected=None):
+        """Lagenkeuze voor een DXF: lijst met lagen, None voor alle lagen of False bij annuleren.
+        Bij een tekening met maar één laag wordt er niets gevraagd."""
+        try: layers = scan_layers(filepath)
+        except Exception as e: print(f"Fout bij lezen van de lagen: {e}"); return None
+        if len(layers) <= 1: return None
+        dialog = LayerDialog(layers, selected, self)
+        return dialog.selected_layers() if dialog.exec() else False
+
+    def change_layers(self):
+        """Laadt de huidige DXF opnieuw met een andere lagenkeuze; toewijzingen gaan mee naar de bedden op dezelfde plek."""
+        fingerprint = self.dxf_fingerprint or {}; dxf_path = fingerprint.get('dxf_path')
+        if not dxf_path or not os.path.exists(dxf_path): return
+        layers = self.choose_layers(dxf_path, fingerprint.get('dxf_layers'))
+        if layers is False: return
+        assignments = self.plan.assignments()
+        self.load_dxf(dxf_path, transfer=(self.plan.store, assignments) if assignments else None, layers=layers)
+
+    def load_dxf(self, filepath, transfer=None, layers=None):
+        """Start het inlezen; transfer=(oude store, toewijzingen) zet na afloop bestaande toewijzingen over.
+        Met layers worden alleen de bedden van die lagen geladen."""
+        if self._loader and self._loader.isRunning():
+            self._loader.requestInterruption(); self._loader.wait()
+        self.reset_plan(); self._pending_transfer = transfer
+        self._loader = DxfLoader(filepath, self, layers=layers)
+        self._progress = QProgressDialog("DXF laden...", "Annuleren", 0, 100, self)
+        self._progress.setWindowModality(Qt.WindowModality.WindowModal); self._progress.setMinimumDuration(300)
+        self._progress.canceled.connect(self._loader.requestInterruption)
+        self._loader.batch_loaded.connect(self.on_batch_loaded)
+        self._loader.progress.connect(self._progress.setValue)
+        self._loader.failed.connect(lambda message: print(f"Fout bij laden: {message}"))
+        self._loader.finished.connect(self.on_load_finished)
+        self._loader.start()
+
+    def reset_plan(self):
+        self.canvas.clear_plan(); self._loaded_polygons = []; self._loaded_areas = []
+        self.plan.set_store(PolygonStore.from_polygons([])); self.selected_index = -1; self.dxf_fingerprint = None
+        self.controls.layers_button.setEnabled(False)
+
+    def on_batch_loaded(self, batch, areas):
+        self._loaded_polygons.extend(batch); self._loaded_areas.extend(areas)
+        self.canvas.add_beds(batch)
+
+    def on_load_finished(self):
+        cancelled = self._loader.isInterruptionRequested(); self._progress.close()
+        if cancelled:
+            self.reset_plan(); self.canvas.draw_idle(); print("Laden geannuleerd.")
+        else:
+            self.plan.set_store(PolygonStore.from_polygons(self._loaded_polygons, self._loaded_areas)); self._loaded_polygons = []; self._loaded_areas = []
+            self.canvas.set_store(self.plan.store)
+            self.dxf_fingerprint = self._loader.fingerprint
+            if self.dxf_fingerprint and self._loader.layers is not None: self.dxf_fingerprint['dxf_layers'] = list(self._loader.layers)
+            self.controls.layers_button.setEnabled(bool(self.dxf_fingerprint))
+            if self._pending_transfer:
+                old_store, assignments = self._pending_transfer; transferred = transfer_assignments(old_store, assignments, self.plan.store)
+                self.apply_assignments(transferred); print(f"{len(transferred)} van {len(assignments)} toewijzingen overgezet.")
+            self.report_overlaps()
+        self._pending_transfer = None
+        self.update_ui_on_selection(); self.update_order_list()
+
+    def save_project(self):
+        if not len(self.plan): return
+        filename, _ = QFileDialog.getSaveFileName(self, "Sla project op", "", "DEAS-project (*.deas)")
+        if not filename: return
+        try: save_project(filename, self.plan.store, self.plan.assignments(), fingerprint=self.dxf_fingerprint); print(f"Project opgeslagen: {filename}")
+        except OSError as e: print(f"Fout bij opslaan project: {e}")
+
+    def open_project(self):
+        filename, _ = QFileDialog.getOpenFileName(self, "Open project", "", "DEAS-project (*.deas)")
+        if not filename: return
+        try: store, assignments, header = load_project(filename)
+        except (OSError, ValueError) as e: print(f"Fout bij openen project: {e}"); return
+        if dxf_changed(header):
+            print("De DXF is gewijzigd sinds het opslaan; het project wordt opnieuw geïmporteerd.")
+            self.load_dxf(header['dxf_path'], transfer=(store, assignments), layers=header.get('dxf_layers')); return
+        self.reset_plan(); self.plan.set_store(store)
+        self.dxf_fingerprint = {key: value for key, value in header.items() if key.startswith('dxf_')} or None
+        self.controls.layers_button.setEnabled(bool(self.dxf_fingerprint))
+        self.canvas.set_store(store)
+        self.apply_assignments(assignments); self.report_overlaps(); self.update_ui_on_selection(); self.update_order_list()
+
+    def report_overlaps(self, limit=10):
+        """Meldt overlappende en dubbel getekende bedden direct na het laden."""
+        overlaps = self.plan.overlaps
+        if not len(overlaps): return
+        print(f"WAARSCHUWING: {overlaps.summary()}")
+        for first, second, area, duplicate in overlaps.rows()[:limit]:
+            print(f"  bed {first} en bed {second}: {area:.2f} m²" + (" (dubbel getekend)" if duplicate else ""))
+
+    def apply_assignments(self, assignments):
+        """Zet toewijzingen (index, soortnaam, planten per m²) in bulk in het plan en kleurt de bedden in één keer."""
+        self.plan.assign_many(assignments); indices = [index for index, _, _ in assignments]
+        if indices: self.canvas.set_bed_colors(indices, [self.plan.bed_color(index) for index in indices])
+        self.update_plant_positions()
 
     def on_canvas_click(self, event):
         if event.inaxes != self.canvas.ax_tekengebied or event.xdata is None: return
-        click_point = (event.xdata, event.ydata); self.update_all_polygon_colors()
-        for poly_data in self.polygons_data:
-            if is_point_in_polygon(click_point, poly_data['vertices']):
-                self.selected_poly_data = poly_data; self.update_ui_on_selection()
-                self.selected_poly_data['patch'].set_facecolor('green'); self.selected_poly_data['patch'].set_alpha(0.7)
-                self.canvas.draw(); return
+        index = self.plan.hit_test(event.xdata, event.ydata)
+        if index >= 0:
+            self.selected_index = index; self.update_ui_on_selection()
+            self.canvas.set_selection(self.plan.store.polygon(index))
 
     def finalize_selection(self):
-        if not self.selected_poly_data: return
+        if self.selected_index < 0: return
         try:
-            species_name = self.controls.species_input.text().strip().lower()
-            plants_per_m2 = float(self.controls.density_input.text())
-            self.selected_poly_data.update({'species_name': species_name, 'plants_per_m2': plants_per_m2, 'is_finished': True})
-            if species_name and species_name not in self.species_color_map:
-                self.species_color_map[species_name] = self.COLOR_CYCLE[self.next_color_index]
-                self.next_color_index = (self.next_color_index + 1) % len(self.COLOR_CYCLE)
-            self.update_all_polygon_colors(); self.update_order_list()
+            species_name = self.controls.species_input.text(); plants_per_m2 = float(self.controls.density_input.text())
+            self.update_bed_totals(self.plan.assign(self.selected_index, species_name, plants_per_m2))
+            self.update_polygon_color(self.selected_index); self.update_plant_positions()
         except ValueError: print("Ongeldige invoer bij 'Planten per m²'")
         except Exception as e: print(f"Fout bij finaliseren: {e}")
 
     def update_ui_on_selection(self):
-        if self.selected_poly_data:
-            self.controls.species_input.setText(self.selected_poly_data['species_name'])
-            self.controls.density_input.setText(str(self.selected_poly_data['plants_per_m2']))
+        if self.selected_index >= 0:
+            self.controls.species_input.setText(self.plan.species[self.selected_index])
+            self.controls.density_input.setText(f"{self.plan.densities[self.selected_index]:g}")
             self.update_calculation()
         else:
             self.controls.species_input.clear(); self.controls.density_input.clear()
             self.controls.area_label.setText("Oppervlakte: -- m²"); self.controls.plants_label.setText("Aantal planten: --")
 
     def update_calculation(self):
-        if not self.selected_poly_data: return
-        area = calculate_polygon_area(self.selected_poly_data['vertices'])
-        self.controls.area_label.setText(f"Oppervlakte: {area:.2f} m²")
+        if self.selected_index < 0: return
+        self.controls.area_label.setText(f"Oppervlakte: {self.plan.area(self.selected_index):.2f} m²")
         try:
-            plants_per_sqm = float(self.controls.density_input.text())
-            self.controls.plants_label.setText(f"Aantal planten: {int(area * plants_per_sqm)}")
+            plants = self.plan.plant_count(self.selected_index, float(self.controls.density_input.text()))
+            self.controls.plants_label.setText(f"Aantal planten: {plants}")
         except ValueError: self.controls.plants_label.setText("Ongeldige invoer")
 
-    def update_all_polygon_colors(self):
-        for poly_data in self.polygons_data:
-            if poly_data['is_finished']:
-                color = self.species_color_map.get(poly_data['species_name'], 'lightgrey')
-                poly_data['patch'].set_facecolor(color); poly_data['patch'].set_alpha(0.6)
-            else: poly_data['patch'].set_facecolor('none')
-        if self.selected_poly_data:
-            self.selected_poly_data['patch'].set_facecolor('green'); self.selected_poly_data['patch'].set_alpha(0.7)
-        self.canvas.draw()
+    def update_polygon_color(self, index):
+        self.canvas.set_bed_colors(index, self.plan.bed_color(index))
+
+    def update_plant_positions(self):
+        """Toont de plantposities van alle toegewezen bedden in één scatter, in de kleur van de soort."""
+        if not self.controls.show_plants_checkbox.isChecked(): self.canvas.set_plant_positions(None); return
+        points, owner = self.plan.plant_positions(); colors = self.plan.facecolors()[owner]; colors[:, 3] = 1.0
+        self.canvas.set_plant_positions(points, colors)
+
+    def on_count_mode_toggled(self, shape_aware):
+        self.plan.set_shape_aware(shape_aware); self.update_calculation(); self.update_order_list()
 
     def calculate_species_totals(self):
-        species_totals = defaultdict(int)
-        for poly_data in self.polygons_data:
-            if poly_data['is_finished']:
-                area = calculate_polygon_area(poly_data['vertices'])
-                plant_count = int(area * float(poly_data['plants_per_m2']))
-                species_name = poly_data['species_name'].capitalize() or '(Onbekende soort)'
-                species_totals[species_name] += plant_count
-        return species_totals
+        return self.plan.species_totals(net=self.controls.net_area_checkbox.isChecked())
+
+    @timed('order_list.update')
+    def update_bed_totals(self, changed):
+        """Werkt alleen de rijen van de bestellijst bij waarvan het totaal veranderde."""
+        if self.controls.net_area_checkbox.isChecked(): self.update_order_list()  # netto totalen hangen ook van buurbedden af
+        elif changed: self.controls.order_list_model.update_species(self.plan.totals.totals, changed)
 
     def update_order_list(self):
-        self.controls.order_list_display.clear()
-        species_totals = self.calculate_species_totals()
-        self.controls.order_list_display.append("<b>Bestellijst:</b>")
-        for species, total in sorted(species_totals.items()):
-            self.controls.order_list_display.append(f"- {species}: {total} stuks")
+        self.controls.order_list_model.reset(self.calculate_species_totals())
 
     def closeEvent(self, event):
+        self._search_thread.quit(); self._search_thread.wait()
+        if self._loader and self._loader.isRunning():
+            self._loader.requestInterruption(); self._loader.wait()
         self.db_manager.close()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,64 @@
+# ui/rendering.py
+import numpy as np
+from matplotlib.collections import Collection, PolyCollection
+from matplotlib.path import Path
+
+from core.simplify import build_lod_pyramid
+from core.profiling import timed
+
+class BedLayer:
+    """Alle bedden in één PolyCollection, met viewport culling en een LOD-piramide.
+
+    Tijdens het laden krijgt elke batch een eigen PolyCollection, zodat een nieuwe batch de eerdere niet opnieuw
+    opbouwt. set_store vervangt die door de ene collectie; daarna worden per frame
+    alleen de bedden binnen de zichtlimieten aangeboden, op het grofste niveau waarvan de tolerantie nog onder één pixel blijft."""
+
+    def __init__(self, ax):
+        self.ax = ax; self.facecolors = np.zeros((0, 4)); self.store = None
+        self.collection = PolyCollection([], facecolors='none', edgecolors='black', linewidths=1)
+        ax.add_collection(self.collection)
+        self._levels = []; self._paths = []; self._visible = None; self._view = None; self._batches = []
+
+    def add_polygons(self, polygons):
+        """Tekent een batch nieuw geladen bedden (ongevuld) naast de eerder geladen batches."""
+        if not len(polygons): return
+        batch = PolyCollection(polygons, facecolors='none', edgecolors='black', linewidths=1)
+        self.ax.add_collection(batch); self._batches.append(batch)
+        self.ax.update_datalim(batch.get_datalim(self.ax.transData).get_points())
+
+    def set_store(self, store):
+        for batch in self._batches: batch.remove()
+        self._batches = []; self._resize_colors(len(store)); self.store = store
+        self._levels = build_lod_pyramid(store); self._paths = [{} for _ in self._levels]; self._view = None
+        if len(store):
+            b = store.bboxes; self.ax.update_datalim([[b[:, 0].min(), b[:, 1].min()], [b[:, 2].max(), b[:, 3].max()]])
+
+    def set_colors(self, indices, rgba):
+        self.facecolors[indices] = rgba
+        self.collection.set_facecolor(self.facecolors if self._visible is None else self.facecolors[self._visible])
+
+    def _resize_colors(self, n):
+        facecolors = np.zeros((n, 4)); keep = min(n, len(self.facecolors))
+        facecolors[:keep] = self.facecolors[:keep]; self.facecolors = facecolors
+
+    def _path(self, level, index):
+        cache = self._paths[level]; path = cache.get(index)
+        if path is None:
+            _, vertices, offsets = self._levels[level]
+            path = cache[index] = Path(vertices[offsets[index]:offsets[index + 1]], closed=True)
+        return path
+
+    @timed('render.cull')
+    def update_view(self, pixel_width):
+        """Kiest zichtbare bedden en detailniveau voor de huidige zichtlimieten; doet niets als die niet veranderd zijn."""
+        if self.store is None or not len(self.store): return
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        pixel_size = (x1 - x0) / max(pixel_width, 1)
+        level = max(i for i, (tolerance, _, _) in enumerate(self._levels) if tolerance <= pixel_size)
+        view = (x0, x1, y0, y1, level)
+        if view == self._view: return
+        self._view = view; b = self.store.bboxes
+        self._visible = np.flatnonzero((b[:, 2] >= x0) & (b[:, 0] <= x1) & (b[:, 3] >= y0) & (b[:, 1] <= y1))
+        # PolyCollection.set_paths is een alias van set_verts en zou de gecachte paden opnieuw opbouwen.
+        Collection.set_paths(self.collection, [self._path(level, index) for index in self._visible])
+        self.collection.set_facecolor(self.facecolors[self._visible])
@@ -0,0 +1,39 @@
+# ui/search.py
+import time
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from core.search import SpeciesSearchIndex
+
+CATALOGUE_CHECK_INTERVAL = 1.0  # seconden tussen twee controles van de catalogusversie tijdens het typen
+
+class SpeciesSearchWorker(QObject):
+    """Houdt de zoekindex bij in een eigen thread; opbouwen en zoeken blokkeren de GUI dus niet.
+    Bij het zoeken controleert de worker (hooguit eens per CATALOGUE_CHECK_INTERVAL) of de catalogus is gewijzigd
+    en leest hij de namen zo nodig opnieuw in, vóór hij de zoekopdracht beantwoordt."""
+    results_ready = pyqtSignal(int, list)
+    index_ready = pyqtSignal(int)
+    catalogue_loaded = pyqtSignal(list)
+
+    def __init__(self, db_manager):
+        super().__init__()
+        self.db_manager = db_manager; self.index = SpeciesSearchIndex([]); self.version = None; self._checked = 0.0
+
+    @pyqtSlot()
+    def load_catalogue(self):
+        """Leest de plantnamen in deze thread, via een verbinding uit de pool van de gedeelde DatabaseManager."""
+        self.version = self.db_manager.catalogue_version(); self._checked = time.monotonic()
+        names = self.db_manager.get_all_plant_names()
+        self.catalogue_loaded.emit(names); self.rebuild(names)
+
+    def refresh_if_changed(self):
+        if time.monotonic() - self._checked < CATALOGUE_CHECK_INTERVAL: return
+        self._checked = time.monotonic()
+        if self.db_manager.catalogue_version() != self.version: self.load_catalogue()
+
+    @pyqtSlot(list)
+    def rebuild(self, names):
+        self.index = SpeciesSearchIndex(names); self.index_ready.emit(len(names))
+
+    @pyqtSlot(int, str)
+    def search(self, request_id, query):
+        self.refresh_if_changed(); self.results_ready.emit(request_id, self.index.search(query))
@@ -1,33 +1,214 @@
 # ui/widgets.py
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QLineEdit, QTextEdit
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QTableView, QHeaderView,
+                             QDialog, QDialogButtonBox, QTableWidget, QTableWidgetItem, QFileDialog, QCheckBox, QListWidget, QListWidgetItem)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from bisect import bisect_left
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.patches import Polygon
+import numpy as np
+from ui.rendering import BedLayer
+from core.profiling import get_stats, reset_stats, dump_stats
 
 class MatplotlibCanvas(FigureCanvasQTAgg):
+    """Tekent alle bedden via een BedLayer (één PolyCollection met culling en LOD); de selectie is een aparte
+    overlay die via blitting wordt getekend. Plantposities staan samen in één scatter-artist."""
+    LOAD_REDRAW_MS = 250  # tijdens het laden hooguit vier keer per seconde opnieuw tekenen
+
     def __init__(self, parent=None):
         self.fig = Figure(figsize=(5, 4), dpi=100)
         self.ax_tekengebied = self.fig.add_subplot(111)
         super(MatplotlibCanvas, self).__init__(self.fig)
+        self._background = None
+        self.mpl_connect('draw_event', self._on_draw)
+        self._load_redraw = QTimer(self); self._load_redraw.setSingleShot(True); self._load_redraw.setInterval(self.LOAD_REDRAW_MS)
+        self._load_redraw.timeout.connect(self._redraw_loaded)
+        self.clear_plan()
+
+    def clear_plan(self):
+        ax = self.ax_tekengebied; ax.clear()
+        self.beds = BedLayer(ax); self.bed_collection = self.beds.collection
+        self.plant_markers = ax.scatter(np.empty(0), np.empty(0), s=4, marker='o', linewidths=0, zorder=3)
+        self.selection_overlay = Polygon(np.zeros((1, 2)), closed=True, facecolor='green', alpha=0.7, edgecolor='black', animated=True, visible=False)
+        ax.add_patch(self.selection_overlay)
+        ax.set_title("Beplantingsplan"); ax.set_aspect('equal', 'box')
+
+    def add_beds(self, polygons):
+        """Tekent een batch bedden die tijdens het laden binnenkomt; set_store vervangt ze na afloop."""
+        self.beds.add_polygons(polygons)
+        if not self._load_redraw.isActive(): self._load_redraw.start()
+
+    def _redraw_loaded(self):
+        self.ax_tekengebied.autoscale_view(); self.draw_idle()
+
+    def set_store(self, store):
+        """Schakelt over op de definitieve PolygonStore, met culling en LOD per frame."""
+        self._load_redraw.stop(); self.beds.set_store(store); self.ax_tekengebied.autoscale_view(); self.draw_idle()
+
+    def set_bed_colors(self, indices, rgba):
+        """Kleurt de opgegeven bedden in één array-toewijzing (RGBA, alpha 0 = ongevuld)."""
+        self.beds.set_colors(indices, rgba); self.draw_idle()
+
+    def set_plant_positions(self, points, colors=None):
+        """Vervangt alle plantposities (P, 2) met een RGBA-kleur per punt; None verbergt ze."""
+        if points is None or not len(points): self.plant_markers.set_offsets(np.empty((0, 2)))
+        else: self.plant_markers.set_offsets(points); self.plant_markers.set_facecolor(colors)
+        self.draw_idle()
+
+    def draw(self):
+        self.beds.update_view(self.width() * self.device_pixel_ratio)
+        super().draw()
+
+    def set_selection(self, vertices):
+        if vertices is None: self.selection_overlay.set_visible(False)
+        else: self.selection_overlay.set_xy(vertices); self.selection_overlay.set_visible(True)
+        self._blit_selection()
+
+    def _on_draw(self, event):
+        self._background = self.copy_from_bbox(self.fig.bbox)
+        if self.selection_overlay.get_visible(): self.ax_tekengebied.draw_artist(self.selection_overlay)
+
+    def _blit_selection(self):
+        if self._background is None: self.draw_idle(); return
+        self.restore_region(self._background)
+        if self.selection_overlay.get_visible(): self.ax_tekengebied.draw_artist(self.selection_overlay)
+        self.blit(self.fig.bbox)
+
+class OrderListModel(QAbstractTableModel):
+    """Bestellijst als tabelmodel; bij een wijziging worden alleen de betrokken rijen doorgegeven aan de view."""
+    HEADERS = ['Soort', 'Aantal']
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._species = []; self._totals = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._species)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        species = self._species[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return species if index.column() == 0 else f"{self._totals[species]} stuks"
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() == 1:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal: return self.HEADERS[section]
+        return None
+
+    def reset(self, totals):
+        self.beginResetModel(); self._totals = dict(totals); self._species = sorted(self._totals); self.endResetModel()
+
+    def update_species(self, totals, changed):
+        """Verwerkt de gewijzigde soorten uit SpeciesTotals: rij bijwerken, invoegen of verwijderen."""
+        for species in changed:
+            row = bisect_left(self._species, species)
+            present = row < len(self._species) and self._species[row] == species
+            if species in totals:
+                self._totals[species] = totals[species]
+                if present:
+                    self.dataChanged.emit(self.index(row, 1), self.index(row, 1)); continue
+                self.beginInsertRows(QModelIndex(), row, row); self._species.insert(row, species); self.endInsertRows()
+            elif present:
+                self.beginRemoveRows(QModelIndex(), row, row); del self._species[row]; del self._totals[species]; self.endRemoveRows()
+
+class StatsDialog(QDialog):
+    """Overzicht van de gemeten tijden per operatie, met export naar JSON/CSV."""
+    COLUMNS = [('name', 'Operatie'), ('count', 'Aantal'), ('total', 'Totaal (ms)'), ('mean', 'Gem. (ms)'), ('max', 'Max (ms)')]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('Statistieken'); self.resize(560, 360)
+        self.table = QTableWidget(0, len(self.COLUMNS)); self.table.setHorizontalHeaderLabels([title for _, title in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch); self.table.verticalHeader().setVisible(False)
+        refresh_button = QPushButton('Vernieuwen'); reset_button = QPushButton('Wissen'); save_button = QPushButton('Opslaan...')
+        refresh_button.clicked.connect(self.refresh); save_button.clicked.connect(self.save)
+        reset_button.clicked.connect(lambda: (reset_stats(), self.refresh()))
+        buttons = QHBoxLayout()
+        for button in (refresh_button, reset_button, save_button): buttons.addWidget(button)
+        layout = QVBoxLayout(); layout.addWidget(self.table); layout.addLayout(buttons); self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        rows = get_stats(); self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (key, _) in enumerate(self.COLUMNS):
+                value = row[key]; text = value if key == 'name' else str(value) if key == 'count' else f"{value * 1000:.1f}"
+                item = QTableWidgetItem(text)
+                if key != 'name': item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(r, c, item)
+
+    def save(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "Sla statistieken op", "", "JSON (*.json);;CSV (*.csv)")
+        if filename: dump_stats(filename)
+
+class LayerDialog(QDialog):
+    """Keuze van de DXF-lagen waarvan de bedden worden geladen, met het aantal objecten per laag."""
+
+    def __init__(self, layers, selected=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('Lagen kiezen'); self.resize(360, 420)
+        selected = None if selected is None else {layer.lower() for layer in selected}
+        self.list = QListWidget()
+        for name, count in layers.items():
+            item = QListWidgetItem(f"{name} ({count})" if count else f"{name} (via blokken)")
+            item.setData(Qt.ItemDataRole.UserRole, name); item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked if selected is None or name.lower() in selected else Qt.CheckState.Unchecked)
+            self.list.addItem(item)
+        all_button = QPushButton('Alles'); none_button = QPushButton('Niets')
+        all_button.clicked.connect(lambda: self.check_all(Qt.CheckState.Checked)); none_button.clicked.connect(lambda: self.check_all(Qt.CheckState.Unchecked))
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept); buttons.rejected.connect(self.reject)
+        selection = QHBoxLayout(); selection.addWidget(all_button); selection.addWidget(none_button)
+        layout = QVBoxLayout(); layout.addWidget(self.list); layout.addLayout(selection); layout.addWidget(buttons); self.setLayout(layout)
+
+    def items(self):
+        return [self.list.item(row) for row in range(self.list.count())]
+
+    def check_all(self, state):
+        for item in self.items(): item.setCheckState(state)
+
+    def selected_layers(self):
+        """Aangevinkte lagen, of None als alles is aangevinkt (dan wordt er niet op laag gefilterd)."""
+        checked = [item.data(Qt.ItemDataRole.UserRole) for item in self.items() if item.checkState() == Qt.CheckState.Checked]
+        return None if len(checked) == self.list.count() else checked
 
 class ControlPanel(QWidget):
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout(); layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         self.load_button = QPushButton('Laad DXF')
+        self.layers_button = QPushButton('Lagen kiezen...'); self.layers_button.setEnabled(False)
         self.export_order_button = QPushButton('Exporteer Bestellijst')
         self.export_flowering_button = QPushButton('Exporteer Bloeikalender')
         self.export_image_button = QPushButton('Exporteer Afbeeldingenlayout')
+        self.export_plan_button = QPushButton('Exporteer Plantekening')
+        self.save_project_button = QPushButton('Project opslaan')
+        self.open_project_button = QPushButton('Project openen')
+        self.stats_button = QPushButton('Statistieken')
         
         self.species_label = QLabel('Plantsoort:'); self.species_input = QLineEdit()
         self.density_label = QLabel('Planten per m²:'); self.density_input = QLineEdit()
         self.area_label = QLabel('Oppervlakte: -- m²'); self.plants_label = QLabel('Aantal planten: --')
         
         self.order_list_label = QLabel('Bestellijst:'); self.order_list_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
-        self.order_list_display = QTextEdit(); self.order_list_display.setReadOnly(True)
+        self.net_area_checkbox = QCheckBox('Overlap van dezelfde soort één keer tellen')
+        self.shape_count_checkbox = QCheckBox('Aantal volgens plantgrid (vorm en randafstand)')
+        self.show_plants_checkbox = QCheckBox('Plantposities tonen')
+        self.order_list_model = OrderListModel(self)
+        self.order_list_view = QTableView(); self.order_list_view.setModel(self.order_list_model)
+        self.order_list_view.verticalHeader().setVisible(False)
+        self.order_list_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         
-        widgets = [self.load_button, self.export_order_button, self.export_flowering_button, self.export_image_button,
+        widgets = [self.load_button, self.layers_button, self.save_project_button, self.open_project_button,
+                   self.export_order_button, self.export_flowering_button, self.export_image_button, self.export_plan_button,
                    self.species_label, self.species_input, self.density_label, self.density_input, 
-                   self.area_label, self.plants_label, self.order_list_label, self.order_list_display]
+                   self.area_label, self.plants_label, self.order_list_label, self.net_area_checkbox,
+                   self.shape_count_checkbox, self.show_plants_checkbox, self.order_list_view, self.stats_button]
         for w in widgets: layout.addWidget(w)
         self.setLayout(layout)
\ No newline at end of file
@@ -1,34 +1,99 @@
 # update_database_images.py
+# Koppelt afbeeldingen aan planten door de afbeeldingenmap één keer te scannen en bestandsnamen
+# op genormaliseerde plantnaam te matchen. Pad, breedte, hoogte en inhoudshash worden in één transactie
+# opgeslagen, zodat de export het bestandssysteem niet meer hoeft te raadplegen.
+# Een afbeelding die alleen op geslacht past (Geranium.jpg voor elke Geranium-cultivar) wordt niet gekoppeld maar
+# als onzekere match gemeld; met --genus-fallback worden die matches wel gekoppeld.
+#
+# Gebruik: python update_database_images.py [--db planten.db] [--images plant_images] [--genus-fallback]
+import argparse
+import os
+import re
 import sqlite3
+import unicodedata
 
-# Deze dictionary is nu bijgewerkt met de bestandsnamen uit jouw screenshot.
-# De namen links komen (in kleine letters) uit het create_database.py script.
-image_map = {
-    'aster "little carlow"': 'plant_images/aster_little_carlow.jpg',
-    'calamintha nepeta ssp. nepeta': 'plant_images/calamintha.jpg',
-    'echinops bannaticus "taplow blue"': 'plant_images/echinops.jpg',
-    'geranium x oxonianum "rose clair"': 'plant_images/Geranium.jpg',
-    'salvia nemerosa "schneehugel"': 'plant_images/salvia_schneehugel.jpg'
-}
+from create_database import apply_migrations
+from core.hashing import file_hash
 
 try:
-    conn = sqlite3.connect('planten.db')
-    cursor = conn.cursor()
-    
-    updates_succesvol = 0
-    for name, path in image_map.items():
-        # Zoek de plant op naam (ongeacht hoofdletters) en update het image_path veld.
-        cursor.execute("UPDATE plants SET image_path = ? WHERE LOWER(name) = ?", (path, name))
-        if cursor.rowcount > 0:
-            print(f"Pad voor '{name}' bijgewerkt naar '{path}'")
-            updates_succesvol += 1
-        else:
-            print(f"WAARSCHUWING: Plant '{name}' niet gevonden in de database.")
-
-    conn.commit()
-    conn.close()
-    
-    print(f"\nDatabase bijgewerkt. {updates_succesvol} afbeeldingspaden succesvol ingesteld.")
-
-except sqlite3.Error as e:
-    print(f"Een databasefout is opgetreden: {e}")
\ No newline at end of file
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+# Tokens die niets zeggen over welke plant het is: hybride-kruisjes en rangaanduidingen.
+IGNORED_TOKENS = {'x', 'ssp', 'subsp', 'var', 'f'}
+
+def normalize_tokens(text):
+    text = unicodedata.normalize('NFKD', text.replace('×', ' x '))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return [t for t in re.split(r'[^0-9a-z]+', text) if t and t not in IGNORED_TOKENS]
+
+def candidate_keys(name):
+    """Mogelijke bestandsnamen voor een plant, van meest naar minst specifiek; zonder de naam van alleen het geslacht."""
+    tokens = normalize_tokens(name)
+    if not tokens: return []
+    cultivar = normalize_tokens(' '.join(re.findall(r'["\'“”‘’](.+?)["\'“”‘’]', name)))
+    keys = [' '.join(tokens)]
+    if cultivar: keys += [' '.join([tokens[0]] + cultivar), ' '.join(cultivar)]
+    if len(tokens) > 1: keys.append(' '.join(tokens[:2]))
+    return list(dict.fromkeys(keys))
+
+def genus_key(name):
+    tokens = normalize_tokens(name)
+    return tokens[0] if tokens else None
+
+def scan_images(image_dir):
+    """Eén keer door de map lopen: genormaliseerde bestandsnaam -> relatief pad."""
+    index = {}
+    for root, _, files in os.walk(image_dir):
+        for filename in sorted(files):
+            stem, ext = os.path.splitext(filename)
+            if ext.lower() not in IMAGE_EXTENSIONS: continue
+            key = ' '.join(normalize_tokens(stem)); path = os.path.join(root, filename).replace(os.sep, '/')
+            if key in index: print(f"WAARSCHUWING: '{path}' en '{index[key]}' hebben dezelfde naam, '{index[key]}' wordt gebruikt.")
+            else: index[key] = path
+    return index
+
+def image_metadata(path):
+    """(breedte, hoogte, hash), of None voor een bestand dat niet als afbeelding te lezen is."""
+    width = height = None
+    if PILImage is not None:
+        try:
+            with PILImage.open(path) as img: width, height = img.size  # leest alleen de header
+        except (OSError, SyntaxError, ValueError) as e:  # PIL meldt kapotte bestanden ook als SyntaxError/ValueError
+            print(f"WAARSCHUWING: afbeelding '{path}' is onleesbaar en wordt overgeslagen: {e}"); return None
+    return width, height, file_hash(path)
+
+def update_images(conn, image_dir, genus_fallback=False):
+    """Geeft (gekoppeld, gewist, gevonden afbeeldingen, [(plant, pad)] van matches op alleen het geslacht)."""
+    index = scan_images(image_dir); metadata = {}; updates = []; matched = 0; cleared = 0; genus_only = []
+    for plant_id, name, current_path in conn.execute("SELECT id, name, image_path FROM plants"):
+        path = next((index[key] for key in candidate_keys(name) if key in index), None)
+        if path is None and genus_key(name) in index:
+            genus_only.append((name, index[genus_key(name)]))
+            if genus_fallback: path = index[genus_key(name)]
+        if path:
+            if path not in metadata: metadata[path] = image_metadata(path)
+            if metadata[path] is None: continue  # onleesbaar: bestaande koppeling blijft staan
+            updates.append((path, *metadata[path], plant_id)); matched += 1
+        elif current_path and not os.path.exists(current_path):
+            updates.append((None, None, None, None, plant_id)); cleared += 1
+    with conn:
+        conn.executemany("UPDATE plants SET image_path = ?, image_width = ?, image_height = ?, image_hash = ? WHERE id = ?", updates)
+    return matched, cleared, len(index), genus_only
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Koppel afbeeldingen uit een map aan de planten in de database.")
+    parser.add_argument('--db', default='planten.db'); parser.add_argument('--images', default='plant_images')
+    parser.add_argument('--genus-fallback', action='store_true', help="ook afbeeldingen koppelen die alleen op geslacht passen")
+    args = parser.parse_args()
+    try:
+        conn = sqlite3.connect(args.db); apply_migrations(conn)
+        matched, cleared, found, genus_only = update_images(conn, args.images, args.genus_fallback)
+        conn.close()
+        for name, path in genus_only:
+            print(f"ONZEKER: '{name}' past alleen op geslacht bij '{path}'" + ("; gekoppeld." if args.genus_fallback else "; niet gekoppeld (--genus-fallback)."))
+        print(f"Database bijgewerkt. {found} afbeeldingen gevonden, {matched} planten gekoppeld, {cleared} ongeldige paden gewist.")
+    except sqlite3.Error as e:
+        print(f"Een databasefout is opgetreden: {e}")